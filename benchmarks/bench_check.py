@@ -0,0 +1,44 @@
+"""
+Dirty input: HDate() in a try/except loop against hdatecheck.check_many(), with a given fraction of bad strings
+
+    python benchmarks/bench_check.py [rows] [bad fraction]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from historicaldate import hdate
+from historicaldate import hdatecheck
+from bench_parallel import make_strings
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def parse_with_exceptions(strings):
+    hdates = []
+    for s in strings:
+        try:
+            hd = hdate.HDate(s)
+            hdates.append(hd if hd.pdates is not None else None)
+        except ValueError:
+            hdates.append(None)
+    return hdates
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    bad = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+    rng = random.Random(1)
+    bad_forms = [lambda: f"sometime in {rng.randint(1, 2020)}", lambda: f"{rng.randint(1, 2020)}??",
+                 lambda: f"31 Feb {rng.randint(1, 2020)}", lambda: f"Dec {rng.randint(1, 2020)}-12"]
+    strings = [rng.choice(bad_forms)() if rng.random() < bad else s for s in make_strings(rows)]
+
+    hdates, t_except = timed(parse_with_exceptions, strings)
+    results, t_check = timed(hdatecheck.check_many, strings)
+    assert [hd is None for hd in hdates] == [hd is None for hd in results.hdates]
+    print(f"{rows} rows, {sum(code != 0 for code in results.codes)} bad")
+    print(f"HDate() with try/except: {t_except:7.3f} s")
+    print(f"check_many():            {t_check:7.3f} s  speedup {t_except / t_check:5.2f}")
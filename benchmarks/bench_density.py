@@ -0,0 +1,71 @@
+"""
+Histograms and active counts of many intervals: hdatedensity functions against per-interval Python loops
+
+    python benchmarks/bench_density.py [intervals] [loop sample]
+
+The loops are timed on a sample of the intervals, and their times scaled up to the full number
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from historicaldate import hdatedensity
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def histogram_loop(early, late, edges):
+    "Spread each interval over the bins it overlaps, one interval at a time"
+    result = [0.0] * (len(edges) - 1)
+    for e, l in zip(early.tolist(), late.tolist()):
+        per_day = 1 / (l - e + 1)
+        first = int(np.searchsorted(edges, e, side="right")) - 1
+        for i in range(max(first, 0), len(result)):
+            if edges[i] > l:
+                break
+            result[i] += (min(l + 1, edges[i + 1]) - max(e, edges[i])) * per_day
+    return result
+
+def count_loop(early, late, days):
+    "Add one to every day of each interval"
+    counts = np.zeros(len(days), dtype=np.int64)
+    start = days[0]
+    for e, l in zip(early.tolist(), late.tolist()):
+        counts[max(e - start, 0):max(l - start + 1, 0)] += 1
+    return counts
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+    sample = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    rng = np.random.default_rng(1)
+    early = rng.integers(-365 * 1000, 365 * 2000, n)
+    late = early + rng.choice([0, 30, 365, 5 * 365, 10 * 365, 100 * 365], n)
+    mid = (early + late) // 2
+    years = hdatedensity.year_edges(-1000, 2100)
+    decades = hdatedensity.year_edges(-1000, 2099, 10)
+    centuries = hdatedensity.year_edges(-1000, 2100, 100)
+    days = np.arange(early.min(), late.max() + 1)
+    print(f"{n} intervals, loops timed on {sample} and scaled")
+
+    for name, edges in (("years", years), ("decades", decades), ("centuries", centuries)):
+        result, t_array = timed(hdatedensity.histogram, early, late, edges)
+        expected, t_loop = timed(histogram_loop, early[:sample], late[:sample], edges)
+        assert np.allclose(hdatedensity.histogram(early[:sample], late[:sample], edges), expected)
+        t_loop *= n / sample
+        print(f"histogram uniform, {name:9} loop {t_loop:8.2f} s  array {t_array:7.3f} s  speedup {t_loop / t_array:7.1f}")
+    _, t_array = timed(hdatedensity.histogram, early, late, years, weighting="mid", mid=mid)
+    print(f"histogram mid,     years     array {t_array:7.3f} s")
+
+    step, t_array = timed(hdatedensity.active_counts, early, late)
+    expected, t_loop = timed(count_loop, early[:sample], late[:sample], days)
+    assert np.array_equal(hdatedensity.count_active(early[:sample], late[:sample], days), expected)
+    t_loop *= n / sample
+    print(f"active_counts                loop {t_loop:8.2f} s  array {t_array:7.3f} s  speedup {t_loop / t_array:7.1f}"
+          f"  ({len(step.ordinals)} steps)")
+    _, t_array = timed(hdatedensity.count_active, early, late, days)
+    print(f"count_active, {len(days)} days      array {t_array:7.3f} s")
@@ -0,0 +1,51 @@
+"""
+Writing parsed dates back to HDate format strings: hdatearray.format_many() against a loop over
+hdateformat.format_pdates() and against building the strings by hand from hdateutils.to_ymd()
+
+    python benchmarks/bench_format.py [rows]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from historicaldate import hdate
+from historicaldate import hdatearray
+from historicaldate import hdateformat
+from historicaldate import hdateutils
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def by_hand(ordinals):
+    "Mid dates only, to the day, as in tests/test_cycle.py"
+    strings = []
+    for ordinal in ordinals:
+        ymd = hdateutils.to_ymd(ordinal)
+        s = f"{ymd.day} {MONTHS[ymd.month - 1]} {abs(ymd.year)}"
+        strings.append(s + " BC" if ymd.year < 0 else s)
+    return strings
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rng = random.Random(1)
+    forms = ["{d} {m} {y}", "{m} {y}", "{y}", "circa {y}", "between {y} and {y2}", "{d} {m} {y} BC"]
+    strings = [rng.choice(forms).format(d=rng.randint(1, 28), m=rng.choice(MONTHS), y=(y := rng.randint(1, 2000)),
+                                        y2=y + rng.randint(0, 50)) for _ in range(n)]
+    cols = hdatearray.parse_many(strings)
+    pdates = [hdate.HDate(s).pdates for s in strings[:n // 10]]
+    print(f"{n} rows")
+    _, t_hand = timed(by_hand, cols.ordinal_mid.tolist())
+    _, t_loop = timed(lambda: [hdateformat.format_pdates(p) for p in pdates])
+    t_loop *= n / len(pdates)
+    formatted, t_array = timed(hdatearray.format_many, cols)
+    print(f"by hand (mid dates only)      {t_hand:7.3f} s")
+    print(f"format_pdates() loop (est.)   {t_loop:7.3f} s")
+    print(f"format_many()                 {t_array:7.3f} s  speedup {t_loop / t_array:5.1f} over the loop")
+    back = hdatearray.parse_many(formatted)
+    assert all((a == b).all() for a, b in zip(cols, back))
@@ -0,0 +1,32 @@
+"""
+Time to import the package in a new process, from python -X importtime
+
+    python benchmarks/bench_import.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+PACKAGE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+def import_times(module="historicaldate"):
+    "Dictionary of cumulative import time (microseconds) for each module imported by *module*"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=os.path.dirname(PACKAGE_ROOT),
+                            env=dict(os.environ, PYTHONPATH=PACKAGE_ROOT), capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            times[name.strip()] = int(cumulative)
+    return times
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    import_times()      # -- write any .pyc files first
+    results = [import_times() for _ in range(runs)]
+    for name in ["historicaldate", "historicaldate.hdate", "historicaldate.hdateparser", "historicaldate.hdateutils",
+                 "historicaldate.hdatesorted", "threading", "datetime"]:
+        values = [times[name] for times in results if name in times]
+        if values:
+            print(f"{name:28} median {statistics.median(values) / 1000:6.2f} ms  min {min(values) / 1000:6.2f} ms")
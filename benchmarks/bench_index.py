@@ -0,0 +1,47 @@
+"""
+HDateIndex: bulk build, one-at-a-time inserts and queries, against a linear scan of the same arrays
+
+    python benchmarks/bench_index.py [intervals] [queries]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from historicaldate import hdateindex
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    nqueries = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    rng = np.random.default_rng(1)
+    early = rng.integers(-365 * 2500, 365 * 2500, n)
+    late = early + rng.choice([0, 30, 365, 3652, 36524], n)   # days, months, years, circa, centuries
+    print(f"{n} intervals, {nqueries} queries")
+
+    index, t_build = timed(hdateindex.HDateIndex.from_ordinals, early, late)
+    print(f"bulk build:      {t_build:8.3f} s")
+    ninserts = min(n, 100000)
+    index2 = hdateindex.HDateIndex()
+    _, t_insert = timed(lambda: [index2.add_ordinals(e, l) for e, l in zip(early[:ninserts].tolist(), late[:ninserts].tolist())])
+    print(f"insert:          {t_insert / ninserts * 1e6:8.2f} us/interval ({ninserts} inserts)")
+
+    starts = rng.integers(-365 * 2500, 365 * 2500, nqueries)
+    ends = starts + 50 * 365
+    for name, query, scan in [
+            ("overlapping", lambda s, e: index.overlapping(s, e), lambda s, e: np.flatnonzero((early <= e) & (late >= s))),
+            ("within", lambda s, e: index.within(s, e), lambda s, e: np.flatnonzero((early >= s) & (late <= e))),
+            ("at", lambda s, e: index.at(s), lambda s, e: np.flatnonzero((early <= s) & (late >= s))),
+            ("count_overlapping", lambda s, e: index.count_overlapping(s, e), lambda s, e: ((early <= e) & (late >= s)).sum()),
+            ("nearest", lambda s, e: index.nearest(s), lambda s, e: np.argmin(np.maximum(np.maximum(early - s, s - late), 0)))]:
+        results, t_index = timed(lambda: [query(s, e) for s, e in zip(starts.tolist(), ends.tolist())])
+        _, t_scan = timed(lambda: [scan(s, e) for s, e in zip(starts.tolist(), ends.tolist())])
+        found = np.mean([np.size(r) for r in results]) if name in ("overlapping", "within", "at") else 1
+        print(f"{name:17} index {t_index / nqueries * 1e6:9.1f} us  scan {t_scan / nqueries * 1e6:9.1f} us  "
+              f"({found:.0f} ids/query)")
@@ -0,0 +1,34 @@
+"""
+Memory used by HDate objects, in bytes per instance
+
+    python benchmarks/bench_memory.py [instances]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from historicaldate import hdate
+
+def bytes_per_instance(strings, touch=None):
+    "Allocated bytes per HDate, not counting the input strings. *touch* is an attribute to read from each object"
+    hdate.HDate(strings[0])        # -- build the shared parser first
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    hds = [hdate.HDate(s) for s in strings]
+    if touch:
+        for hd in hds:
+            getattr(hd, touch)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before - sys.getsizeof(hds)) / len(hds)
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    months = ["Jan", "Mar", "Jun", "Dec"]
+    strings = [f"{1 + i % 28} {months[i % 4]} {1000 + i % 1000}" if i % 2 else f"circa {1 + i % 2000}" 
+               for i in range(n)]
+    print(f"{n} instances")
+    print(f"as created:             {bytes_per_instance(strings):6.0f} bytes/instance")
+    print(f"after reading pdates:   {bytes_per_instance(strings, 'pdates'):6.0f} bytes/instance")
+    print(f"after reading d_parsed: {bytes_per_instance(strings, 'd_parsed'):6.0f} bytes/instance")
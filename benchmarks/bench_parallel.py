@@ -0,0 +1,36 @@
+"""
+Scaling of hdatearray.parse_many_parallel() with the number of worker processes
+
+    python benchmarks/bench_parallel.py [rows] [max_workers]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from historicaldate import hdatearray
+
+def make_strings(rows, seed=1):
+    "Mostly distinct strings, so that the time is spent parsing rather than looking up repeats"
+    rng = random.Random(seed)
+    months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+    forms = [lambda: f"{rng.randint(1, 28)} {rng.choice(months)} {rng.randint(1, 2020)}",
+             lambda: f"circa {rng.randint(1, 2020)}",
+             lambda: f"{rng.randint(1, 2020)}-{rng.randint(1, 12):02}-{rng.randint(1, 28):02}",
+             lambda: f"between {rng.randint(1, 999)} BC and {rng.randint(1, 999)} AD",
+             lambda: f"{rng.choice(months)} {rng.randint(1, 2020)}"]
+    return [rng.choice(forms)() for _ in range(rows)]
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    strings = make_strings(rows)
+    print(f"{rows} rows, {os.cpu_count()} CPUs")
+    base = None
+    for workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        hdatearray.parse_many_parallel(strings, workers=workers, chunksize=max(1000, rows // (4 * workers)))
+        elapsed = time.perf_counter() - start
+        base = base or elapsed
+        print(f"workers={workers:3}  {elapsed:7.2f} s  {rows / elapsed:10.0f} rows/s  speedup {base / elapsed:5.2f}")
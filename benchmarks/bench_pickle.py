@@ -0,0 +1,26 @@
+"""
+Size of pickled HDate objects, and time to pickle and unpickle them
+
+    python benchmarks/bench_pickle.py [instances]
+"""
+import os
+import pickle
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from historicaldate import hdate
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    months = ["Jan", "Mar", "Jun", "Dec"]
+    hds = [hdate.HDate(f"{1 + i % 28} {months[i % 4]} {1000 + i % 1000}" if i % 2 else f"circa {1 + i % 2000}") 
+           for i in range(n)]
+    print(f"one object:  {len(pickle.dumps(hds[0])):8} bytes")
+    start = time.perf_counter()
+    data = pickle.dumps(hds)
+    dumped = time.perf_counter()
+    pickle.loads(data)
+    loaded = time.perf_counter()
+    print(f"{n} objects: {len(data) / n:8.1f} bytes/object, dumps {(dumped - start) / n * 1e6:.2f} us/object, "
+          f"loads {(loaded - dumped) / n * 1e6:.2f} us/object")
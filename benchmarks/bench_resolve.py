@@ -0,0 +1,40 @@
+"""
+Recalculating dates after a change of context: constructing HDates again, against HDate.resolve() and hdate.resolve_all()
+
+    python benchmarks/bench_resolve.py [dates] [distinct]
+"""
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from historicaldate import hdate
+from historicaldate import hdatecontext
+from bench_parallel import make_strings
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    distinct = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    strings = random.Random(1).choices(make_strings(distinct), k=n)
+    ctx = hdatecontext.HDateContext(today=datetime.date(2000, 1, 1), circa_days=365)
+
+    hdates = [hdate.HDate(s) for s in strings]
+    kept = [hdate.HDate(s, keep_parsed=True) for s in strings]
+    expected, t_construct = timed(lambda: [hdate.HDate(s, context=ctx).pdates for s in strings])
+    _, t_all = timed(hdate.resolve_all, hdates, ctx)
+    _, t_kept = timed(lambda: [hd.resolve(ctx) for hd in kept])
+    assert [hd.pdates for hd in hdates] == expected and [hd.pdates for hd in kept] == expected
+    _, t_each = timed(lambda: [hd.resolve() for hd in hdates])
+
+    print(f"{n} dates, {distinct} distinct strings")
+    print(f"HDate() again:               {t_construct:7.3f} s")
+    print(f"resolve_all():               {t_all:7.3f} s  speedup {t_construct / t_all:5.1f}")
+    print(f"resolve(), keep_parsed=True: {t_kept:7.3f} s  speedup {t_construct / t_kept:5.1f}")
+    print(f"resolve():                   {t_each:7.3f} s  speedup {t_construct / t_each:5.1f}")
@@ -0,0 +1,45 @@
+"""
+Sorting HDates and finding those in a range of dates: by sort_key() and SortedHDates, against a key read from pdates
+
+    python benchmarks/bench_sorted.py [instances] [queries]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from historicaldate import hdate
+from historicaldate import hdatesorted
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    nqueries = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    rng = random.Random(1)
+    months = ["Jan", "Mar", "Jun", "Dec"]
+    hds = [hdate.HDate(f"{rng.randint(1, 28)} {rng.choice(months)} {rng.randint(1, 2000)}" if i % 2
+                       else f"circa {rng.randint(1, 2000)}") for i in range(n)]
+    print(f"{n} instances, {nqueries} range queries")
+
+    _, t_pdates = timed(lambda: sorted(hds, key=lambda hd: hd.pdates["ordinal_mid"]))
+    _, t_pdates_built = timed(lambda: sorted(hds, key=lambda hd: hd.pdates["ordinal_mid"]))
+    _, t_key = timed(lambda: sorted(hds, key=hdate.HDate.sort_key))
+    _, t_lt = timed(lambda: sorted(hds))
+    shd, t_sorted = timed(lambda: hdatesorted.SortedHDates(hds))
+    print(f"sort, key from pdates (first use): {t_pdates:7.3f} s")
+    print(f"sort, key from pdates (built):     {t_pdates_built:7.3f} s")
+    print(f"sort, key=HDate.sort_key:          {t_key:7.3f} s")
+    print(f"sort, by HDate.__lt__:             {t_lt:7.3f} s")
+    print(f"SortedHDates(hds):                 {t_sorted:7.3f} s")
+
+    starts = [rng.randint(1, 2000 * 365) for _ in range(nqueries)]
+    _, t_scan = timed(lambda: [[hd for hd in hds if start <= hd.pdates["ordinal_mid"] <= start + 3652] for start in starts])
+    found, t_between = timed(lambda: [shd.between(start, start + 3652) for start in starts])
+    print(f"range, scan of pdates:             {t_scan / nqueries * 1e6:9.1f} us/query")
+    print(f"range, SortedHDates.between():     {t_between / nqueries * 1e6:9.1f} us/query "
+          f"({sum(map(len, found)) / nqueries:.0f} HDates/query)")
@@ -0,0 +1,44 @@
+"""
+Loading parsed dates from an hdatestore file, against parsing the strings again with hdatearray.parse_many()
+
+    python benchmarks/bench_store.py [records] [file]
+
+Loading times are with the file in the page cache, as it will be just after writing. For a truly cold
+load, drop the cache (on Linux, as root: sync; echo 3 > /proc/sys/vm/drop_caches) and run again,
+giving the same *file*, which is then kept
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from historicaldate import hdatearray
+from historicaldate import hdatestore
+from bench_parallel import make_strings
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+    path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(tempfile.gettempdir(), "bench_store.hds")
+    keep = len(sys.argv) > 2
+    strings = make_strings(n)
+    print(f"{n} records")
+    if not (keep and os.path.exists(path)):
+        _, t_write = timed(lambda: hdatestore.write_store(path, strings))
+        print(f"write_store:             {t_write:8.2f} s, {os.path.getsize(path) / n:.1f} bytes/record")
+    try:
+        _, t_parse = timed(lambda: hdatearray.parse_many(strings))
+        print(f"parse_many:              {t_parse:8.2f} s")
+        for verify in (False, True):
+            store, t_open = timed(lambda: hdatestore.HDateStore(path, verify=verify))
+            _, t_sum = timed(lambda: int(store.ordinal_mid[store.valid].sum()))
+            print(f"open, verify={verify!s:5}:     {t_open:8.4f} s, then {t_sum:.3f} s to read all mid ordinals")
+            store.close()
+    finally:
+        if not keep:
+            os.remove(path)
@@ -0,0 +1,70 @@
+"""
+Throughput and peak memory of hdatestream on a large CSV file
+
+    python benchmarks/bench_stream.py [megabytes] [file]
+
+Writes a CSV file of about *megabytes* (default 2000) to *file* (default: a temporary file, deleted afterwards)
+unless *file* already exists, then streams it through *parse_stream()* and *parse_stream_columns()*
+"""
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from historicaldate import hdatestream
+
+class ErrorCounter():
+    "Side channel for bad rows which keeps only counts, so memory use stays constant"
+    def __init__(self):
+        self.count = self.rows = 0
+        self.last_row = None
+    def append(self, item):
+        self.count += 1
+        if item[0] != self.last_row:
+            self.rows += 1
+            self.last_row = item[0]
+
+def write_csv(path, megabytes, seed=1):
+    rng = random.Random(seed)
+    months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+    forms = [lambda: f"{rng.randint(1, 28)} {rng.choice(months)} {rng.randint(1, 2020)}",
+             lambda: f"circa {rng.randint(1, 2020)}",
+             lambda: f"{rng.randint(1, 2020)}-{rng.randint(1, 12):02}-{rng.randint(1, 28):02}",
+             lambda: f"{rng.randint(1, 999)} BC",
+             lambda: "",
+             lambda: "unknown"]
+    lines = [f"{i},event {i},{rng.choice(forms)()},{rng.choice(forms)()}\n" for i in range(100000)]
+    block = "".join(lines)
+    with open(path, "w") as f:
+        f.write("id,name,start,end\n")
+        for _ in range(max(1, megabytes * 2**20 // len(block))):
+            f.write(block)
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024     # kilobytes on Linux
+
+if __name__ == "__main__":
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(tempfile.gettempdir(), "bench_stream.csv")
+    created = not os.path.exists(path)
+    if created:
+        write_csv(path, megabytes)
+    try:
+        print(f"{os.path.getsize(path) / 2**20:.0f} MB, peak RSS before streaming {peak_rss_mb():.0f} MB")
+        for name, stream in [("parse_stream", hdatestream.parse_stream),
+                             ("parse_stream_columns", hdatestream.parse_stream_columns)]:
+            errors = ErrorCounter()
+            start = time.perf_counter()
+            rows = 0
+            for item in stream(hdatestream.read_csv(path), ["start", "end"], errors=errors):
+                rows += len(item.rows) if name == "parse_stream_columns" else 1
+            elapsed = time.perf_counter() - start
+            rows += errors.rows
+            print(f"{name:21} {rows:10} rows in {elapsed:7.1f} s, {rows / elapsed:8.0f} rows/s, "
+                  f"{errors.rows} bad rows, peak RSS {peak_rss_mb():.0f} MB")
+    finally:
+        if created:
+            os.remove(path)
@@ -0,0 +1,176 @@
+"""
+Benchmark suite: HDate construction and the hdateutils conversions, over corpora of each kind of date string
+
+    python benchmarks/bench_suite.py [--size N] [--repeat N] [--output results.json]
+                                     [--baseline benchmarks/baseline.json] [--save-baseline] [--tolerance 0.3]
+
+Results are times per call in nanoseconds (the best of *repeat* runs over each corpus), printed and
+optionally written as JSON. Each is also given relative to a reference, a fixed piece of pure Python
+work timed in turn with it (the median of the runs), which takes out most of the difference between 
+machines and between runs.
+
+No baseline is shipped, as timings depend on the machine. The first step is to save one there,
+e.g. before making a change::
+
+    python benchmarks/bench_suite.py --save-baseline
+
+Later runs compare each relative result with the baseline, and the exit status is 1 if any is slower
+by more than *tolerance* (0.3 = 30%).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from historicaldate import hdate
+from historicaldate import hdateutils
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# -- name: (dateformat, missingasongoing, function of a random.Random returning one string)
+CORPORA = {
+    "year": (None, False, lambda rng: f"{rng.randint(1, 2020)}"),
+    "iso": (None, False, lambda rng: f"{rng.randint(1, 2020)}-{rng.randint(1, 12):02}-{rng.randint(1, 28):02}"),
+    "dmy_text": (None, False, lambda rng: f"{rng.randint(1, 28)} {rng.choice(MONTHS)} {rng.randint(1, 2020)}"),
+    "dmy_numeric": ("dmy", False, lambda rng: f"{rng.randint(1, 28)}/{rng.randint(1, 12)}/{rng.randint(1, 2020)}"),
+    "mdy_numeric": ("mdy", False, lambda rng: f"{rng.randint(1, 12)}/{rng.randint(1, 28)}/{rng.randint(1, 2020)}"),
+    "mdy_text": ("mdy", False, lambda rng: f"{rng.choice(MONTHS)} {rng.randint(1, 28)}, {rng.randint(1, 2020)}"),
+    "circa": (None, False, lambda rng: f"circa {rng.randint(1, 2020)}"),
+    "circa_clen": (None, False, lambda rng: f"circa{rng.randint(1, 20)}{rng.choice('ymd')} {rng.randint(1, 2020)}"),
+    "between": (None, False, lambda rng: f"between {rng.randint(1, 1000)} and {rng.randint(1001, 2020)}"),
+    "bc": (None, False, lambda rng: rng.choice([f"{rng.randint(1, 3000)} BC",
+                                                f"{rng.randint(1, 28)} {rng.choice(MONTHS)} {rng.randint(1, 3000)} BCE",
+                                                f"circa {rng.randint(1, 3000)} BC",
+                                                f"between {rng.randint(501, 3000)} BC and {rng.randint(1, 500)} BC"])),
+    "ongoing": (None, True, lambda rng: rng.choice(["ongoing", ""])),
+    "malformed": (None, False, lambda rng: rng.choice([f"sometime in {rng.randint(1, 2020)}", f"{rng.randint(1, 2020)}??",
+                                                       f"31 Feb {rng.randint(1, 2020)}", f"{rng.randint(1, 2020)}-13-01",
+                                                       "unknown"])),
+}
+_VALID_CORPORA = [name for name in CORPORA if name != "malformed"]
+
+def make_corpora(size, seed=1):
+    rng = random.Random(seed)
+    return {name: [make(rng) for _ in range(size)] for name, (_, _, make) in CORPORA.items()}
+
+def make_hdate(s, dateformat, missingasongoing):
+    try:
+        return hdate.HDate(s, dateformat=dateformat, missingasongoing=missingasongoing)
+    except ValueError:
+        return None
+
+def benchmarks(corpora, size, seed=1):
+    "Dictionary of name: (function of one item, list of items)"
+    rng = random.Random(seed)
+    cases = {}
+    for name, strings in corpora.items():
+        dateformat, missingasongoing, _ = CORPORA[name]
+        cases[f"HDate/{name}"] = (lambda s, f=dateformat, m=missingasongoing: make_hdate(s, f, m), strings)
+        cases[f"calc_mid_ordinal/{name}"] = (lambda s, f=dateformat: hdateutils.calc_mid_ordinal(s, dateformat=f), strings)
+        if name in _VALID_CORPORA and not missingasongoing:
+            cases[f"to_ordinal/{name}"] = (lambda s, f=dateformat: hdateutils.to_ordinal(s, dateformat=f), strings)
+    ad = [rng.randint(1, 2020 * 365) for _ in range(size)]
+    bc = [rng.randint(-3000 * 365, 0) for _ in range(size)]
+    cases["to_ordinal/int"] = (hdateutils.to_ordinal, ad)
+    for label, ordinals in (("ad", ad), ("bc", bc)):
+        cases[f"to_ymd/{label}"] = (hdateutils.to_ymd, ordinals)
+        cases[f"to_years/{label}"] = (hdateutils.to_years, ordinals)
+        cases[f"years_to_ordinal/{label}"] = (hdateutils.years_to_ordinal, [hdateutils.to_years(o) for o in ordinals])
+    return cases
+
+def reference(s):
+    "Fixed pure Python work on a string, of about the kind done in parsing, against which results are given"
+    counts = {}
+    for c in s.lower():
+        counts[c] = counts.get(c, 0) + 1
+    return sorted(counts.items())
+
+def time_calls(func, items, reference_items, block=50):
+    """
+    Return *(ns, reference_ns)*, the nanoseconds per call of *func* on each of *items* and of *reference()*
+    on each of *reference_items*, timed in turn over blocks of *block* items, so that both see the same
+    changes in the speed of the machine
+    """
+    clock = time.perf_counter_ns
+    total = reference_total = 0
+    for i in range(0, len(items), block):
+        start = clock()
+        for item in reference_items[i:i + block]:
+            reference(item)
+        middle = clock()
+        for item in items[i:i + block]:
+            func(item)
+        total += clock() - middle
+        reference_total += middle - start
+    return total / len(items), reference_total / min(len(items), len(reference_items))
+
+def run(size, repeat):
+    """
+    Return *(results, relative)*: dictionaries of name: nanoseconds per call (the best of *repeat* runs),
+    and of name: time as a multiple of that of *reference()* timed alongside it (the median of the runs)
+    """
+    corpora = make_corpora(size)
+    results, rel = {}, {}
+    for name, (func, items) in benchmarks(corpora, size).items():
+        runs = [time_calls(func, items, corpora["dmy_text"]) for _ in range(repeat)]
+        results[name] = round(min(ns for ns, _ in runs), 1)
+        rel[name] = round(statistics.median(ns / reference_ns for ns, reference_ns in runs), 3)
+    return results, rel
+
+def compare(results, baseline, tolerance):
+    "Print each relative result against the baseline, returning the names of those that are slower than allowed"
+    regressions = []
+    for name, rel in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:32} {rel:8.2f} x ref    (no baseline)")
+            continue
+        ratio = rel / base
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:32} {rel:8.2f} x ref  {base:8.2f} x ref  x{ratio:5.2f}{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=2000, help="strings or ordinals in each corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="runs over each corpus, of which the best time and median relative time are kept")
+    parser.add_argument("--output", help="file to write results to, as JSON")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline results to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed slowdown, as a fraction")
+    args = parser.parse_args(argv)
+
+    results, rel = run(args.size, args.repeat)
+    document = {"python": platform.python_version(), "platform": platform.platform(), "size": args.size,
+                "unit": "ns per call", "results": results, "relative": rel}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["relative"]
+    elif not args.save_baseline:
+        print(f"No baseline at {args.baseline}: save one on this machine with --save-baseline")
+    regressions = compare(rel, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} slower than the baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
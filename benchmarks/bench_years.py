@@ -0,0 +1,32 @@
+"""
+Conversion of ordinals to fractional years and back: hdatearray functions against a loop over the hdateutils ones
+
+    python benchmarks/bench_years.py [values]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from historicaldate import hdatearray
+from historicaldate import hdateutils
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    ordinals = np.random.default_rng(1).integers(-365 * 2500, 365 * 2500, n)
+    ordinal_list = ordinals.tolist()
+    years, t_array = timed(hdatearray.to_years, ordinals)
+    years_list, t_loop = timed(lambda: [hdateutils.to_years(o) for o in ordinal_list])
+    print(f"{n} values")
+    print(f"to_years:         loop {t_loop:7.3f} s  array {t_array:7.3f} s  speedup {t_loop / t_array:7.1f}")
+    back, t_array = timed(hdatearray.years_to_ordinal, years)
+    _, t_loop = timed(lambda: [hdateutils.years_to_ordinal(y) for y in years_list])
+    print(f"years_to_ordinal: loop {t_loop:7.3f} s  array {t_array:7.3f} s  speedup {t_loop / t_array:7.1f}")
+    assert np.array_equal(back, ordinals)
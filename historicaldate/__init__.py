@@ -1,3 +1,6 @@
 "A small Python package for date handling including support for BC dates and uncertainty"
 from .hdate import HDate
+from .hdatecontext import HDateContext
+from .hdateparser import HDateParser, get_parser
+from .hdatesorted import SortedHDates
 from .hdateutils import *
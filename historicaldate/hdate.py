@@ -1,12 +1,34 @@
-import sys
-import re
 import datetime
-
-# -- Fix in case this is included as a submodule
-if "./historicaldate" not in sys.path:
-    sys.path.insert(0,"./historicaldate") # Put this first in list  
-
-from historicaldate import hdateutils
+import operator
+import time
+
+from historicaldate import hdatecalendar
+from historicaldate import hdateparser
+from historicaldate import hdatecache
+from historicaldate import hdatecontext
+from historicaldate import hdatestats
+
+# -- Specification levels, as in *pdates*, and their codes when packed into an int
+SPECLEVELS = ("", "d", "m", "y", "c", "o")
+SPECLEVEL_CODES = {sl: code for code, sl in enumerate(SPECLEVELS)}
+
+# -- Layout of HDate._levels: three bits for each of the mid, late and early spec levels, then
+#    one bit for each of those that has a python date, then flags
+_PREFIXES = ("mid", "late", "early")
+_HAS_DATE = 1 << 9
+_NO_PDATES = 1 << 12
+_MISSINGASONGOING = 1 << 13
+_CIRCA = 1 << 14               # written as 'circa'
+
+# -- HDate._parsed: the values of d_parsed in the order of hdateparser.D_PARSED_KEYS, or () for a blank string,
+#    shared between HDates with the same values through _interned, which is emptied when it reaches _INTERN_LIMIT
+_D_PARSED_VALUES = operator.itemgetter(*hdateparser.D_PARSED_KEYS)
+_INTERN_LIMIT = 100000
+_interned = {}
+
+# -- Reasons for the parts reported by hdatecalendar.ymd_error()
+_DATE_ERRORS = {"day": hdateparser.DAY_OUT_OF_RANGE, "month": hdateparser.MONTH_OUT_OF_RANGE,
+                "year": hdateparser.YEAR_OUT_OF_RANGE}
 
 # ------------------------------------------------------------------------------------------------------
 class HDate():
@@ -14,8 +36,23 @@ class HDate():
     Object class for date handling including support for BC dates and uncertainty
 
     The date is represented in the dictionary property *pdates*
+
+    To keep memory use low, an HDate object holds only its input string, its parser, the three ordinals,
+    a packed int of the specification levels, and a tuple of the values of *d_parsed*, which is shared
+    by all HDates with the same values. *pdates* and *d_parsed* are built from these, and *re_parsed*
+    by parsing the string again, the first time they are used, and are then kept.
+
+    HDates are ordered by their mid, early and late ordinals, then specification levels (see *sort_key()*), 
+    and are equal if they have the same ordinals, specification levels and 'circa' flag. 
+    HDates with no dates cannot be ordered.
     """
-    def __init__(self, hdstr="", missingasongoing=False, dateformat=None):
+    __slots__ = ("parser", "input", "_ordinal_early", "_ordinal_mid", "_ordinal_late", "_levels",
+                 "_parsed", "_re_parsed", "_d_parsed", "_pdates")
+
+    circa_interval_days = hdatecontext.DEFAULT_CIRCA_DAYS    # as in hdatecontext.DEFAULT_CONTEXT
+
+    def __init__(self, hdstr="", missingasongoing=False, dateformat=None, parser=None, context=None,
+                 keep_parsed=False):
         """
         Create HDate object encoding the date represented by the string *hdstr*
 
@@ -28,213 +65,309 @@ class HDate():
         * *None* (default): date formats accepted are variants of *25 Dec 1066* and *1066-12-25*. 
         * *'dmy'*: *25/12/1066* is also accepted. 
         * *'mdy'*: *12/25/1066*, *Dec 25 1066* and *1066-12-25* are accepted, but *25 Dec 1066* is not accepted
+
+        *parser* (HDateParser, optional): the parser to use. By default the shared parser 
+        for *dateformat* is used, see *hdateparser.get_parser()*
+
+        *context* (HDateContext, optional): the date of 'ongoing', circa interval and calendar used 
+        to calculate the dates, see *hdatecontext*. By default the parser's context is used, 
+        or if it has none, *hdatecontext.DEFAULT_CONTEXT*. The context is not kept by the object
+
+        *keep_parsed* (bool, default *False*): if True, *re_parsed* and *d_parsed* are kept from the start,
+        rather than being built again when first used. This uses more memory, but means that
+        *resolve()* never needs to parse the string again
+
+        If caching has been switched on (see *hdatecache*), parse results are looked up there first
         """
-        self.circa_interval_days = int(5 * 365.25)
-        self.match_pattern = self._create_match_pattern(dateformat)
-        self.compiled_pattern = re.compile(self.match_pattern, re.VERBOSE | re.IGNORECASE)
+        self.parser = parser if parser is not None else hdateparser.get_parser(dateformat)
         self.input = hdstr
+        self._re_parsed = self._d_parsed = self._pdates = None
+        context = self._context(context)
+
+        if (cache := hdatecache.active_cache) is not None:
+            key = (str(hdstr), self.parser.dateformat, missingasongoing, context)
+            if (entry := cache.get(key)) is None:
+                entry = self._parse_to_cache_entry(missingasongoing, context)
+                cache.put(key, entry)
+            self._load_cache_entry(entry, missingasongoing, context)
+            if keep_parsed and entry.d_parsed:
+                self._re_parsed, self._d_parsed = dict(entry.re_parsed), _expand(entry.d_parsed)
+        else:
+            self._re_parsed, self._d_parsed = self.parser.parse(hdstr, missingasongoing=missingasongoing)
+            self._parsed = _compact(self._d_parsed)
+            self._resolve(missingasongoing, context)
+        if not keep_parsed:
+            self._re_parsed = self._d_parsed = None
+
+    def _context(self, context):
+        "*context*, or if it is None, the context of the parser, or *hdatecontext.DEFAULT_CONTEXT*"
+        if context is not None:
+            return context
+        return self.parser.context if self.parser.context is not None else hdatecontext.DEFAULT_CONTEXT
+
+    def resolve(self, context=None):
+        """
+        Calculate the dates again from *d_parsed*, using *context* (as in the HDate() constructor), 
+        e.g. after a change of circa interval or of the date taken as today
 
-        if s := (str(hdstr).strip() if (str(hdstr).strip() or not missingasongoing) else "ongoing"):
-            srch = self.compiled_pattern.search(s)
-            if srch is None:
-                raise ValueError(f"Illegal date format: {hdstr}")
-            else:
-                self.re_parsed = {key:srch[key] for key in self.compiled_pattern.groupindex}
+        Only the date arithmetic is repeated, from *d_parsed* if it is held (see *keep_parsed* in the 
+        HDate() constructor), or else from the tuple of its values held by every HDate. The string is parsed
+        again only for an HDate which has been unpickled, and only the first time.
+        Any changes made to *pdates* are lost. See also *resolve_all()*
+        """
+        missingasongoing = bool(self._levels & _MISSINGASONGOING)
+        self._pdates = None
+        if self._d_parsed is not None:
+            self._resolve(missingasongoing, self._context(context))
+            return
+        if self._parsed is None:
+            self._parsed = _compact(self._reparse()[1])
+        self._d_parsed = _expand(self._parsed)    # only while the dates are calculated
+        self._resolve(missingasongoing, self._context(context))
+        self._d_parsed = None
 
-            self.d_parsed = self._convert_re_parsed()
+    # ------------------------------------------------------------------------------------------------------
+    def _resolve(self, missingasongoing, context):
+        "Set the ordinals and packed levels from d_parsed, using *context* (HDateContext)"
+        if (stats := hdatestats.active_stats) is not None:
+            dates = self._calc_dates_recorded(stats, context)
         else:
-            self.d_parsed = None
-
-        try:
-            self._convert_to_python_date_naive()
-        except:
-            self.pdates = None
-            
+            try:
+                dates = self._calc_dates(context)
+            except:
+                dates = None
+        self._ordinal_early, self._ordinal_mid, self._ordinal_late, self._levels = \
+            self._pack(dates, missingasongoing, bool(self._d_parsed and self._d_parsed["circa"]))
+
+    @staticmethod
+    def _pack(pdates, missingasongoing, circa=False):
+        "Return the tuple (ordinal_early, ordinal_mid, ordinal_late, levels) for a pdates (or _calc_dates()) dictionary, or None"
+        levels = (_MISSINGASONGOING if missingasongoing else 0) | (_CIRCA if circa else 0)
+        if pdates is None:
+            return None, None, None, levels | _NO_PDATES
+        for i, prefix in enumerate(_PREFIXES):
+            levels |= SPECLEVEL_CODES[pdates[f"sl{prefix}"]] << (3 * i)
+            if pdates[prefix]:
+                levels |= _HAS_DATE << i
+        return pdates["ordinal_early"], pdates["ordinal_mid"], pdates["ordinal_late"], levels
+
+    def _unpack(self):
+        "Build the pdates dictionary (or None) from the ordinals and packed levels"
+        levels = self._levels
+        if levels & _NO_PDATES:
+            return None
+        pdates = {}
+        for i, (prefix, ordinal) in enumerate(zip(_PREFIXES, (self._ordinal_mid, self._ordinal_late, self._ordinal_early))):
+            pdates[prefix] = datetime.date.fromordinal(ordinal) if levels & (_HAS_DATE << i) else None
+            pdates[f"ordinal_{prefix}"] = ordinal
+            pdates[f"sl{prefix}"] = SPECLEVELS[(levels >> (3 * i)) & 7]
+        return pdates
     # ------------------------------------------------------------------------------------------------------
-    def _create_match_pattern(self, dateformat):
-        circa_pattern = "circa|c|c.|about|estimated"
-        day_pattern = "[0-9]{1,2}"
-
-        months = ["january", "february","march","april","may","june",
-                "july","august","september","october","november","december"]
-        self.months = [month[0:3] for month in months]   # three-letter abbreviations 
-        self.monthnumberpattern = '[1-9]|0[1-9]|1[0-2]'
-        month_pattern = "|".join(months + self.months)   # allow either full month names or 3-letter abbrevations
-
-        if dateformat:   # if not None then numerical months are also allowed
-            month_pattern += "|" + self.monthnumberpattern
-
-        year_pattern = "[0-9]{1,8}"    # should we require at least three year digits to avoid confusion with month and day?
-        nmonth_pattern = self.monthnumberpattern  # was "[0-9]{1,2}"
-        calendar_pattern = "ce|ad|bc|bce"
-
-        def makedatepattern(prefix=""):
-            if dateformat is None or dateformat.lower() == "dmy":
-                datepattern = f"""
-                    (
-                        (
-                            (?P<{prefix}preday>{day_pattern})(st|nd|rd|th)?\\s*(/|\\s))?
-                            \\s*(?P<{prefix}premon>{month_pattern})
-                            \\s*(/|\\s|,)
-                        )?
-                        \\s*
-                        (?P<{prefix}year>{year_pattern})
-                        (-(?P<{prefix}postmon>{nmonth_pattern})
-                            (-(?P<{prefix}postday>{day_pattern})
-                            )?
-                        )?
-                        (\\s*(?P<{prefix}calendar>{calendar_pattern}))?
-                """
-            elif dateformat.lower() == "mdy":
-                datepattern = f"""
-                    (
-                        (
-                            (?P<{prefix}premon>{month_pattern})\\s*(/|\\s)
-                            \\s*(?P<{prefix}preday>{day_pattern})(st|nd|rd|th)?)?
-                            (,)?
-                        )?
-                        \\s*/?\\s*(?P<{prefix}year>{year_pattern})
-                        (-(?P<{prefix}postmon>{nmonth_pattern})
-                            (-(?P<{prefix}postday>{day_pattern})
-                            )?
-                        )?
-                        (\\s*(?P<{prefix}calendar>{calendar_pattern})
-                    )?
-                """
-            else:
-                raise NotImplementedError(f"dateformat must be None, 'dmy' or 'mdy': not '{dateformat}'")
-            return datepattern
-
-        pattern = f"""
-                ^(
-                    (?P<ongoing>ongoing)|
-                    ((?P<circa>{circa_pattern})
-                        ((?P<clen>{year_pattern})
-                            (?P<clentype>y|m|d)
-                        )?
-                    )?
-                    (\\s*{makedatepattern(prefix="mid")})?
-                    (\\s*(earliest|after|between)\\s+{makedatepattern(prefix="early")})?
-                    (\\s*(latest|before|and)\\s+{makedatepattern(prefix="late")})?
-                )$
-        """  
-
-        return pattern
+    def __reduce__(self):
+        """
+        Pickle as the input string, parser options, ordinals and packed levels
+
+        Unpickling uses the shared parser for the same options and does not parse the string again.
+        A parser other than the shared one, e.g. one with its own context, is pickled with the HDate
+        (once for all of the HDates in one pickle), see *HDateParser.__reduce__()*.
+        *pdates* is included only if it has been changed since it was built
+        """
+        args = (self.input, self.parser.dateformat, self.parser.engine,
+                self._ordinal_early, self._ordinal_mid, self._ordinal_late, self._levels)
+        pdates = self._pdates if self._pdates is not None and self._pdates != self._unpack() else None
+        if self.parser is not hdateparser.get_parser(self.parser.dateformat, self.parser.engine):
+            args += (pdates, self.parser)
+        elif pdates is not None:
+            args += (pdates,)
+        return (_unpickle, args)
+
+    def __copy__(self):
+        """
+        A copy with the same parser, which may be one made by the caller, with its own context.
+        Nothing is parsed again. Any *pdates*, *d_parsed* and *re_parsed* held are copied, 
+        so that changes to the copy's do not affect this object
+        """
+        hd = HDate.__new__(HDate)
+        hd.parser, hd.input, hd._levels, hd._parsed = self.parser, self.input, self._levels, self._parsed
+        hd._ordinal_early, hd._ordinal_mid, hd._ordinal_late = self._ordinal_early, self._ordinal_mid, self._ordinal_late
+        hd._re_parsed, hd._d_parsed, hd._pdates = [dict(d) if d is not None else None
+                                                   for d in (self._re_parsed, self._d_parsed, self._pdates)]
+        return hd
     # ------------------------------------------------------------------------------------------------------
-    def _convert_re_parsed(self):
+    def __eq__(self, other):
         """
-        Convert re_parsed format to d_parsed format
-        This represents canonical form, so
-           - Represents Y/M/D as integers
-           - Does no calculations
-           - converts calendars to bce or ce
-           - sets main calendar, others are set only if different
+        HDates are equal if they have the same ordinals, specification levels and 'circa' flag,
+        so HDate("25 Dec 1066") == HDate("1066-12-25"). HDates with no dates are equal if
+        their input strings are the same. Neither string is parsed again.
+        The ordinals and levels are those of *pdates*, including any changes made to it, see *ordinals*
         """
+        if not isinstance(other, HDate):
+            return NotImplemented
+        return self.ordinals == other.ordinals and self._canonical() == other._canonical()
 
-        sp = self.re_parsed
-
-        # preday and postday cannot both be set, ditto premon and postmon
-        def check_prepost_dup(prefix):
-            if sp[f"{prefix}premon"] is not None and sp[f"{prefix}postmon"] is not None:
-                raise ValueError(f"Prefix month and postfix month ({prefix}) cannot both be set: {self.input}")
-            # Failing here should be impossible if test above is passed
-            assert sp[f"{prefix}preday"] is None or sp[f"{prefix}postday"] is None
-
-        check_prepost_dup("mid")
-        check_prepost_dup("early")
-        check_prepost_dup("late")
-
-        hd = {}
-        hd["circa"] = sp["circa"] is not None  # 'circa':bool
-        hd["ongoing"] = sp["ongoing"] is not None  # 'ongoing':bool
-        hd["clen"] = sp["clen"]
-        hd["clentype"] = sp["clentype"]
-
-        def getmonthnum(month):
-            if len(month) >= 3 and month[0:3].lower() in self.months:
-                monthnum = self.months.index(month[0:3].lower()) + 1
-            elif re.search(self.monthnumberpattern, month):
-                monthnum = int(month)
-            else:
-                assert False, f"Illegal month string {month}"
-            assert monthnum >= 1 and monthnum <= 12
-            return monthnum
-                            
-        def set_dmy(prefix=""):
-            """
-            To do: check values are within range???
-            """
-            hd[prefix+"day"] = int(sp[prefix+"preday"]) if sp[prefix+"preday"]  \
-                        else int(sp[prefix+"postday"]) if sp[prefix+"postday"]  \
-                        else None
-            hd[prefix+"mon"] = getmonthnum(sp[prefix+"premon"]) if sp[prefix+"premon"]  \
-                        else int(sp[prefix+"postmon"]) if sp[prefix+"postmon"]  \
-                        else None
-            hd[prefix+"year"] = int(sp[prefix+"year"]) if sp[prefix+"year"] else None
-            ctemp = sp[prefix+"calendar"].lower() if sp[prefix+"calendar"] else None
-            hd[prefix+"calendar"] = {'bc':'bce','ad':'ce'}.get(ctemp, ctemp)
-
-        set_dmy("mid")
-        set_dmy("early")
-        set_dmy("late")
-
-        # resolve calendars
-        # (1) if main is missing, copy from late
-        # (2) if main is still missing, and early is ad/ce, copy from early (else error)
-        # (3) if early is missing, copy from main
-        if hd["midcalendar"] is None: hd["midcalendar"] = hd["latecalendar"]
-        if hd["midcalendar"] is None: 
-            if hd["earlycalendar"] is None:
-                pass
-            elif hd["earlycalendar"].lower() in  {'bc', 'bce'}:
-                raise ValueError(f"If early calendar is BC/BCE, main calendar must be specified: {self.input}")
-            else:
-                hd["midcalendar"] = hd["earlycalendar"]
-        if hd["earlycalendar"] is None: 
-            hd["earlycalendar"] = hd["midcalendar"]
+    def __hash__(self):
+        return hash(self.ordinals)
 
-        return hd
-    # ------------------------------------------------------------------------------------------------------
-    def max_day_in_month(self,year, month, proleptic_gregorian=False, calendar='ce'):
-        '''
-        Calculate the maximum day number in a month
+    def _canonical(self):
+        "The packed levels and flags other than *missingasongoing*, or the stripped input string if there are no dates"
+        levels = self._levels if self._pdates is None else self._pack(self._pdates, False, self._levels & _CIRCA)[3]
+        if levels & _NO_PDATES:
+            return str(self.input).strip()
+        return levels & ~_MISSINGASONGOING
 
-        *month* is an int, in range 1-12
+    def sort_key(self):
+        """
+        The tuple (ordinal_mid, ordinal_early, ordinal_late, levels), by which HDates are ordered,
+        where *levels* is an int packing the specification levels and 'circa' flag. HDates 
+        have the same key only if they are equal, so the order is total and agrees with ==
 
-        If *proleptic_gregorian* is False: Assumes a Julian calendar to 1752, Gregorian after that
+        Raises TypeError if there are no dates (*pdates* is None)
+        """
+        early, mid, late = self.ordinals
+        if mid is None:
+            raise TypeError(f"HDate has no dates to order by: '{self.input}'")
+        return mid, early, late, self._canonical()
 
-        * max_day_in_month(1700, 2) == 29
-        * max_day_in_month(1800, 2) == 28
+    def __lt__(self, other):
+        return self.sort_key() < other.sort_key() if isinstance(other, HDate) else NotImplemented
 
-        If *proleptic_gregorian* is True, assumes a Gregorian calendar throughout
+    def __le__(self, other):
+        return self.sort_key() <= other.sort_key() if isinstance(other, HDate) else NotImplemented
 
-        So max_day_in_month(1700, 2) == 28
+    def __gt__(self, other):
+        return self.sort_key() > other.sort_key() if isinstance(other, HDate) else NotImplemented
 
-        A supposed proleptic Julian calendar is used before 8AD, when leap years
-        every four years became standardised, so the years 4AD, 1BC, 5BC etc. are
-        treated as leap years
-        '''
-        mlengths = [31,28,31,30,31,30,31,31,30,31,30,31]
-        mlength = mlengths[month-1]
-
-        if month != 2:
-            pass    # no further adjustment needed
-        elif calendar.lower() in {'ce','ad'}:
-            grg_nonleap = (year % 100 == 0) and (year % 400 != 0)
-            isleapyear = (year % 4 == 0) and not (grg_nonleap and (year > 1752 or proleptic_gregorian))
-            mlength = 29 if isleapyear else 28
-        elif calendar.lower() in {'bce','bc'}:  # assume proleptic julian calendar. 1BC, 5BC etc are leap years
-            isleapyear = (year % 4 == 1)
-            mlength = 29 if isleapyear else 28
+    def __ge__(self, other):
+        return self.sort_key() >= other.sort_key() if isinstance(other, HDate) else NotImplemented
+
+    def definitely_before(self, other):
+        "True if this date is definitely before *other* (an HDate): its latest date is before the other's earliest"
+        return self.sort_key()[2] < other.sort_key()[1]
+
+    def possibly_before(self, other):
+        "True if this date could be before *other* (an HDate): its earliest date is before the other's latest"
+        return self.sort_key()[1] < other.sort_key()[2]
+    # ------------------------------------------------------------------------------------------------------
+    @property
+    def pdates(self):
+        "Dictionary of early, mid and late python dates, ordinals and specification levels, or None"
+        if self._pdates is None:
+            self._pdates = self._unpack()
+        return self._pdates
+
+    @pdates.setter
+    def pdates(self, value):
+        self._pdates = value
+
+    @property
+    def ordinals(self):
+        """
+        The tuple *(ordinal_early, ordinal_mid, ordinal_late)*, which are None if there are no dates
+
+        Taken from *pdates*, including any changes made to it, if it has been built, but does not build it
+        """
+        if (pdates := self._pdates) is not None:
+            return pdates["ordinal_early"], pdates["ordinal_mid"], pdates["ordinal_late"]
+        return self._ordinal_early, self._ordinal_mid, self._ordinal_late
+
+    @property
+    def d_parsed(self):
+        "Canonical form of the parsed string, see *HDateParser.convert_re_parsed()*, or None for a blank string"
+        if self._d_parsed is None:
+            if self._parsed is not None:
+                self._d_parsed = _expand(self._parsed)
+            else:
+                self._re_parsed, self._d_parsed = self._reparse()
+        return self._d_parsed
+
+    @d_parsed.setter
+    def d_parsed(self, value):
+        self._d_parsed = value
+
+    @property
+    def re_parsed(self):
+        "The named groups matched by the parser. Not set for a blank string"
+        if self._re_parsed is None:
+            self._re_parsed, self._d_parsed = self._reparse()
+            if self._re_parsed is None:
+                raise AttributeError("'HDate' object has no attribute 're_parsed'")
+        return self._re_parsed
+
+    @re_parsed.setter
+    def re_parsed(self, value):
+        self._re_parsed = value
+
+    def _reparse(self):
+        "Return (re_parsed, d_parsed) for self.input, keeping the tuple of the values of d_parsed if it is not held"
+        re_parsed, d_parsed = self.parser.parse(self.input, missingasongoing=bool(self._levels & _MISSINGASONGOING))
+        if self._parsed is None:
+            self._parsed = _compact(d_parsed)
+        return re_parsed, d_parsed
+    # ------------------------------------------------------------------------------------------------------
+    def _parse_to_cache_entry(self, missingasongoing, context):
+        "Parse self.input, returning the result, with its dates for *context*, as an (immutable) hdatecache.ParseResult"
+        try:
+            re_parsed, d_parsed = self.parser.parse(self.input, missingasongoing=missingasongoing)
+        except ValueError as e:
+            return hdatecache.ParseResult(None, None, None, str(e))
+
+        packed = None
+        # -- 'ongoing' depends on today's date, so is not stored unless the context fixes it
+        if not (d_parsed and d_parsed["ongoing"]) or context.fixed:
+            self._d_parsed = d_parsed
+            self._resolve(missingasongoing, context)
+            packed = (self._ordinal_early, self._ordinal_mid, self._ordinal_late, self._levels)
+        return hdatecache.ParseResult(tuple(re_parsed.items()) if re_parsed is not None else None,
+                                      _compact(d_parsed), packed, None)
+
+    def _load_cache_entry(self, entry, missingasongoing, context):
+        "Set the ordinals and levels from a hdatecache.ParseResult"
+        if entry.error is not None:
+            raise ValueError(entry.error)
+        self._parsed = entry.d_parsed
+        if entry.pdates is not None:
+            self._ordinal_early, self._ordinal_mid, self._ordinal_late, self._levels = entry.pdates
         else:
-            raise ValueError(f"Calendar must me one of 'ce','ad','bce','bc'")
+            self._d_parsed = _expand(entry.d_parsed)
+            self._resolve(missingasongoing, context)
 
-        return mlength
     # ------------------------------------------------------------------------------------------------------
-    def _calc_clen_interval(self):
-        "Calculate the 'circa' uncertainty to be used, as a timedelta"
+    @property
+    def match_pattern(self):
+        "The regular expression source used by this object's parser"
+        return self.parser.match_pattern
+
+    @property
+    def compiled_pattern(self):
+        "The compiled regular expression used by this object's parser"
+        return self.parser.compiled_pattern
+
+    @property
+    def months(self):
+        "Three-letter month abbreviations used by this object's parser"
+        return self.parser.months
+
+    @property
+    def monthnumberpattern(self):
+        return self.parser.monthnumberpattern
+    # ------------------------------------------------------------------------------------------------------
+    def _convert_re_parsed(self):
+        "Convert re_parsed format to d_parsed format, see *HDateParser.convert_re_parsed()*"
+        return self.parser.convert_re_parsed(self.re_parsed, self.input)
+    # ------------------------------------------------------------------------------------------------------
+    def max_day_in_month(self,year, month, proleptic_gregorian=False, calendar='ce'):
+        '''
+        Calculate the maximum day number in a month, see *hdatecalendar.days_in_month()*
+
+        * max_day_in_month(1700, 2) == 29
+        * max_day_in_month(1700, 2, proleptic_gregorian=True) == 28
+        '''
+        return hdatecalendar.days_in_month(year, month, proleptic_gregorian=proleptic_gregorian, calendar=calendar)
+    # ------------------------------------------------------------------------------------------------------
+    def _calc_clen_days(self, context=None):
+        "Calculate the 'circa' uncertainty to be used, as a number of days. *context* is an HDateContext, see *_calc_dates()*"
         if not self.d_parsed["clen"]:
-            return datetime.timedelta(days=self.circa_interval_days)
+            return (context or hdatecontext.DEFAULT_CONTEXT).circa_days
         else:
             clen = int(self.d_parsed["clen"])
             if self.d_parsed["clentype"] == "d":
@@ -246,62 +379,188 @@ class HDate():
             else:
                 raise ValueError
             
-            return datetime.timedelta(days=days)
+            return days
+
+    def _calc_clen_interval(self, context=None):
+        "Calculate the 'circa' uncertainty to be used, as a timedelta"
+        return datetime.timedelta(days=self._calc_clen_days(context))
     # ------------------------------------------------------------------------------------------------------
     def _ymd_to_dfragment(self, year, month, day, prefix="mid", speclevel="", isbce=False):
-        "Convert year, month, day to (part of) a pdates dictionary"
-        if isbce: # BC (BCE)
-            pythondate = None
-            if year % 4 == 1:  # These are the years treated as BC leap years 1, 5, etc.
-                ordinal_4ad = hdateutils.to_ordinal(datetime.date(4, month, day))
-                nleapdays = (year + 3) // 4 
-                ordinal = ordinal_4ad - 365 * (year + 3) - nleapdays
-            else:
-                ordinal_1ad = hdateutils.to_ordinal(datetime.date(1, month, day))
-                nleapdays = (year + 3) // 4 
-                ordinal = ordinal_1ad - 365 * year - nleapdays
-        else: # AD (CE)
-            pythondate = datetime.date(year, month, day)
-            ordinal = hdateutils.to_ordinal(pythondate)
-        return  {prefix:pythondate, 
+        "Convert year, month, day to (part of) a dates dictionary, see *_calc_dates()*"
+        ordinal = hdatecalendar.ymd_to_ordinal(year, month, day, isbce=isbce)
+        return  {prefix:not isbce and ordinal <= hdatecalendar.MAX_PYTHON_ORDINAL, 
                  f"ordinal_{prefix}":ordinal,
                  f"sl{prefix}":speclevel}
     # ------------------------------------------------------------------------------------------------------
-    def _convert_one_date(self, prefix=""):
-        'Convert a date drawing on self.d_parsed. Also returns indicator of y/m/d specification'
+    def _convert_one_date(self, prefix="", slmid="", context=None):
+        '''
+        Convert a date drawing on self.d_parsed. Also returns indicator of y/m/d specification
+
+        *slmid* is the specification level of the mid date, used when early or late dates are copied from it.
+        *context* is an HDateContext, see *_calc_dates()*
+        '''
+        if (ymd := self._one_date_ymd(prefix, slmid, context)) is None:
+            return {prefix:None, f"ordinal_{prefix}":None ,f"sl{prefix}":""} 
+        year, month, day, speclevel, isbce = ymd
+        return self._ymd_to_dfragment(year, month, day, prefix=prefix, speclevel=speclevel, isbce=isbce)
+
+    def _one_date_ymd(self, prefix, slmid, context):
+        "Return *(year, month, day, speclevel, isbce)* for a date, as used by *_convert_one_date()*, or None if there is none"
         assert prefix in {"early","mid","late"}
+        d_parsed = self.d_parsed
+        proleptic_gregorian = (context or hdatecontext.DEFAULT_CONTEXT).proleptic_gregorian
         default_month = 1 if prefix == "early" else 12 if prefix == "late" else 6
         def default_day(year, month):
             return 1 if prefix=="early" \
-                        else self.max_day_in_month(year, month) if prefix=="late" \
+                        else self.max_day_in_month(year, month, proleptic_gregorian=proleptic_gregorian) if prefix=="late" \
                         else 15
 
-        if self.d_parsed[f'{prefix}year'] is None:
-            if self.d_parsed["circa"] or (prefix == "mid") or \
-                        (self.d_parsed[f'midyear'] is None): # Cannot copy from mid year
-                return {prefix:None, f"ordinal_{prefix}":None ,f"sl{prefix}":""} 
+        if d_parsed[f'{prefix}year'] is None:
+            if d_parsed["circa"] or (prefix == "mid") or \
+                        (d_parsed[f'midyear'] is None): # Cannot copy from mid year
+                return None
             else:                # Copy from mid year
-                speclevel = self.pdates['slmid']
-                year = self.d_parsed[f'midyear']
-                month = self.d_parsed[f'midmon'] if speclevel in {"m","d"} else default_month
-                day = self.d_parsed[f'midday'] if speclevel == "d" else default_day(year, month)
-                isbce = self.d_parsed['midcalendar'] == 'bce'
-                return  self._ymd_to_dfragment(year, month, day, prefix=prefix, speclevel=speclevel, isbce=isbce)
+                speclevel = slmid
+                year = d_parsed[f'midyear']
+                month = d_parsed[f'midmon'] if speclevel in {"m","d"} else default_month
+                day = d_parsed[f'midday'] if speclevel == "d" else default_day(year, month)
+                isbce = d_parsed['midcalendar'] == 'bce'
+                return year, month, day, speclevel, isbce
         else:    # The date has been specified
             speclevel = "y"
-            isbce = self.d_parsed[f'{prefix}calendar'] == 'bce'
-            year = self.d_parsed[f'{prefix}year']
+            isbce = d_parsed[f'{prefix}calendar'] == 'bce'
+            year = d_parsed[f'{prefix}year']
 
-            if self.d_parsed[f'{prefix}mon']: speclevel = "m"
-            month = self.d_parsed[f'{prefix}mon'] if speclevel == "m" else default_month
+            if d_parsed[f'{prefix}mon']: speclevel = "m"
+            month = d_parsed[f'{prefix}mon'] if speclevel == "m" else default_month
             
-            if self.d_parsed[f'{prefix}day']: speclevel = "d"
-            day = self.d_parsed[f'{prefix}day'] if speclevel == "d" else default_day(year, month)
+            if d_parsed[f'{prefix}day']: speclevel = "d"
+            day = d_parsed[f'{prefix}day'] if speclevel == "d" else default_day(year, month)
+
+            if (d_parsed['circa']) and (prefix == "mid"): speclevel = 'c'
+            return year, month, day, speclevel, isbce
+
+    def _date_error(self, context=None):
+        """
+        Return *(reason, prefix)* if the dates cannot be calculated from d_parsed, or None, without raising an exception.
+        *reason* is one of *hdateparser.DAY_OUT_OF_RANGE*, *MONTH_OUT_OF_RANGE* or *YEAR_OUT_OF_RANGE*,
+        and *prefix* that of the first date (mid, late, early) for which it is found
+        """
+        return self._calc_dates_checked(context or hdatecontext.DEFAULT_CONTEXT)[1]
+    # ------------------------------------------------------------------------------------------------------
+    def _calc_dates(self, context=None):
+        """
+        Calculate early, mid and late ordinals and specification levels from d_parsed, in integer arithmetic,
+        using *context* (HDateContext, default *hdatecontext.DEFAULT_CONTEXT*)
+
+        Returns a dictionary with the keys of *pdates*, but with True or False in place of
+        each python date, according to whether there is one. There is no python date for BC dates, 
+        for dates after 9999 AD, or for early/mid dates filled in from a later date that would be before 1 AD
+        """
+        context = context or hdatecontext.DEFAULT_CONTEXT
+        return self._fill_in_dates(self._convert_dates(context), context)
+
+    def _calc_dates_recorded(self, stats, context):
+        """
+        As *_calc_dates()*, but returning None if the dates cannot be calculated, 
+        and adding the times of its phases and the outcome to *stats* (hdatestats.ParseStats)
+        """
+        if self._d_parsed is None:     # blank
+            return None
+        clock = time.perf_counter_ns
+        start = clock()
+        try:
+            dates = self._convert_dates(context)
+            converted = clock()
+            dates = self._fill_in_dates(dates, context)
+        except Exception as e:
+            stats.add_time("failed", clock() - start)
+            stats.add_failure(error[0] if (error := self._date_error(context)) is not None else f"dates:{type(e).__name__}")
+            stats.no_pdates += 1
+            return None
+        stats.add_time("convert_dates", converted - start)
+        stats.add_time("fill_in", clock() - converted)
+        stats.add_speclevels(dates)
+        return dates
+
+    def _calc_dates_checked(self, context):
+        "As *_calc_dates()*, but returning *(dates, None)*, or *(None, (reason, prefix))* (see *_date_error()*) rather than raising"
+        if self.d_parsed['ongoing']:
+            return self._convert_dates(context), None
+        dates = {}
+        slmid = ""
+        for prefix in ("mid", "late", "early"):
+            if (ymd := self._one_date_ymd(prefix, slmid, context)) is None:
+                dates.update({prefix:None, f"ordinal_{prefix}":None ,f"sl{prefix}":""})
+                continue
+            year, month, day, speclevel, isbce = ymd
+            if (part := hdatecalendar.ymd_error(year, month, day, isbce)) is not None:
+                return None, (_DATE_ERRORS[part], prefix)
+            if prefix == "mid":
+                slmid = speclevel
+            dates.update(self._ymd_to_dfragment(year, month, day, prefix=prefix, speclevel=speclevel, isbce=isbce))
+        return self._fill_in_dates(dates, context), None
+
+    def _convert_dates(self, context):
+        "The dates dictionary (see *_calc_dates()*) for 'ongoing', or of the early, mid and late dates as specified"
+        if self.d_parsed['ongoing']:
+            ordinal_today = context.ordinal_today()
+            ordinal_late = ordinal_today + context.circa_days
+            return {'mid': True, 'ordinal_mid': ordinal_today, 
+                    'slmid': 'o', 'slearly': 'o', 'sllate': 'o',
+                    'late': ordinal_late <= hdatecalendar.MAX_PYTHON_ORDINAL,
+                    'ordinal_late': ordinal_late,
+                    'early': True, 'ordinal_early': ordinal_today}
+        dates = self._convert_one_date("mid", context=context) 
+        dates.update(self._convert_one_date("late", dates['slmid'], context))
+        dates.update(self._convert_one_date("early", dates['slmid'], context))
+        return dates
+
+    def _fill_in_dates(self, dates, context):
+        "Fill in the missing dates of a dates dictionary from *_convert_dates()*, from circa and the other dates, and return it"
+        max_ordinal = hdatecalendar.MAX_PYTHON_ORDINAL
+        if not self.d_parsed['ongoing']:
+            # -- Fill early and late dates if missing from (a) circa (b) main date
+            circa_days = self._calc_clen_days(context)
+            if dates['slmid'] and not dates['slearly']:
+                dates.update({'early':bool(dates['mid']) and dates['ordinal_mid'] > circa_days,
+                              'ordinal_early':dates['ordinal_mid'] - circa_days,
+                              'slearly':'c'})
+                
+            if dates['slmid'] and not dates['sllate']:
+                dates.update({'late':bool(dates['mid']) and dates['ordinal_mid'] + circa_days <= max_ordinal,
+                              'ordinal_late':dates['ordinal_mid'] + circa_days,
+                              'sllate':'c'})
+                    
+            # -- Fill in midpoint date if it is missing and both early and late dates are present
+            if dates['slearly'] and dates['sllate'] and not dates['slmid']:
+                dates.update({'mid':bool(dates['early'] and dates['late']),
+                              'ordinal_mid':(dates['ordinal_early'] + dates['ordinal_late'])//2,
+                              'slmid':'c'})
 
-            if (self.d_parsed['circa']) and (prefix == "mid"): speclevel = 'c'
-            return self._ymd_to_dfragment(year, month, day, prefix=prefix, speclevel=speclevel, isbce=isbce)
+            # -- Fill in mid and late dates from circa if early is the only date specified
+            if dates['slearly'] and not dates['sllate'] and not dates['slmid']:
+                dates.update({'mid':bool(dates['early']) and dates['ordinal_early'] + circa_days <= max_ordinal,
+                              'ordinal_mid':dates['ordinal_early'] + circa_days,
+                              'slmid':'c',
+                              'late':bool(dates['early']) and dates['ordinal_early'] + 2 * circa_days <= max_ordinal,
+                              'ordinal_late':dates['ordinal_early'] + 2*circa_days,
+                              'sllate':'c'})
+
+            # -- Fill in mid and early dates from circa if late is the only date specified
+            if not dates['slearly'] and dates['sllate'] and not dates['slmid']:
+                has_dates = bool(dates['late']) and dates['ordinal_late'] > 2 * circa_days
+                dates.update({'mid':has_dates,
+                              'ordinal_mid':dates['ordinal_late'] - circa_days,
+                              'slmid':'c',
+                              'early':has_dates,
+                              'ordinal_early':dates['ordinal_late'] - 2 * circa_days,
+                              'slearly':'c'})
+
+        # >> to do: deal with dates out of range, 29th feb 1100 etc.
+        return dates
     # ------------------------------------------------------------------------------------------------------
-    def _convert_to_python_date_naive(self):
+    def _convert_to_python_date_naive(self, context=None):
         """
         date.MINYEAR == 1, so this can only be used for ce (AD) dates
         
@@ -319,67 +578,78 @@ class HDate():
         If a date like 29 Feb 300, which existed in Julian calendars but does not
         exist in the proleptic Gregorian calendar, turns up then it is converted to
         28th Feb in the same year
+
+        *context* is an HDateContext, see *_calc_dates()*
         """            
+        self.pdates = self._calc_dates(context)
+        for prefix in _PREFIXES:
+            self.pdates[prefix] = datetime.date.fromordinal(self.pdates[f"ordinal_{prefix}"]) \
+                                        if self.pdates[prefix] else None
 
-        if self.d_parsed['ongoing']:
-            self.pdates = {'mid': datetime.date.today(), 
-                           'ordinal_mid': hdateutils.to_ordinal(datetime.date.today()), 
-                           'slmid': 'o', 'slearly': 'o', 'sllate': 'o'}
-            self.pdates.update(
-                {'late': self.pdates['mid'] + datetime.timedelta(days=self.circa_interval_days),
-                 'ordinal_late': self.pdates['ordinal_mid'] + self.circa_interval_days, 
-                 'early': self.pdates['mid'],
-                 'ordinal_early': self.pdates['ordinal_mid']
-                 })
-        else:     # Normal treatment, not ongoing
-            # -- convert the three dates
-            self.pdates = self._convert_one_date("mid") 
-            self.pdates.update(self._convert_one_date("late"))
-            self.pdates.update(self._convert_one_date("early"))
+# ------------------------------------------------------------------------------------------------------
+def resolve_all(hdates, context=None):
+    """
+    Calculate the dates of each of an iterable of HDates again, using *context*, as *HDate.resolve()*
 
-            # -- Fill early and late dates if missing from (a) circa (b) main date
-            circa_interval = self._calc_clen_interval()
-            if self.pdates['slmid'] and not self.pdates['slearly']:
-                if self.pdates['mid'] and self.pdates['mid'].toordinal() > circa_interval.days:
-                    self.pdates.update({'early':self.pdates['mid'] - circa_interval})
-                self.pdates.update({'ordinal_early':self.pdates['ordinal_mid'] - circa_interval.days,
-                                    'slearly':'c'})
-                
-            if self.pdates['slmid'] and not self.pdates['sllate']:
-                if self.pdates['mid']:
-                    self.pdates.update({'late':self.pdates['mid'] + circa_interval})
-                self.pdates.update({'ordinal_late':self.pdates['ordinal_mid'] + circa_interval.days,
-                                    'sllate':'c'})
-                    
-            # -- Fill in midpoint date if it is missing and both early and late dates are present
-            if self.pdates['slearly'] and self.pdates['sllate'] and not self.pdates['slmid']:
-                if self.pdates['early'] and self.pdates['late']:
-                    self.pdates.update({'mid':self.pdates['early'] + 
-                                            (self.pdates['late'] - self.pdates['early'])/2.0})
-                self.pdates.update({'ordinal_mid':(self.pdates['ordinal_early'] + self.pdates['ordinal_late'])//2,
-                                    'slmid':'c'})
+    No string is parsed again, except for HDates which have been unpickled, for which each distinct
+    string is parsed once, however many HDates have it
+    """
+    parsed = {}
+    for hd in hdates:
+        if hd._d_parsed is None and hd._parsed is None:
+            key = (hd.input, hd.parser, hd._levels & _MISSINGASONGOING)
+            if key not in parsed:
+                parsed[key] = _compact(hd.parser.parse(hd.input, missingasongoing=bool(key[2]))[1])
+            hd._parsed = parsed[key]
+        hd.resolve(context)
+
+def _from_parsed(hdstr, parser, re_parsed, d_parsed, missingasongoing, context):
+    """
+    Make an HDate from the results of *parser.try_parse()*, without parsing again or raising an exception
 
-            # -- Fill in mid and late dates from circa if early is the only date specified
-            if self.pdates['slearly'] and not self.pdates['sllate'] and not self.pdates['slmid']:
-                if self.pdates['early']:
-                    self.pdates.update({'mid':self.pdates['early'] + circa_interval,
-                                        'late':self.pdates['early'] + 2 * circa_interval
-                                        })
-                self.pdates.update({'ordinal_mid':self.pdates['ordinal_early'] + circa_interval.days,
-                                    'slmid':'c',
-                                    'ordinal_late':self.pdates['ordinal_early'] + 2*circa_interval.days,
-                                    'sllate':'c'})
+    Returns *(hd, error)*: the HDate and None, or if its dates cannot be calculated, None and 
+    *(reason, prefix)*, see *HDate._date_error()*. *context* is an HDateContext, or None
+    """
+    hd = HDate.__new__(HDate)
+    hd.parser = parser
+    hd.input = hdstr
+    hd._re_parsed = hd._pdates = None
+    hd._d_parsed = d_parsed
+    hd._parsed = _compact(d_parsed)
+    dates = None
+    if d_parsed is not None:
+        dates, error = hd._calc_dates_checked(hd._context(context))
+        if error is not None:
+            return None, error
+    hd._ordinal_early, hd._ordinal_mid, hd._ordinal_late, hd._levels = \
+        HDate._pack(dates, missingasongoing, bool(d_parsed and d_parsed["circa"]))
+    hd._d_parsed = None
+    return hd, None
 
-            # -- Fill in mid and early dates from circa if late is the only date specified
-            if not self.pdates['slearly'] and self.pdates['sllate'] and not self.pdates['slmid']:
-                if self.pdates['late'] and self.pdates['late'].toordinal() > 2 * circa_interval.days:
-                    self.pdates.update({'mid':self.pdates['late'] - circa_interval,
-                                        'early':self.pdates['late'] - 2 * circa_interval
-                                        })
-                self.pdates.update({'ordinal_mid':self.pdates['ordinal_late'] - circa_interval.days,
-                                'slmid':'c',
-                                'ordinal_early':self.pdates['ordinal_late'] - 2 * circa_interval.days,
-                                'slearly':'c'})
+# ------------------------------------------------------------------------------------------------------
+def _unpickle(hdstr, dateformat, engine, ordinal_early, ordinal_mid, ordinal_late, levels, pdates=None, parser=None):
+    "Rebuild an HDate pickled by HDate.__reduce__()"
+    hd = HDate.__new__(HDate)
+    hd.parser = parser if parser is not None else hdateparser.get_parser(dateformat, engine)
+    hd.input = hdstr
+    hd._ordinal_early, hd._ordinal_mid, hd._ordinal_late, hd._levels = ordinal_early, ordinal_mid, ordinal_late, levels
+    hd._parsed = hd._re_parsed = hd._d_parsed = None
+    hd._pdates = pdates
+    return hd
 
-        # >> to do: deal with dates out of range, 29th feb 1100 etc.
-        ...
+# ------------------------------------------------------------------------------------------------------
+def _compact(d_parsed):
+    "The tuple of the values of *d_parsed*, or () if it is None, shared with any other HDate with the same values"
+    if d_parsed is None:
+        return ()
+    values = _D_PARSED_VALUES(d_parsed)
+    if (interned := _interned.get(values)) is not None:
+        return interned
+    if len(_interned) >= _INTERN_LIMIT:
+        _interned.clear()
+    _interned[values] = values
+    return values
+
+def _expand(parsed):
+    "The *d_parsed* dictionary from a tuple made by *_compact()*"
+    return dict(zip(hdateparser.D_PARSED_KEYS, parsed)) if parsed else None
@@ -0,0 +1,224 @@
+"""
+Columnar (NumPy) versions of HDate operations, for working with many dates at once
+
+Requires numpy, which is otherwise not needed by this package::
+
+    pip install historicaldate[numpy]
+"""
+import concurrent.futures
+import itertools
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from historicaldate import hdate
+from historicaldate import hdatecontext
+from historicaldate import hdateformat
+from historicaldate import hdateparser
+from historicaldate import hdateutils
+
+# -- Specification levels (as in *pdates*) and the codes used for them in arrays.
+#    0 means not set, which only occurs in rows which are not valid
+SPECLEVELS = hdate.SPECLEVELS
+SPECLEVEL_CODES = hdate.SPECLEVEL_CODES
+
+HDateColumns = namedtuple("HDateColumns",
+                          "ordinal_early ordinal_mid ordinal_late slearly slmid sllate valid")
+HDateColumns.__doc__ = """
+Parsed dates as columns. *ordinal_early*, *ordinal_mid* and *ordinal_late* are int64 arrays,
+*slearly*, *slmid* and *sllate* are uint8 arrays of codes (see *SPECLEVELS*),
+and *valid* is a boolean array which is False for rows that could not be parsed.
+Invalid rows have ordinals and codes of 0
+"""
+
+# ------------------------------------------------------------------------------------------------------
+def parse_many(strings, dateformat=None, missingasongoing=False, parser=None, errors=None):
+    """
+    Parse an iterable of HDate format strings, returning an *HDateColumns* of arrays
+
+    Each distinct string is parsed only once. Strings that are not in HDate format, or which
+    do not convert to dates (e.g. '31 Feb 1066'), give rows with *valid* False rather than
+    raising an exception.
+
+    *dateformat* and *missingasongoing* are as in the HDate() constructor,
+    *parser* (HDateParser, optional) is used in place of the shared parser for *dateformat*
+
+    *errors* (list, optional): if given, a tuple *(row, message)* is appended for each row that is not valid
+    """
+    if parser is None:
+        parser = hdateparser.get_parser(dateformat)
+    ordinals, codes, valid, row_errors = _parse_rows(strings, parser, missingasongoing)
+    if errors is not None:
+        errors.extend(row_errors)
+    return HDateColumns(*ordinals, *codes, valid)
+
+def parse_many_parallel(strings, dateformat=None, missingasongoing=False, errors=None,
+                        workers=None, chunksize=100000):
+    """
+    As *parse_many()*, but split into chunks of *chunksize* strings which are parsed 
+    in a pool of *workers* processes (default: the number of CPUs)
+
+    Results are in the same order as *strings*, and *errors* rows are numbered from the start of *strings*. 
+    Workers send back arrays rather than HDate objects, so it is mainly the strings that are copied between processes.
+    With *workers=1* the chunks are parsed in this process.
+
+    The calling module must be importable by the worker processes, so scripts which call this
+    should do so under *if __name__ == "__main__":*
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1 or chunksize < 1:
+        raise ValueError(f"workers and chunksize must be at least 1: not {workers}, {chunksize}")
+    it = iter(strings)
+    chunks = iter(lambda: list(itertools.islice(it, chunksize)), [])
+    args = ((chunk, dateformat, missingasongoing) for chunk in chunks)
+    if workers == 1:
+        results = list(map(_parse_chunk, args))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_parse_chunk, args))
+
+    if not results:
+        results = [_parse_chunk(([], dateformat, missingasongoing))]
+    if errors is not None:
+        start = 0
+        for ordinals, codes, valid, row_errors in results:
+            errors.extend((start + row, message) for row, message in row_errors)
+            start += len(valid)
+    ordinals = np.concatenate([result[0] for result in results], axis=1)
+    codes = np.concatenate([result[1] for result in results], axis=1)
+    valid = np.concatenate([result[2] for result in results])
+    return HDateColumns(*ordinals, *codes, valid)
+
+def format_many(columns, style="dmy", context=None):
+    """
+    Write the rows of an *HDateColumns* (see *parse_many()*) as a list of HDate format strings,
+    the same as *hdateformat.format_pdates()* gives for each row. Rows which are not valid give '',
+    including those for strings such as 'circa', which have no ordinals
+
+    The dates are converted to year, month and day as arrays, so only the strings are made one row at a time.
+    *style* and *context* are as in *hdateformat.format_pdates()*
+    """
+    hdateformat._check_style(style)
+    circa_days = (context or hdatecontext.DEFAULT_CONTEXT).circa_days
+    ordinals = (columns.ordinal_early, columns.ordinal_mid, columns.ordinal_late)
+    speclevels = np.array(SPECLEVELS, dtype=object)
+    levels = zip(*(speclevels[codes].tolist() for codes in (columns.slearly, columns.slmid, columns.sllate)))
+    ymds = zip(*(zip(*(part.tolist() for part in to_ymd(o))) for o in ordinals))
+    format_row = hdateformat._format
+    return [format_row(row_ordinals, row_levels, row_ymds, style, circa_days) if valid else ""
+            for row_ordinals, row_levels, row_ymds, valid
+            in zip(zip(*(o.tolist() for o in ordinals)), levels, ymds, columns.valid.tolist())]
+
+# ------------------------------------------------------------------------------------------------------
+def _parse_chunk(args):
+    "Parse one chunk in a worker process, returning arrays and a list of errors (picklable)"
+    strings, dateformat, missingasongoing = args
+    return _parse_rows(strings, hdateparser.get_parser(dateformat), missingasongoing)
+
+def _parse_rows(strings, parser, missingasongoing):
+    """
+    Parse *strings*, returning a (3,n) array of ordinals, a (3,n) array of spec level codes,
+    the validity mask and a list of *(row, message)* for rows that are not valid
+    """
+    distinct = {}
+    inverse = np.fromiter((distinct.setdefault(s, len(distinct)) for s in strings), dtype=np.int64)
+
+    ordinals = np.zeros((3, len(distinct)), dtype=np.int64)
+    codes = np.zeros((3, len(distinct)), dtype=np.uint8)
+    valid = np.zeros(len(distinct), dtype=bool)
+    messages = [None] * len(distinct)
+    for s, i in distinct.items():
+        try:
+            pdates = hdate.HDate(s, missingasongoing=missingasongoing, parser=parser).pdates
+        except ValueError as e:
+            messages[i] = str(e)
+            continue
+        if pdates is None or None in (pdates["ordinal_early"], pdates["ordinal_mid"], pdates["ordinal_late"]):
+            messages[i] = f"No date could be calculated: {s}"
+            continue
+        ordinals[:, i] = (pdates["ordinal_early"], pdates["ordinal_mid"], pdates["ordinal_late"])
+        codes[:, i] = (SPECLEVEL_CODES[pdates["slearly"]], SPECLEVEL_CODES[pdates["slmid"]],
+                       SPECLEVEL_CODES[pdates["sllate"]])
+        valid[i] = True
+
+    valid = valid[inverse]
+    row_errors = [(int(row), messages[inverse[row]]) for row in np.flatnonzero(~valid)]
+    return ordinals[:, inverse], codes[:, inverse], valid, row_errors
+
+# ------------------------------------------------------------------------------------------------------
+_DAYS_BEFORE_MONTH = np.array([0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334], dtype=np.int64)
+
+def to_ymd(ordinals):
+    """
+    Convert an array of (int) ordinals to year, month and day arrays, returned as an *hdateutils.YMD* named tuple
+
+    As *hdateutils.to_ymd()* for each element: ordinals of 0 and below are BC dates, with
+    negative years and no year zero, so 0 is 31st December, year -1 (1BC)
+    """
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+
+    # -- AD: proleptic Gregorian, counting 400, 100, 4 and 1 year cycles from 1st January 1AD
+    n400, n = np.divmod(ordinals - 1, 146097)
+    n100, n = np.divmod(n, 36524)
+    n4, n = np.divmod(n, 1461)
+    n1_ad, n_ad = np.divmod(n, 365)
+    year_ad = n400 * 400 + n100 * 100 + n4 * 4 + n1_ad + 1
+    last_ad = (n1_ad == 4) | (n100 == 4)        # last day of a leap year
+    leap_ad = (n1_ad == 3) & ((n4 != 24) | (n100 == 3))
+
+    # -- BC: Julian, counting 4-year cycles from 1st January 4BC (ordinal -1460)
+    cycles, n = np.divmod(ordinals + 4 * 365, 1461)
+    n1_bc, n_bc = np.divmod(n, 365)
+    year_bc = 4 * cycles - 4 + n1_bc
+    last_bc = n1_bc == 4                        # 31st December of 1BC, 5BC, ...
+
+    isad = ordinals >= 1
+    year = np.where(isad, year_ad, year_bc)
+    last = np.where(isad, last_ad, last_bc)
+    isleap = np.where(isad, leap_ad, n1_bc == 3) | last
+    n = np.where(last, 365, np.where(isad, n_ad, n_bc))
+    year -= last
+
+    # -- Month and day from the 0-based day of year n
+    month = (n + 50) >> 5
+    preceding = _DAYS_BEFORE_MONTH[month - 1] + (isleap & (month > 2))
+    month -= preceding > n
+    preceding = _DAYS_BEFORE_MONTH[month - 1] + (isleap & (month > 2))
+    return hdateutils.YMD(year, month, n - preceding + 1)
+
+def to_years(ordinals):
+    """
+    Convert an array of (int) ordinals to a float64 array of years, as *hdateutils.to_years()* for each element
+
+    0.0 is the end of ordinal day 0, i.e. 31st December 1BC, and each year, AD or BC, is divided into its own number of days
+    """
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    year = to_ymd(ordinals).year
+    yearindex = np.where(year > 0, year - 1, year)
+    start, daysinyear = _year_start_and_length(yearindex)
+    return yearindex + (ordinals - start + 1) / daysinyear
+
+def years_to_ordinal(years):
+    """
+    Convert an array of (float) years to an int64 array of ordinals, rounded to the nearest day,
+    as *hdateutils.years_to_ordinal()* for each element. This is the inverse of *to_years()*
+    """
+    years = np.asarray(years, dtype=np.float64)
+    yearindex = np.floor(years).astype(np.int64)
+    start, daysinyear = _year_start_and_length(yearindex)
+    return start - 1 + np.rint((years - yearindex) * daysinyear).astype(np.int64)
+
+def _year_start_and_length(yearindex):
+    """
+    Ordinals of 1st January and numbers of days in years given as int arrays of *yearindex*, 
+    which is year - 1 for AD years and year (negative) for BC years, so there is no gap at 1AD
+    """
+    start = _year_start(yearindex)
+    return start, _year_start(yearindex + 1) - start
+
+def _year_start(yearindex):
+    "Ordinals of 1st January, for int arrays of *yearindex* as in *_year_start_and_length()*"
+    y = yearindex
+    return np.where(y >= 0, y * 365 + y // 4 - y // 100 + y // 400, 365 * y - (3 - y) // 4) + 1
@@ -0,0 +1,95 @@
+"""
+Optional cache of parse results, shared by all *HDate* objects
+
+Caching is off by default. Once it is switched on with *enable_cache()*, each *HDate(...)*
+(and so each *hdateutils* function given a string) first looks up the string, with its
+*dateformat*, *missingasongoing* and context (see *hdatecontext*), in a least-recently-used cache.
+
+Entries hold the parse result as tuples, from which each *HDate* object builds its own
+dictionaries, so changing one object's *pdates* cannot affect another. 'ongoing' dates
+depend on *datetime.date.today()*, so their *pdates* are recalculated every time, 
+unless the context has a fixed *today*.
+"""
+import threading
+from collections import OrderedDict
+from collections import namedtuple
+
+# -- The parse result for one string. *re_parsed* is stored as a tuple of (key, value) pairs, *d_parsed* as
+#    the tuple of its values held by HDate (see *hdateparser.D_PARSED_KEYS*), or () for a blank string,
+#    and *pdates* in the packed form held by HDate, (ordinal_early, ordinal_mid, ordinal_late, levels).
+#    *error* is the ValueError message if the string is not in HDate format
+ParseResult = namedtuple("ParseResult", "re_parsed d_parsed pdates error")
+
+# ------------------------------------------------------------------------------------------------------
+class ParseCache():
+    """
+    Least-recently-used cache of *ParseResult* entries, holding at most *maxsize* entries
+
+    Safe to share between threads
+    """
+    def __init__(self, maxsize=10000):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1: not {maxsize}")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.clear()
+    # ------------------------------------------------------------------------------------------------------
+    def get(self, key):
+        "Return the entry for *key*, or None"
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        "Add or replace the entry for *key*, evicting the least recently used entry if the cache is full"
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    # ------------------------------------------------------------------------------------------------------
+    def info(self):
+        "Return a dictionary of hits, misses, evictions, current size and maxsize"
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "size": len(self._entries), "maxsize": self.maxsize}
+
+    def clear(self):
+        "Remove all entries and set the counts to zero"
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+# ------------------------------------------------------------------------------------------------------
+active_cache = None    # The cache used by HDate, or None if caching is switched off
+
+def enable_cache(maxsize=10000):
+    """
+    Switch on caching of parse results, keeping at most *maxsize* entries
+
+    Any existing cache is replaced by an empty one
+    """
+    global active_cache
+    active_cache = ParseCache(maxsize)
+    return active_cache
+
+def disable_cache():
+    "Switch off caching of parse results, discarding the cache"
+    global active_cache
+    active_cache = None
+
+def cache_info():
+    "Return hits, misses, evictions, size and maxsize of the cache as a dictionary, or None if caching is off"
+    return active_cache.info() if active_cache is not None else None
+
+def clear_cache():
+    "Remove all entries from the cache and set its counts to zero"
+    if active_cache is not None:
+        active_cache.clear()
@@ -0,0 +1,142 @@
+"""
+Integer calendar arithmetic, used in place of *datetime.date* for conversions between
+year, month, day and ordinals
+
+Ordinals are as in *datetime.date.toordinal()*, so ordinal 1 is 1st January 1AD, and
+ordinal 0 is 31st December 1BC.
+
+* AD (CE) dates use the proleptic Gregorian calendar, as Python dates do, but for any year from 1 upwards, not just to 9999
+* BC (BCE) dates use a proleptic Julian calendar, in which 1BC, 5BC etc. are leap years
+
+No *datetime* objects are created, and none of these functions depend on the size of the year.
+"""
+MAX_PYTHON_ORDINAL = 3652059    # 31st December 9999, datetime.date.max.toordinal()
+
+_MLENGTHS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_DAYS_BEFORE_MONTH = (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+
+_DAYS_IN_4_YEARS = 4 * 365 + 1
+_DAYS_IN_100_YEARS = 25 * _DAYS_IN_4_YEARS - 1
+_DAYS_IN_400_YEARS = 4 * _DAYS_IN_100_YEARS + 1
+
+# ------------------------------------------------------------------------------------------------------
+def days_in_month(year, month, proleptic_gregorian=False, calendar='ce'):
+    '''
+    Calculate the maximum day number in a month
+
+    *month* is an int, in range 1-12
+
+    If *proleptic_gregorian* is False: Assumes a Julian calendar to 1752, Gregorian after that
+
+    * days_in_month(1700, 2) == 29
+    * days_in_month(1800, 2) == 28
+
+    If *proleptic_gregorian* is True, assumes a Gregorian calendar throughout
+
+    So days_in_month(1700, 2) == 28
+
+    A supposed proleptic Julian calendar is used before 8AD, when leap years
+    every four years became standardised, so the years 4AD, 1BC, 5BC etc. are
+    treated as leap years
+    '''
+    mlength = _MLENGTHS[month-1]
+
+    if month != 2:
+        pass    # no further adjustment needed
+    elif calendar.lower() in {'ce','ad'}:
+        grg_nonleap = (year % 100 == 0) and (year % 400 != 0)
+        isleapyear = (year % 4 == 0) and not (grg_nonleap and (year > 1752 or proleptic_gregorian))
+        mlength = 29 if isleapyear else 28
+    elif calendar.lower() in {'bce','bc'}:  # assume proleptic julian calendar. 1BC, 5BC etc are leap years
+        isleapyear = (year % 4 == 1)
+        mlength = 29 if isleapyear else 28
+    else:
+        raise ValueError(f"Calendar must me one of 'ce','ad','bce','bc'")
+
+    return mlength
+
+def is_leap_year(year, isbce=False):
+    "True if *year* is a leap year: proleptic Gregorian for AD years, or 1BC, 5BC etc. if *isbce*"
+    if isbce:
+        return year % 4 == 1
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+# ------------------------------------------------------------------------------------------------------
+def ymd_to_ordinal(year, month, day, isbce=False):
+    """
+    Return the ordinal of a date, for an AD year (>= 1), or a BC year if *isbce* is True
+
+    Raises ValueError if the year, month or day is out of range, e.g. 29th February 1700
+    (1700 is not a leap year in the proleptic Gregorian calendar)
+    """
+    isleap = year % 4 == 1 if isbce else year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+    if not 1 <= month <= 12:
+        raise ValueError(f"month must be in 1..12: not {month}")
+    if not 1 <= day <= _MLENGTHS[month-1] + (isleap and month == 2):
+        raise ValueError(f"day is out of range for month: {day}")
+    day_of_year = _DAYS_BEFORE_MONTH[month-1] + day + (isleap and month > 2)
+
+    if isbce:
+        return day_of_year - 365 * year - (year + 3) // 4
+    if year < 1:
+        raise ValueError(f"year must be at least 1: not {year}")
+    y = year - 1
+    return y * 365 + y // 4 - y // 100 + y // 400 + day_of_year
+
+def ymd_error(year, month, day, isbce=False):
+    """
+    Return which of *'month'*, *'day'* or *'year'* is out of range, in that order, if *ymd_to_ordinal()* 
+    would raise ValueError for the date, or None if it would not. Raises no exceptions
+    """
+    isleap = year % 4 == 1 if isbce else year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+    if not 1 <= month <= 12:
+        return "month"
+    if not 1 <= day <= _MLENGTHS[month-1] + (isleap and month == 2):
+        return "day"
+    if not isbce and year < 1:
+        return "year"
+    return None
+
+def first_ordinal_of_year(year):
+    """
+    Return the ordinal of 1st January of *year*, where negative years are BC with no year zero,
+    as returned by *ordinal_to_ymd()*. So first_ordinal_of_year(1) == 1 and first_ordinal_of_year(-1) == -365
+    """
+    if year >= 1:
+        y = year - 1
+        return y * 365 + y // 4 - y // 100 + y // 400 + 1
+    if year == 0:
+        raise ValueError("There is no year zero")
+    return 1 + 365 * year - (3 - year) // 4
+
+def ordinal_to_ymd(ordinal):
+    """
+    Return the tuple (year, month, day) for an ordinal
+
+    For ordinals of 0 and below the year is negative, with no year zero, so that -1 is 1BC,
+    as in *hdateutils.to_ymd()*
+    """
+    if ordinal >= 1:
+        n400, n = divmod(ordinal - 1, _DAYS_IN_400_YEARS)
+        n100, n = divmod(n, _DAYS_IN_100_YEARS)
+        n4, n = divmod(n, _DAYS_IN_4_YEARS)
+        n1, n = divmod(n, 365)
+        year = n400 * 400 + n100 * 100 + n4 * 4 + n1 + 1
+        if n1 == 4 or n100 == 4:    # last day of a leap year
+            return year - 1, 12, 31
+        return (year,) + _month_day(n, n1 == 3 and (n4 != 24 or n100 == 3))
+    else:
+        # -- Count 4-year Julian cycles from 1st January 4BC (ordinal -1460). 1BC, 5BC ... end each cycle
+        cycles, n = divmod(ordinal + 4 * 365, _DAYS_IN_4_YEARS)
+        n1, n = divmod(n, 365)
+        if n1 == 4:                 # 31st December of 1BC, 5BC, ...
+            return 4 * cycles - 1, 12, 31
+        return (4 * cycles - 4 + n1,) + _month_day(n, n1 == 3)
+
+def _month_day(n, isleap):
+    "Month and day for the 0-based day number *n* of a year"
+    month = (n + 50) >> 5
+    preceding = _DAYS_BEFORE_MONTH[month-1] + (isleap and month > 2)
+    if preceding > n:
+        month -= 1
+        preceding -= _MLENGTHS[month-1] + (isleap and month == 2)
+    return month, n - preceding + 1
@@ -0,0 +1,108 @@
+"""
+Parsing without exceptions, for input in which many strings are not valid dates
+
+*check()* and *check_many()* never raise ValueError. A string which does not give dates has an error
+reason, one of *ERRORS*, and the index in the string of the part found to be wrong, where that is known.
+No exception is raised or caught along the way, so bad strings cost no more than good ones.
+
+* *'no_match'*: not in HDate format. The position is that of the first character or word which
+  cannot occur in an HDate string, or None if the parts are just in the wrong order
+* *'prepost_month'*: a month both before and after the year, e.g. *Dec 1066-12*
+* *'bc_early_without_calendar'*: a BC early date, with no main calendar, e.g. *between 50 BC and 10*
+* *'day_out_of_range'*: e.g. *31 Feb 1066*
+* *'month_out_of_range'*: not possible for strings matched by the grammar
+* *'year_out_of_range'*: e.g. the year 0 AD
+
+Blank strings are valid, giving an HDate with *pdates* None (or 'ongoing' if *missingasongoing* is True),
+as in the HDate() constructor. The parse cache (see *hdatecache*) and *hdatestats* are not used
+"""
+import copy
+from collections import namedtuple
+
+from historicaldate import hdate
+from historicaldate import hdateparser
+
+# -- Error reasons, and the codes used for them by check_many(). 0 means no error
+ERRORS = ("", hdateparser.NO_MATCH, hdateparser.PREPOST_MONTH, hdateparser.BC_EARLY_WITHOUT_CALENDAR,
+          hdateparser.DAY_OUT_OF_RANGE, hdateparser.MONTH_OUT_OF_RANGE, hdateparser.YEAR_OUT_OF_RANGE)
+ERROR_CODES = {error: code for code, error in enumerate(ERRORS)}
+
+CheckResult = namedtuple("CheckResult", "hdate error position")
+CheckResult.__doc__ = """
+The result of *check()*: *hdate* is the HDate, or None if there is an error, *error* the reason (see *ERRORS*),
+or '' if there is none, and *position* the index in the string of the part found to be wrong, or None
+"""
+
+CheckResults = namedtuple("CheckResults", "hdates codes positions")
+CheckResults.__doc__ = """
+The result of *check_many()*: lists of the HDate (or None), error code (see *ERROR_CODES*) and position
+(or None) for each string
+"""
+
+# -- Groups of the grammar to look for, in order, to find the position of each error
+_ERROR_GROUPS = {hdateparser.PREPOST_MONTH: ("postmon",),
+                 hdateparser.BC_EARLY_WITHOUT_CALENDAR: ("calendar",),
+                 hdateparser.DAY_OUT_OF_RANGE: ("preday", "postday", "premon", "postmon", "year"),
+                 hdateparser.MONTH_OUT_OF_RANGE: ("premon", "postmon", "year"),
+                 hdateparser.YEAR_OUT_OF_RANGE: ("year",)}
+
+# ------------------------------------------------------------------------------------------------------
+def check(hdstr, dateformat=None, missingasongoing=False, parser=None, context=None):
+    """
+    Parse the HDate format string *hdstr*, returning a *CheckResult* rather than raising ValueError
+
+    *dateformat*, *missingasongoing*, *parser* and *context* are as in the HDate() constructor
+    """
+    if parser is None:
+        parser = hdateparser.get_parser(dateformat)
+    hd, error = _check(hdstr, parser, missingasongoing, context)
+    if error is None:
+        return CheckResult(hd, "", None)
+    return CheckResult(None, error[0], _position(hdstr, parser, *error))
+
+def check_many(strings, dateformat=None, missingasongoing=False, parser=None, context=None):
+    """
+    Parse an iterable of HDate format strings, returning a *CheckResults* of lists with an entry for each string
+
+    Each distinct string is parsed once, and repeats are copies, which are made without parsing again.
+    Arguments are as in *check()*
+    """
+    if parser is None:
+        parser = hdateparser.get_parser(dateformat)
+    distinct = {}
+    hdates, codes, positions = [], [], []
+    for hdstr in strings:
+        if (result := distinct.get(hdstr)) is None:
+            hd, error = _check(hdstr, parser, missingasongoing, context)
+            if error is None:
+                result = distinct[hdstr] = (hd, 0, None)
+            else:
+                result = distinct[hdstr] = (None, ERROR_CODES[error[0]], _position(hdstr, parser, *error))
+        else:
+            result = (copy.copy(result[0]),) + result[1:] if result[0] is not None else result
+        hdates.append(result[0])
+        codes.append(result[1])
+        positions.append(result[2])
+    return CheckResults(hdates, codes, positions)
+
+# ------------------------------------------------------------------------------------------------------
+def _check(hdstr, parser, missingasongoing, context):
+    "Return *(hd, None)*, or *(None, (reason, prefix))* if *hdstr* does not give dates"
+    re_parsed, d_parsed, error = parser.try_parse(hdstr, missingasongoing=missingasongoing)
+    if error is not None:
+        return None, error
+    return hdate._from_parsed(hdstr, parser, re_parsed, d_parsed, missingasongoing, context)
+
+def _position(hdstr, parser, reason, prefix):
+    "Index in *hdstr* of the part of the string found to be wrong, or None"
+    s = str(hdstr)
+    if reason == hdateparser.NO_MATCH:
+        from historicaldate import hdatetokens    # imported when needed, as it compiles regular expressions
+
+        position = hdatetokens.first_unknown(s.strip())
+        return len(s) - len(s.lstrip()) + position if position is not None else None
+    for groupprefix in (prefix, "mid"):   # early and late dates may be copied from the mid date
+        for group in _ERROR_GROUPS[reason]:
+            if (position := parser.group_position(s, groupprefix + group)) is not None:
+                return position
+    return None
@@ -0,0 +1,88 @@
+"""
+Settings used to calculate dates from parsed HDate strings, shared by a whole batch of dates
+
+An *HDateContext* holds the date taken as today for 'ongoing', the default circa interval and
+the calendar used to find the last day of a month. It is immutable, so one context can be shared by
+any number of *HDate* objects, parsers and threads, and is hashable, so it can be part of a cache key.
+With a fixed *today*, the dates for a string depend only on the string, its *dateformat* and the context,
+so they can be safely memoized (see *hdatecache*).
+
+A context is passed to *HDate()*, to the *hdateutils* functions, or to an *HDateParser*, which then
+passes it to every HDate made with that parser. *DEFAULT_CONTEXT* is used when there is none
+"""
+import datetime
+
+DEFAULT_CIRCA_DAYS = int(5 * 365.25)
+
+# ------------------------------------------------------------------------------------------------------
+class HDateContext():
+    """
+    Immutable settings for calculating dates, see the module documentation
+    """
+    __slots__ = ("today", "circa_days", "proleptic_gregorian", "_ordinal_today")
+
+    def __init__(self, today=None, circa_days=DEFAULT_CIRCA_DAYS, proleptic_gregorian=False):
+        """
+        *today* (datetime.date, optional): the date of 'ongoing'. If None (default), the date
+        on which each 'ongoing' date is calculated is used, so results for 'ongoing' are not reproducible.
+        *context_for_today()* makes a context with today's date fixed
+
+        *circa_days* (int, default 5 years): the uncertainty either side of a circa date with no length given,
+        and of the late date of 'ongoing'
+
+        *proleptic_gregorian* (bool, default False): the calendar used to find the last day of the month,
+        for late dates given only as a year or month, see *hdatecalendar.days_in_month()*.
+        If False, February 1700 ends on the 29th (Julian to 1752), if True on the 28th (Gregorian)
+        """
+        if today is not None and type(today) != datetime.date:
+            raise TypeError(f"today must be a datetime.date or None, not {type(today)}")
+        if int(circa_days) != circa_days or circa_days < 0:
+            raise ValueError(f"circa_days must be a whole number of days, at least 0: not {circa_days}")
+        object.__setattr__(self, "today", today)
+        object.__setattr__(self, "circa_days", int(circa_days))
+        object.__setattr__(self, "proleptic_gregorian", bool(proleptic_gregorian))
+        object.__setattr__(self, "_ordinal_today", today.toordinal() if today is not None else None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("HDateContext is immutable, use replace() to make a changed copy")
+
+    def __delattr__(self, name):
+        raise AttributeError("HDateContext is immutable")
+
+    def __reduce__(self):
+        return (HDateContext, (self.today, self.circa_days, self.proleptic_gregorian))
+    # ------------------------------------------------------------------------------------------------------
+    def _key(self):
+        return (self.today, self.circa_days, self.proleptic_gregorian)
+
+    def __eq__(self, other):
+        return self._key() == other._key() if isinstance(other, HDateContext) else NotImplemented
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"HDateContext(today={self.today!r}, circa_days={self.circa_days}, " \
+               f"proleptic_gregorian={self.proleptic_gregorian})"
+    # ------------------------------------------------------------------------------------------------------
+    @property
+    def fixed(self):
+        "True if *today* is set, so that all results for this context are reproducible"
+        return self._ordinal_today is not None
+
+    def ordinal_today(self):
+        "The ordinal of *today*, or of today's date if *today* is None"
+        return self._ordinal_today if self._ordinal_today is not None else datetime.date.today().toordinal()
+
+    def replace(self, **changes):
+        "Return a new context, with the settings given as keyword arguments changed"
+        settings = {"today": self.today, "circa_days": self.circa_days, "proleptic_gregorian": self.proleptic_gregorian}
+        settings.update(changes)
+        return HDateContext(**settings)
+
+# ------------------------------------------------------------------------------------------------------
+DEFAULT_CONTEXT = HDateContext()
+
+def context_for_today(circa_days=DEFAULT_CIRCA_DAYS, proleptic_gregorian=False):
+    "Return a context with *today* fixed at today's date, for a batch of dates that must all use the same date"
+    return HDateContext(datetime.date.today(), circa_days, proleptic_gregorian)
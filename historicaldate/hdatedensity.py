@@ -0,0 +1,137 @@
+"""
+Histograms and counts over time of many dates with uncertainty, given as arrays of ordinals,
+for example the columns from *hdatearray.parse_many()*
+
+* *histogram()* gives the number of dates in each of a set of bins (days, years, decades, centuries...),
+  with each date's weight spread evenly over the days from its early to its late date, or all at its mid date
+* *active_counts()* gives the number of intervals *[ordinal_early, ordinal_late]* containing each day,
+  as a step function, and *count_active()* the number containing each of a set of days
+
+Bins are given by an array of *edges*, the ordinals of the first day of each bin, followed by that
+of the day after the last bin. *year_edges()* gives edges for years, or groups of years, across BC and AD.
+Only rows which are valid should be given, e.g. *cols.ordinal_early[cols.valid]*
+
+Requires numpy, which is otherwise not needed by this package::
+
+    pip install historicaldate[numpy]
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from historicaldate import hdatearray
+
+WEIGHTINGS = ("uniform", "mid")
+
+ActiveCounts = namedtuple("ActiveCounts", "ordinals counts")
+ActiveCounts.__doc__ = """
+The result of *active_counts()*: a step function, as int64 arrays. From each of *ordinals* until the next,
+*counts* intervals are active. Before the first ordinal and from the last (where the count is 0) none are
+"""
+
+# ------------------------------------------------------------------------------------------------------
+def year_edges(start_year, end_year, step=1):
+    """
+    Bin edges (an int64 array of ordinals) for the years from *start_year* to *end_year*, in groups of *step* years
+
+    Years are ints, negative for BC, and there is no year zero, so groups run across it without a gap:
+    *year_edges(-20, 19, 10)* gives bins for 20BC-11BC, 10BC-1BC, 1AD-10AD and 11AD-20AD.
+    The last bin is extended to *step* years if need be
+    """
+    if start_year == 0 or end_year == 0:
+        raise ValueError("There is no year zero: use 1 for 1AD and -1 for 1BC")
+    if step < 1 or end_year < start_year:
+        raise ValueError(f"step must be at least 1, and end_year not before start_year: not {step}, {start_year}, {end_year}")
+    first = start_year - 1 if start_year > 0 else start_year    # year index, as in hdatearray.to_years()
+    last = end_year if end_year > 0 else end_year + 1           # year index of the year after end_year
+    nbins = -((first - last) // step)
+    return hdatearray.years_to_ordinal(first + step * np.arange(nbins + 1, dtype=np.int64)) + 1
+
+def histogram(early, late, edges, weighting="uniform", mid=None, weights=None):
+    """
+    The total weight of dates falling in each of the bins given by *edges*, as a float64 array
+
+    *early* and *late* are arrays of ordinals. With *weighting* 'uniform' each date's weight is spread evenly
+    over the days *ordinal_early* to *ordinal_late*, and with 'mid' it is all on the ordinal in the array *mid*.
+    Each weight is 1 unless an array of *weights* is given. Weight falling outside all of the bins is not counted
+    """
+    if weighting not in WEIGHTINGS:
+        raise ValueError(f"weighting must be one of {WEIGHTINGS}: not '{weighting}'")
+    early, late = _intervals(early, late)
+    edges = np.asarray(edges, dtype=np.int64)
+    if len(edges) < 2 or np.any(edges[1:] <= edges[:-1]):
+        raise ValueError("edges must be at least two ordinals in ascending order")
+    nbins = len(edges) - 1
+    weights = np.ones(len(early)) if weights is None else np.asarray(weights, dtype=np.float64)
+
+    if weighting == "mid":
+        if mid is None:
+            raise ValueError("mid must be given for weighting 'mid'")
+        bins = _bins(edges, np.asarray(mid, dtype=np.int64))
+        inside = (bins >= 0) & (bins < nbins)
+        return np.bincount(bins[inside], weights=weights[inside], minlength=nbins).astype(np.float64)
+
+    # -- Bins (-1 if before the first bin, nbins if after the last) of each early and late date
+    bin_early = _bins(edges, early)
+    bin_late = _bins(edges, late)
+    per_day = weights / (late - early + 1)
+    result = np.zeros(nbins + 1)    # with a spare bin for weight after the last bin, dropped at the end
+    # -- Dates within a single bin
+    single = bin_early == bin_late
+    result += np.bincount(np.clip(bin_early[single], 0, nbins), minlength=nbins + 1,
+                          weights=np.where(bin_early[single] >= 0, weights[single], 0.0))
+    # -- Dates in several bins: the parts of the first and last bins, then the rate per day in the bins between
+    multi = ~single
+    bin_early, bin_late, early, late, per_day = bin_early[multi], bin_late[multi], early[multi], late[multi], per_day[multi]
+    first = bin_early >= 0
+    result += np.bincount(bin_early[first], weights=(edges[bin_early[first] + 1] - early[first]) * per_day[first],
+                          minlength=nbins + 1)
+    last = bin_late < nbins
+    result += np.bincount(bin_late[last], weights=(late[last] - edges[bin_late[last]] + 1) * per_day[last],
+                          minlength=nbins + 1)
+    rate = np.bincount(bin_early + 1, weights=per_day, minlength=nbins + 1) - \
+           np.bincount(bin_late, weights=per_day, minlength=nbins + 1)
+    return result[:nbins] + np.cumsum(rate)[:nbins] * np.diff(edges)
+
+def active_counts(early, late):
+    """
+    The number of intervals *[early, late]* (arrays of ordinals, inclusive) which contain each day,
+    as an *ActiveCounts* step function, found by a sweep over the sorted early and late ordinals
+    """
+    early, late = _intervals(early, late)
+    starts, ends = np.sort(early), np.sort(late + 1)
+    ordinals = np.union1d(starts, ends)
+    counts = np.searchsorted(starts, ordinals, side="right") - np.searchsorted(ends, ordinals, side="right")
+    changed = np.diff(counts, prepend=0) != 0
+    return ActiveCounts(ordinals[changed], counts[changed])
+
+def count_active(early, late, ordinals):
+    "The number of intervals *[early, late]* (arrays of ordinals, inclusive) which contain each of the array *ordinals*"
+    early, late = _intervals(early, late)
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    return np.searchsorted(np.sort(early), ordinals, side="right") - np.searchsorted(np.sort(late), ordinals, side="left")
+
+# ------------------------------------------------------------------------------------------------------
+def _bins(edges, ordinals):
+    """
+    The bin of each of *ordinals*: -1 if before the first bin, or the number of bins if after the last
+
+    Where the bins cover few days compared with the number of ordinals, the bins are looked up in a table of
+    the bin of each day, which is several times quicker than a binary search for each ordinal
+    """
+    nbins = len(edges) - 1
+    ndays = edges[-1] - edges[0]
+    if ndays > 4 * len(ordinals) + 1000000:
+        return np.searchsorted(edges, ordinals, side="right") - 1
+    table = np.repeat(np.arange(-1, nbins + 1, dtype=np.int32), np.concatenate(([1], np.diff(edges), [1])))
+    return table[np.clip(ordinals - (edges[0] - 1), 0, ndays + 1)]
+
+def _intervals(early, late):
+    "*early* and *late* as int64 arrays, checked to be of the same length and in order"
+    early = np.asarray(early, dtype=np.int64)
+    late = np.asarray(late, dtype=np.int64)
+    if early.shape != late.shape:
+        raise ValueError(f"early and late must be the same length: not {len(early)}, {len(late)}")
+    if np.any(late < early):
+        raise ValueError("late ordinals cannot be before early ones")
+    return early, late
@@ -0,0 +1,147 @@
+"""
+Writing dates as HDate format strings, the inverse of parsing
+
+*format_pdates()* writes a *pdates* dictionary (early, mid and late ordinals and specification levels)
+as a string which parses back to the same dates, and *format_date()* writes a single date.
+For many dates at once, see *hdatearray.format_many()*, which gives the same strings.
+
+Dates are written in one of the *STYLES*:
+
+* *'dmy'* (default): *25 Dec 1066*, *Dec 1066*, *1066*
+* *'mdy'*: *Dec 25, 1066*, for parsing with dateformat 'mdy'. Dates given to the month are written *1066-12*,
+  since the 'mdy' grammar reads *Dec 1066* as 10th December 66
+* *'iso'*: *1066-12-25*, *1066-12*, *1066*
+
+BC dates have *BC* appended, and if any date in a string is BC, AD dates have *AD* appended.
+Dates with a mid date derived from a 'circa' calculation are written as *circa ...*, *between ... and ...*,
+*after ...* or *before ...*, whichever gives the same dates. A 'circa' range other than that of *context*
+(HDateContext, default *hdatecontext.DEFAULT_CONTEXT*) is written into the string, e.g. *circa10y 1066*.
+
+The strings parse back to the same dates with the same *context*, and *dateformat* None or 'dmy'
+for the 'dmy' and 'iso' styles, or 'mdy' for the 'mdy' style
+"""
+from historicaldate import hdatecalendar
+from historicaldate import hdatecontext
+
+STYLES = ("dmy", "mdy", "iso")
+
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+_YMD_PARTS = {"y": 1, "m": 2, "d": 3}   # number of (year, month, day) items written at each specification level
+
+# ------------------------------------------------------------------------------------------------------
+def format_date(ordinal, speclevel="d", style="dmy", show_ad=False):
+    """
+    Write the date with (int) *ordinal* to the day, month or year (*speclevel* 'd', 'm' or 'y'), in *style* (see *STYLES*)
+
+    * format_date(389342) == '25 Dec 1066'
+    * format_date(-15997, 'y') == '44 BC'
+
+    If *show_ad* is True, AD dates have *AD* appended
+    """
+    _check_style(style)
+    return _date(hdatecalendar.ordinal_to_ymd(ordinal), speclevel, style, show_ad)
+
+def format_pdates(pdates, style="dmy", context=None):
+    """
+    Write a *pdates* dictionary (see *HDate*), as an HDate format string which parses back to the same
+    ordinals and specification levels, in *style* (see *STYLES*). *pdates* None gives '', and the
+    *pdates* of *HDate("circa")*, with no ordinals, gives 'circa'
+
+    * format_pdates(HDate("between 1 Jan 1066 and Dec 1066").pdates) == 'between 1 Jan 1066 and Dec 1066'
+    * format_pdates(HDate("c10y 1066-12-25").pdates, style="iso") == 'circa10y 1066-12-25'
+
+    Raises ValueError if no HDate string gives these dates, e.g. a circa range which is not symmetric
+    """
+    if pdates is None:
+        return ""
+    _check_style(style)
+    ordinals = (pdates["ordinal_early"], pdates["ordinal_mid"], pdates["ordinal_late"])
+    return _format(ordinals, (pdates["slearly"], pdates["slmid"], pdates["sllate"]),
+                   [hdatecalendar.ordinal_to_ymd(ordinal) if ordinal is not None else None for ordinal in ordinals],
+                   style, (context or hdatecontext.DEFAULT_CONTEXT).circa_days)
+
+# ------------------------------------------------------------------------------------------------------
+def _check_style(style):
+    if style not in STYLES:
+        raise ValueError(f"style must be one of {STYLES}: not '{style}'")
+
+def _date(ymd, speclevel, style, show_ad):
+    "Write a date given as *(year, month, day)*, with a negative year for BC, see *format_date()*"
+    year, month, day = ymd
+    if year < 0:
+        year, calendar = -year, " BC"
+    else:
+        calendar = " AD" if show_ad else ""
+    if speclevel == "y":
+        return f"{year}{calendar}"
+    elif speclevel == "m":
+        return f"{_MONTHS[month - 1]} {year}{calendar}" if style == "dmy" else f"{year}-{month:02}{calendar}"
+    elif speclevel == "d":
+        if style == "dmy":
+            return f"{day} {_MONTHS[month - 1]} {year}{calendar}"
+        elif style == "mdy":
+            return f"{_MONTHS[month - 1]} {day}, {year}{calendar}"
+        return f"{year}-{month:02}-{day:02}{calendar}"
+    raise ValueError(f"speclevel must be 'd', 'm' or 'y': not '{speclevel}'")
+
+def _circa_speclevel(ymd):
+    "The specification level at which a 'circa' mid date is written: the least that gives the same date"
+    return "y" if ymd[1:] == (6, 15) else "m" if ymd[2] == 15 else "d"
+
+def _clen(days, circa_days):
+    "The 'circa' range written after *circa*: '' for the default, else e.g. '10y', '3m' or '100d'"
+    if days < 0:
+        raise ValueError(f"A 'circa' range cannot be negative: {days} days")
+    if days == circa_days:
+        return ""
+    for clentype, length in (("y", 365.25), ("m", 365.25 / 12)):
+        if (n := round(days / length)) > 0 and int(n * length) == days:
+            return f"{n}{clentype}"
+    return f"{days}d"
+
+def _format(ordinals, levels, ymds, style, circa_days):
+    """
+    Write the dates with *ordinals*, specification *levels* and *ymds*, each (early, mid, late),
+    with *(year, month, day)* tuples for *ymds*, see *format_pdates()*
+    """
+    slearly, slmid, sllate = levels
+    if slmid == "o":
+        return "ongoing"
+    elif None in ordinals:
+        if slearly == slmid == sllate == "" and ordinals == (None, None, None):
+            return "circa"     # 'circa' with no date
+        raise ValueError(f"Dates with specification levels must all have ordinals: {ordinals}")
+    early, mid, late = ordinals
+    ymd_early, ymd_mid, ymd_late = ymds
+    show_ad = early <= 0 or mid <= 0 or late <= 0
+    if slmid in _YMD_PARTS:
+        # -- Early and late dates the same as the mid date, to its level, are filled in from it
+        text = _date(ymd_mid, slmid, style, show_ad)
+        if slearly != slmid or ymd_early[:_YMD_PARTS[slmid]] != ymd_mid[:_YMD_PARTS[slmid]]:
+            text += " earliest " + _date(ymd_early, slearly, style, show_ad)
+        if sllate != slmid or ymd_late[:_YMD_PARTS[slmid]] != ymd_mid[:_YMD_PARTS[slmid]]:
+            text += " latest " + _date(ymd_late, sllate, style, show_ad)
+        return text
+    elif slmid != "c":
+        raise ValueError(f"slmid must be one of 'd', 'm', 'y', 'c' or 'o': not '{slmid}'")
+
+    def circa_mid():
+        return _date(ymd_mid, _circa_speclevel(ymd_mid), style, show_ad)
+    if slearly == "c" and sllate == "c":
+        if late - mid != mid - early:
+            raise ValueError(f"'circa' dates must be symmetric: {early}, {mid}, {late}")
+        return f"circa{_clen(mid - early, circa_days)} {circa_mid()}"
+    elif slearly == "c":
+        if late - mid != mid - early:
+            raise ValueError(f"Dates before a latest date must be evenly spaced: {early}, {mid}, {late}")
+        clen = _clen(late - mid, circa_days)
+        return ("circa" + clen + " " if clen else "") + "before " + _date(ymd_late, sllate, style, show_ad)
+    elif sllate == "c":
+        clen = _clen(late - mid, circa_days)
+        if late - mid == mid - early and early > 0:   # a BC early date with no other date cannot be parsed
+            return ("circa" + clen + " " if clen else "") + "after " + _date(ymd_early, slearly, style, show_ad)
+        return f"circa{clen} {circa_mid()} earliest {_date(ymd_early, slearly, style, show_ad)}"
+    elif mid == (early + late) // 2:
+        return f"between {_date(ymd_early, slearly, style, show_ad)} and {_date(ymd_late, sllate, style, show_ad)}"
+    return f"circa {circa_mid()} earliest {_date(ymd_early, slearly, style, show_ad)} " \
+           f"latest {_date(ymd_late, sllate, style, show_ad)}"
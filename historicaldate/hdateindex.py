@@ -0,0 +1,328 @@
+"""
+Index of the uncertainty intervals of many HDates, *[ordinal_early, ordinal_late]*, for overlap,
+containment and point queries without scanning every date
+
+Requires numpy, which is otherwise not needed by this package::
+
+    pip install historicaldate[numpy]
+"""
+import numpy as np
+
+from historicaldate import hdateutils
+
+_MIN_ORDINAL = np.iinfo(np.int64).min
+_MAX_ORDINAL = np.iinfo(np.int64).max
+
+# ------------------------------------------------------------------------------------------------------
+class HDateIndex():
+    """
+    Index of *[ordinal_early, ordinal_late]* intervals, each identified by an int id
+
+    Ids are given out in order from 0, one per date added, so an index built from a list of HDates
+    has the list positions as ids. HDates with no *pdates* use up an id but are never returned.
+
+    Queries take ordinals, Python dates or HDate format strings (for which the mid date is used),
+    and return int64 arrays of ids in ascending order. Each query is a binary search for each
+    length class of interval (0, 1, 2-3, 4-7 days...), looking at the intervals that are returned
+    and at most those in a window of twice the class's length.
+
+    Dates added one at a time are held in a small buffer, and indexed in groups, which
+    are merged as they grow so that there are at most O(log n) of them.
+    """
+    buffer_size = 1024
+
+    def __init__(self, hdates=()):
+        "Build an index of the HDate objects in *hdates*, with ids 0, 1, 2..."
+        self._groups = []
+        self._buffer_early = np.empty(self.buffer_size, dtype=np.int64)
+        self._buffer_late = np.empty(self.buffer_size, dtype=np.int64)
+        self._buffer_ids = np.empty(self.buffer_size, dtype=np.int64)
+        self._nbuffer = 0
+        self._next_id = 0
+        hdates = list(hdates)
+        self._next_id = len(hdates)
+        self._add_group(*_intervals(hdates))
+
+    @classmethod
+    def from_ordinals(cls, early, late):
+        "Build an index from arrays of early and late ordinals, e.g. from *hdatearray.parse_many()*"
+        index = cls()
+        index.add_ordinals(early, late)
+        return index
+
+    def __len__(self):
+        "The number of intervals in the index"
+        return sum(len(group.ids) for group in self._groups) + self._nbuffer
+    # ------------------------------------------------------------------------------------------------------
+    def add(self, hd):
+        "Add an HDate, returning its id"
+        early, late = _hdate_interval(hd)
+        id = self._next_id
+        self._next_id += 1
+        if early is not None:
+            self._add_to_buffer(early, late, id)
+        return id
+
+    def add_ordinals(self, early, late):
+        """
+        Add intervals from arrays (or ints) of early and late ordinals, returning an int64 array of their ids
+
+        Raises ValueError if any early ordinal is after its late ordinal
+        """
+        early = np.atleast_1d(np.asarray(early, dtype=np.int64))
+        late = np.atleast_1d(np.asarray(late, dtype=np.int64))
+        if early.shape != late.shape or early.ndim != 1:
+            raise ValueError(f"early and late must be 1-dimensional and the same length: not {early.shape}, {late.shape}")
+        if (early > late).any():
+            raise ValueError("early ordinals must not be after late ordinals")
+        ids = np.arange(self._next_id, self._next_id + len(early), dtype=np.int64)
+        self._next_id += len(early)
+        if len(early) >= self.buffer_size:
+            self._add_group(early, late, ids)
+        else:
+            for args in zip(early.tolist(), late.tolist(), ids.tolist()):
+                self._add_to_buffer(*args)
+        return ids
+    # ------------------------------------------------------------------------------------------------------
+    def overlapping(self, start, end):
+        "Ids of intervals which overlap *start* to *end* (inclusive), i.e. of dates which could be in that range"
+        start, end = _to_ordinal(start), _to_ordinal(end)
+        return self._find(_MIN_ORDINAL, end, start, _MAX_ORDINAL)
+
+    def within(self, start, end):
+        "Ids of intervals which are inside *start* to *end* (inclusive), i.e. of dates which are definitely in that range"
+        start, end = _to_ordinal(start), _to_ordinal(end)
+        return self._find(start, end, start, end)
+
+    def at(self, date):
+        "Ids of intervals which include *date*, i.e. of dates which could be on that day"
+        return self.overlapping(date, date)
+
+    def count_overlapping(self, start, end):
+        "The number of intervals which overlap *start* to *end*, counted without listing them"
+        start, end = _to_ordinal(start), _to_ordinal(end)
+        count = int(((self._buffer_early[:self._nbuffer] <= end) & (self._buffer_late[:self._nbuffer] >= start)).sum())
+        for group in self._groups:
+            # -- Those starting by *end*, less those finishing before *start* (which also start by *end*)
+            count += group.count_early_to(end) - group.count_late_to(start - 1)
+        return count
+
+    def nearest(self, date):
+        """
+        Id of the interval nearest to *date*, or None if the index is empty
+
+        An interval which includes *date* is at distance 0, otherwise the distance is to its nearer end.
+        If several intervals are equally near, one of them is returned
+        """
+        ordinal = _to_ordinal(date)
+        candidates = []       # (distance, id)
+        nbuffer = self._nbuffer
+        if nbuffer:
+            early, late = self._buffer_early[:nbuffer], self._buffer_late[:nbuffer]
+            distance = np.maximum(np.maximum(early - ordinal, ordinal - late), 0)
+            i = np.argmin(distance)
+            candidates.append((int(distance[i]), int(self._buffer_ids[i])))
+        for group in self._groups:
+            n = group.count_early_to(ordinal)
+            if n > 0:       # -- the latest finishing of those which start by *ordinal*
+                candidates.append((max(ordinal - int(group.prefix_maxlate[n - 1]), 0), int(group.prefix_maxlate_ids[n - 1])))
+            if n < len(group.ids):      # -- the first to start after *ordinal*
+                candidates.append((int(group.sorted_early[n]) - ordinal, int(group.ids_by_early[n])))
+        return min(candidates)[1] if candidates else None
+    # ------------------------------------------------------------------------------------------------------
+    def _find(self, early_from, early_to, late_from, late_to):
+        "Sorted ids of intervals with early and late ordinals in the given ranges (inclusive)"
+        nbuffer = self._nbuffer
+        early, late = self._buffer_early[:nbuffer], self._buffer_late[:nbuffer]
+        found = [self._buffer_ids[:nbuffer][(early >= early_from) & (early <= early_to) &
+                                            (late >= late_from) & (late <= late_to)]]
+        found.extend(group.find(early_from, early_to, late_from, late_to) for group in self._groups)
+        return np.sort(np.concatenate(found))
+
+    def _add_to_buffer(self, early, late, id):
+        if early > late:
+            raise ValueError(f"early ordinal must not be after late ordinal: {early}, {late}")
+        n = self._nbuffer
+        self._buffer_early[n], self._buffer_late[n], self._buffer_ids[n] = early, late, id
+        self._nbuffer += 1
+        if self._nbuffer == self.buffer_size:
+            self._nbuffer = 0
+            self._add_group(self._buffer_early.copy(), self._buffer_late.copy(), self._buffer_ids.copy())
+
+    def _add_group(self, early, late, ids):
+        "Index the intervals as a new group, then merge groups while the last is at least half the size of the one before"
+        if len(ids) == 0:
+            return
+        self._groups.append(_IntervalGroup(early, late, ids))
+        while len(self._groups) > 1 and 2 * len(self._groups[-1].ids) >= len(self._groups[-2].ids):
+            group2, group1 = self._groups.pop(), self._groups.pop()
+            self._groups.append(_IntervalGroup(np.concatenate([group1.early, group2.early]),
+                                               np.concatenate([group1.late, group2.late]),
+                                               np.concatenate([group1.ids, group2.ids])))
+
+# ------------------------------------------------------------------------------------------------------
+JOIN_PREDICATES = ("possibly_overlaps", "definitely_overlaps", "definitely_before", "within_days")
+
+def join(left, right, predicate="possibly_overlaps", days=0):
+    """
+    Pairs of dates, one from each of *left* and *right*, whose intervals meet *predicate*
+
+    Returns int64 arrays *(left_ids, right_ids)*, sorted by left id then right id. See *iter_join()*
+    """
+    chunks = list(iter_join(left, right, predicate=predicate, days=days))
+    left_ids = np.concatenate([np.zeros(0, dtype=np.int64)] + [chunk[0] for chunk in chunks])
+    right_ids = np.concatenate([np.zeros(0, dtype=np.int64)] + [chunk[1] for chunk in chunks])
+    order = np.lexsort((right_ids, left_ids))
+    return left_ids[order], right_ids[order]
+
+def iter_join(left, right, predicate="possibly_overlaps", days=0, chunksize=1000000):
+    """
+    Generator of pairs of dates whose intervals meet *predicate*, as chunks *(left_ids, right_ids)* 
+    of int64 arrays, each of about *chunksize* pairs (or fewer), in no particular order
+
+    *left* and *right* are each a list of HDates, a tuple of arrays *(early ordinals, late ordinals)*,
+    or *hdatearray.HDateColumns*. Ids are positions in these, and dates with no *pdates*, 
+    or rows that are not valid, are left out.
+
+    *predicate* is one of:
+
+    * *'possibly_overlaps'*: the intervals overlap, so the dates could be the same
+    * *'definitely_overlaps'*: one interval is inside the other, so (as periods) they overlap whatever their exact ends
+    * *'definitely_before'*: the left interval ends before the right one starts
+    * *'within_days'*: the intervals are no more than *days* apart, so the dates could be that close
+
+    The right intervals are sorted by length class and early ordinal, then for all the left intervals
+    at once, binary searches give the ranges of right intervals to check
+    """
+    if predicate not in JOIN_PREDICATES:
+        raise ValueError(f"predicate must be one of {JOIN_PREDICATES}: not {predicate}")
+    if predicate != "within_days":
+        days = 0
+    elif days < 0:
+        raise ValueError(f"days must not be negative: not {days}")
+    left_early, left_late, left_ids = _intervals(left)
+    right_early, right_late, right_ids = _intervals(right)
+    if len(left_ids) == 0 or len(right_ids) == 0:
+        return
+    group = _IntervalGroup(right_early, right_late, right_ids)
+
+    if predicate == "definitely_before":
+        i0 = np.searchsorted(group.sorted_early, left_late, side="right")
+        for left_pos, right_pos in _expand_ranges(i0, np.full_like(i0, len(group.ids)), chunksize):
+            yield left_ids[left_pos], group.ids_by_early[right_pos]
+        return
+
+    for start, end, shortest, longest in group.classes:
+        early = group.early[start:end]
+        i0 = start + np.searchsorted(early, left_early - days - longest, side="left")
+        i1 = start + np.searchsorted(early, left_late + days, side="right")
+        for left_pos, right_pos in _expand_ranges(i0, i1, chunksize):
+            le, ll = left_early[left_pos], left_late[left_pos]
+            re, rl = group.early[right_pos], group.late[right_pos]
+            if predicate == "definitely_overlaps":
+                match = ((re <= le) & (ll <= rl)) | ((le <= re) & (rl <= ll))
+            else:
+                match = (le <= rl + days) & (re <= ll + days)
+            yield left_ids[left_pos[match]], group.ids[right_pos[match]]
+
+def _expand_ranges(i0, i1, chunksize):
+    "Generator of (row, position) arrays for positions *i0[row]* to *i1[row]* (exclusive), in chunks of about *chunksize*"
+    counts = np.maximum(i1 - i0, 0)
+    ends = np.cumsum(counts)
+    first = 0
+    while first < len(counts):
+        done = ends[first - 1] if first > 0 else 0
+        last = max(first + 1, int(np.searchsorted(ends, done + chunksize, side="right")))
+        rows = np.arange(first, last)
+        n = int(ends[last - 1] - done)
+        if n > 0:
+            row = np.repeat(rows, counts[first:last])
+            yield row, np.arange(n) - (np.repeat(ends[first:last] - counts[first:last], counts[first:last]) - done) + i0[row]
+        first = last
+
+def _intervals(dates):
+    "(early, late, ids) int64 arrays from HDates, a tuple of early and late arrays, or HDateColumns"
+    if hasattr(dates, "ordinal_early"):
+        ids = np.flatnonzero(dates.valid)
+        return dates.ordinal_early[ids], dates.ordinal_late[ids], ids
+    if isinstance(dates, tuple):
+        early, late = (np.asarray(a, dtype=np.int64) for a in dates)
+        if (early > late).any():
+            raise ValueError("early ordinals must not be after late ordinals")
+        return early, late, np.arange(len(early), dtype=np.int64)
+    intervals = [_hdate_interval(hd) for hd in dates]
+    ids = np.array([i for i, (early, _) in enumerate(intervals) if early is not None], dtype=np.int64)
+    return (np.array([intervals[i][0] for i in ids], dtype=np.int64),
+            np.array([intervals[i][1] for i in ids], dtype=np.int64), ids)
+
+# ------------------------------------------------------------------------------------------------------
+class _IntervalGroup():
+    """
+    Fixed set of intervals, arranged for searching
+
+    *early*, *late* and *ids* are sorted by length class (lengths 0, 1, 2-3, 4-7, 8-15 days...), then
+    by early ordinal, with *classes* holding (start, end, shortest, longest) for each length class. 
+    Knowing the lengths, a search for late ordinals in a range becomes a search for early ordinals in a range, 
+    which is only slightly larger.
+
+    *sorted_early* (with *ids_by_early*) and *sorted_late* are the ordinals sorted separately, and 
+    *prefix_maxlate* the latest late ordinal (with *prefix_maxlate_ids*) of each leading part of *sorted_early*
+    """
+    __slots__ = ("early", "late", "ids", "classes", "sorted_early", "ids_by_early", "sorted_late",
+                 "prefix_maxlate", "prefix_maxlate_ids")
+
+    def __init__(self, early, late, ids):
+        length = late - early
+        lengthclass = np.frexp(length.astype(np.float64))[1]
+        order = np.lexsort((early, lengthclass))
+        self.early, self.late, self.ids, length, lengthclass = \
+            early[order], late[order], ids[order], length[order], lengthclass[order]
+        bounds = np.flatnonzero(np.diff(lengthclass)) + 1
+        self.classes = [(start, end, int(length[start:end].min()), int(length[start:end].max()))
+                        for start, end in zip([0] + bounds.tolist(), bounds.tolist() + [len(ids)])]
+
+        order = np.argsort(early, kind="stable")
+        self.sorted_early, self.ids_by_early = early[order], ids[order]
+        self.prefix_maxlate = np.maximum.accumulate(late[order])
+        self.prefix_maxlate_ids = ids[order][_last_max_positions(late[order], self.prefix_maxlate)]
+        self.sorted_late = np.sort(late)
+
+    def count_early_to(self, ordinal):
+        "The number of intervals with an early ordinal up to and including *ordinal*"
+        return int(np.searchsorted(self.sorted_early, ordinal, side="right"))
+
+    def count_late_to(self, ordinal):
+        "The number of intervals with a late ordinal up to and including *ordinal*"
+        return int(np.searchsorted(self.sorted_late, ordinal, side="right"))
+
+    def find(self, early_from, early_to, late_from, late_to):
+        "Ids of intervals with early and late ordinals in the given ranges (inclusive)"
+        found = []
+        for start, end, shortest, longest in self.classes:
+            # -- late = early + length, so the late ordinal range limits the early ordinals
+            lo = max(early_from, late_from - longest, _MIN_ORDINAL)
+            hi = min(early_to, late_to - shortest)
+            if lo > hi:
+                continue
+            early = self.early[start:end]
+            i0, i1 = start + np.searchsorted(early, lo, side="left"), start + np.searchsorted(early, hi, side="right")
+            late = self.late[i0:i1]
+            found.append(self.ids[i0:i1][(late >= late_from) & (late <= late_to)])
+        return np.concatenate(found) if found else np.zeros(0, dtype=np.int64)
+
+# ------------------------------------------------------------------------------------------------------
+def _last_max_positions(values, running_max):
+    "For each position, the position (at or before it) at which *running_max* of *values* was reached"
+    positions = np.where(values == running_max, np.arange(len(values)), 0)
+    return np.maximum.accumulate(positions)
+
+def _hdate_interval(hd):
+    "(ordinal_early, ordinal_late) for an HDate, from *HDate.ordinals*, or (None, None)"
+    early, _, late = hd.ordinals
+    return early, late
+
+def _to_ordinal(date):
+    "An int ordinal from an int (including numpy ints), a Python date or an HDate format string"
+    if isinstance(date, (int, np.integer)) and not isinstance(date, bool):
+        return int(date)
+    return hdateutils.to_ordinal(date)
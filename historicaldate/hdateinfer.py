@@ -0,0 +1,106 @@
+"""
+Choosing the *dateformat* (None, 'dmy' or 'mdy') of a column of strings from a sample of it
+
+Each distinct string in the sample is parsed with each of the three formats, without exceptions
+(see *hdatecheck*). The format which gives dates for the most strings is chosen, preferring None,
+then 'dmy', then 'mdy' where they give as many, since None accepts the fewest strings.
+
+Its *confidence* (0 to 1) is found by comparing it with each of the other formats in turn. Strings
+which only the chosen format gives dates for are evidence for it, and those which only the other format
+gives dates for, or for which the two give different dates (e.g. *03/04/1900*), are against it.
+*confidence* is the smallest share of evidence for the chosen format, or 1 where there is no evidence
+either way, because the formats give the same dates for the whole sample.
+
+The rest of the column can then be parsed once, with the chosen format's shared parser
+(*FormatGuess.parser*), for example by *hdatearray.parse_many()*
+"""
+import itertools
+from collections import namedtuple
+
+from historicaldate import hdatecheck
+from historicaldate import hdateparser
+
+DATEFORMATS = (None, "dmy", "mdy")    # in order of preference
+
+class FormatGuess(namedtuple("FormatGuess", "dateformat confidence match_rate counts")):
+    """
+    The result of *infer_dateformat()*: the chosen *dateformat*, its *confidence* (see the module documentation),
+    *match_rate*, the fraction of the distinct non-blank strings in the sample which give dates with it,
+    and *counts*, a dictionary of the number of those strings which give dates with each format
+    """
+    __slots__ = ()
+
+    @property
+    def parser(self):
+        "The shared parser for *dateformat*"
+        return hdateparser.get_parser(self.dateformat)
+
+# ------------------------------------------------------------------------------------------------------
+def infer_dateformat(strings, sample_size=1000, max_rows=100000):
+    """
+    Choose the *dateformat* for an iterable of HDate format strings, returning a *FormatGuess*
+
+    The sample is the first *sample_size* distinct strings which are not blank, found in at most
+    the first *max_rows* strings, so only as much of *strings* is read as is needed for that,
+    even if it has few distinct strings. If there are none, or none give dates with any format,
+    the result is None with confidence 0
+    """
+    sample = _sample(iter(strings), sample_size, max_rows)
+    if not sample:
+        return FormatGuess(None, 0.0, 0.0, dict.fromkeys(DATEFORMATS, 0))
+    dates = {}     # dateformat: list of (early, mid, late) ordinals, or None, for each string
+    for dateformat in DATEFORMATS:
+        hdates = hdatecheck.check_many(sample, dateformat=dateformat).hdates
+        dates[dateformat] = [_ordinals(hd) for hd in hdates]
+    counts = {dateformat: sum(d is not None for d in dates[dateformat]) for dateformat in DATEFORMATS}
+    best = max(DATEFORMATS, key=lambda dateformat: counts[dateformat])   # the first of any tied
+    if counts[best] == 0:
+        return FormatGuess(None, 0.0, 0.0, counts)
+    confidence = min(_confidence(dates[best], dates[other]) for other in DATEFORMATS if other != best)
+    return FormatGuess(best, confidence, counts[best] / len(sample), counts)
+
+def infer_from_stream(strings, sample_size=1000, max_rows=100000):
+    """
+    As *infer_dateformat()*, but for an iterator that can be read only once, such as rows of a file
+
+    Returns *(guess, strings)*, where *strings* is an iterator over all of the strings,
+    including those read for the sample, which are held until they are read again.
+    At most *max_rows* strings are held
+    """
+    it = iter(strings)
+    read = []
+    guess = infer_dateformat(_recording(it, read), sample_size, max_rows)
+    return guess, itertools.chain(read, it)
+
+# ------------------------------------------------------------------------------------------------------
+def _sample(it, sample_size, max_rows):
+    "The first *sample_size* distinct strings from *it* which are not blank, from at most *max_rows* of its items"
+    sample = {}
+    if sample_size < 1 or max_rows < 1:
+        raise ValueError(f"sample_size and max_rows must be at least 1: not {sample_size}, {max_rows}")
+    for s in itertools.islice(it, max_rows):
+        if str(s).strip():
+            sample.setdefault(s, None)
+            if len(sample) >= sample_size:
+                break
+    return list(sample)
+
+def _recording(it, read):
+    "Generator of the items of *it*, each of which is also appended to *read*"
+    for s in it:
+        read.append(s)
+        yield s
+
+def _ordinals(hd):
+    "The ordinals of an HDate (see *HDate.ordinals*), or None if it is None or has no dates"
+    if hd is None or (ordinals := hd.ordinals)[1] is None:
+        return None
+    return ordinals
+
+def _confidence(best, other):
+    "Share of the evidence (see the module documentation) for the format giving *best* rather than *other*"
+    evidence_for = sum(b is not None and o is None for b, o in zip(best, other))
+    evidence_against = sum(o is not None and b != o for b, o in zip(best, other))
+    if evidence_for + evidence_against == 0:
+        return 1.0
+    return evidence_for / (evidence_for + evidence_against)
@@ -0,0 +1,396 @@
+import re
+import threading
+import time
+
+from historicaldate import hdatestats
+
+ENGINES = ("regex", "tokenizer")
+
+# -- Reasons why a string does not give dates, see *HDateParser.try_parse()* and *hdatecheck*
+NO_MATCH = "no_match"                                      # not in HDate format
+PREPOST_MONTH = "prepost_month"                            # a month both before and after the year
+BC_EARLY_WITHOUT_CALENDAR = "bc_early_without_calendar"    # a BC early date, with no main calendar
+DAY_OUT_OF_RANGE = "day_out_of_range"                      # e.g. 31 Feb, found when the dates are calculated
+MONTH_OUT_OF_RANGE = "month_out_of_range"
+YEAR_OUT_OF_RANGE = "year_out_of_range"                    # e.g. the year 0 AD
+
+_ERROR_MESSAGES = {PREPOST_MONTH: "Prefix month and postfix month ({prefix}) cannot both be set: {hdstr}",
+                   BC_EARLY_WITHOUT_CALENDAR: "If early calendar is BC/BCE, main calendar must be specified: {hdstr}"}
+
+# -- The keys of every *d_parsed* dictionary, in order
+D_PARSED_KEYS = ("circa", "ongoing", "clen", "clentype") + \
+                tuple(f"{prefix}{part}" for prefix in ("mid", "early", "late") for part in ("day", "mon", "year", "calendar"))
+
+# -- Plain years, ISO style dates and e.g. '44 BC', each of which is read in the same way by every dateformat
+_FASTPATH_PATTERN = r"([0-9]{1,8})(?:-(0[1-9]|1[0-2]|[1-9])(?:-([0-9]{1,2}))?)?(?:\s*(ce|ad|bc|bce))?"
+
+# ------------------------------------------------------------------------------------------------------
+class HDateParser():
+    """
+    Precompiled parser for HDate format strings
+
+    The grammar, month tables and compiled regular expression for one *dateformat* are
+    built once, when the parser is created. A parser holds no per-parse state, so a single
+    instance can be shared between any number of *HDate* objects and threads.
+
+    Use *get_parser()* to obtain the shared parser for a *dateformat* rather than creating a new one.
+    """
+    def __init__(self, dateformat=None, engine="regex", fastpath=True, context=None):
+        """
+        *dateformat* (str): as in the HDate() constructor, takes values *None*, *'dmy'* or *'mdy'*
+
+        *engine* (str): how strings are matched against the grammar:
+
+        * *'regex'* (default): a single regular expression
+        * *'tokenizer'*: the same regular expression, after a quick check of the characters and words
+          of the string (see *hdatetokens*). Strings containing any that cannot occur in HDate format
+          (e.g. 'unknown', 'n/a', '1066?') are rejected without matching. The results are the same,
+          and it is worth using for input with many strings like that. Other strings take slightly longer
+
+        *fastpath* (bool, default *True*): if True, strings which are just a year, optionally followed 
+        by '-mm' or '-mm-dd' and/or a calendar (*1066*, *1066-12-25*, *44 BC*), skip the full grammar.
+        The results are the same either way
+
+        *context* (HDateContext, optional): the context used by HDates made with this parser, 
+        unless they are given one, see *hdatecontext*. Shared parsers from *get_parser()* have none
+
+        The number of strings parsed by each route is kept in the dictionary *counters*,
+        see *parse()*. Counts are not locked, so may be slightly low if several threads parse at once
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"engine must be one of {ENGINES}: not '{engine}'")
+        self.dateformat = dateformat
+        self.engine = engine
+        self.match_pattern = self._create_match_pattern(dateformat)
+        self.compiled_pattern = re.compile(self.match_pattern, re.VERBOSE | re.IGNORECASE)
+        self.groupnames = tuple(self.compiled_pattern.groupindex)
+        self._monthnumber_re = re.compile(self.monthnumberpattern)
+        self._fastpath_re = re.compile(_FASTPATH_PATTERN, re.IGNORECASE)
+        if engine == "tokenizer":
+            from historicaldate import hdatetokens
+            self._rejects = hdatetokens.rejects
+            self._matcher = self._match_checked
+        else:
+            self._matcher = self._match_regex
+        self.fastpath = fastpath
+        self.context = context
+        self._no_re_parsed = dict.fromkeys(self.groupnames)
+        self._no_d_parsed = self.convert_re_parsed(self._no_re_parsed)
+        self.counters = {}
+        self.reset_counters()
+    # ------------------------------------------------------------------------------------------------------
+    def __reduce__(self):
+        """
+        Pickle as the constructor's arguments. A shared parser (see *get_parser()*) is unpickled 
+        as the shared parser for the same options, and any other as a new parser. Counters are not kept
+        """
+        if _parsers.get((self.dateformat, self.engine)) is self:
+            return (get_parser, (self.dateformat, self.engine))
+        return (HDateParser, (self.dateformat, self.engine, self.fastpath, self.context))
+
+    def reset_counters(self):
+        "Set all of the parse counters in *counters* to zero"
+        self.counters.update({"fastpath": 0, "grammar": 0, "blank": 0, "nomatch": 0})
+    # ------------------------------------------------------------------------------------------------------
+    def _create_match_pattern(self, dateformat):
+        circa_pattern = "circa|c|c.|about|estimated"
+        day_pattern = "[0-9]{1,2}"
+
+        months = ["january", "february","march","april","may","june",
+                "july","august","september","october","november","december"]
+        self.months = [month[0:3] for month in months]   # three-letter abbreviations
+        self.monthnumberpattern = '[1-9]|0[1-9]|1[0-2]'
+        month_pattern = "|".join(months + self.months)   # allow either full month names or 3-letter abbrevations
+
+        if dateformat:   # if not None then numerical months are also allowed
+            month_pattern += "|" + self.monthnumberpattern
+
+        year_pattern = "[0-9]{1,8}"    # should we require at least three year digits to avoid confusion with month and day?
+        nmonth_pattern = self.monthnumberpattern  # was "[0-9]{1,2}"
+        calendar_pattern = "ce|ad|bc|bce"
+
+        def makedatepattern(prefix=""):
+            if dateformat is None or dateformat.lower() == "dmy":
+                datepattern = f"""
+                    (
+                        (
+                            (?P<{prefix}preday>{day_pattern})(st|nd|rd|th)?\\s*(/|\\s))?
+                            \\s*(?P<{prefix}premon>{month_pattern})
+                            \\s*(/|\\s|,)
+                        )?
+                        \\s*
+                        (?P<{prefix}year>{year_pattern})
+                        (-(?P<{prefix}postmon>{nmonth_pattern})
+                            (-(?P<{prefix}postday>{day_pattern})
+                            )?
+                        )?
+                        (\\s*(?P<{prefix}calendar>{calendar_pattern}))?
+                """
+            elif dateformat.lower() == "mdy":
+                datepattern = f"""
+                    (
+                        (
+                            (?P<{prefix}premon>{month_pattern})\\s*(/|\\s)
+                            \\s*(?P<{prefix}preday>{day_pattern})(st|nd|rd|th)?)?
+                            (,)?
+                        )?
+                        \\s*/?\\s*(?P<{prefix}year>{year_pattern})
+                        (-(?P<{prefix}postmon>{nmonth_pattern})
+                            (-(?P<{prefix}postday>{day_pattern})
+                            )?
+                        )?
+                        (\\s*(?P<{prefix}calendar>{calendar_pattern})
+                    )?
+                """
+            else:
+                raise NotImplementedError(f"dateformat must be None, 'dmy' or 'mdy': not '{dateformat}'")
+            return datepattern
+
+        pattern = f"""
+                ^(
+                    (?P<ongoing>ongoing)|
+                    ((?P<circa>{circa_pattern})
+                        ((?P<clen>{year_pattern})
+                            (?P<clentype>y|m|d)
+                        )?
+                    )?
+                    (\\s*{makedatepattern(prefix="mid")})?
+                    (\\s*(earliest|after|between)\\s+{makedatepattern(prefix="early")})?
+                    (\\s*(latest|before|and)\\s+{makedatepattern(prefix="late")})?
+                )$
+        """
+
+        return pattern
+    # ------------------------------------------------------------------------------------------------------
+    def match(self, s):
+        """
+        Match the (stripped, non-empty) string *s* against the grammar
+
+        Returns the *re_parsed* dictionary, with an entry (str or None) for every named group,
+        or None if *s* is not in HDate format
+        """
+        return self._matcher(s)
+
+    def _match_regex(self, s):
+        srch = self.compiled_pattern.search(s)
+        if srch is None:
+            return None
+        return srch.groupdict()
+
+    def _match_checked(self, s):
+        return None if self._rejects(s) else self._match_regex(s)
+    # ------------------------------------------------------------------------------------------------------
+    def convert_re_parsed(self, re_parsed, hdstr=""):
+        """
+        Convert re_parsed format to d_parsed format
+        This represents canonical form, so
+           - Represents Y/M/D as integers
+           - Does no calculations
+           - converts calendars to bce or ce
+           - sets main calendar, others are set only if different
+
+        *hdstr* is the original input string, used in error messages
+        """
+        if (error := self._re_parsed_error(re_parsed)) is not None:
+            reason, prefix = error
+            raise ValueError(_ERROR_MESSAGES[reason].format(prefix=prefix, hdstr=hdstr))
+        return self._convert_checked(re_parsed)
+
+    def _convert_checked(self, re_parsed):
+        "*convert_re_parsed()*, for *re_parsed* already checked by *_re_parsed_error()*"
+        sp = re_parsed
+
+        hd = {}
+        hd["circa"] = sp["circa"] is not None  # 'circa':bool
+        hd["ongoing"] = sp["ongoing"] is not None  # 'ongoing':bool
+        hd["clen"] = sp["clen"]
+        hd["clentype"] = sp["clentype"]
+
+        def getmonthnum(month):
+            if len(month) >= 3 and month[0:3].lower() in self.months:
+                monthnum = self.months.index(month[0:3].lower()) + 1
+            elif self._monthnumber_re.search(month):
+                monthnum = int(month)
+            else:
+                assert False, f"Illegal month string {month}"
+            assert monthnum >= 1 and monthnum <= 12
+            return monthnum
+
+        def set_dmy(prefix=""):
+            """
+            To do: check values are within range???
+            """
+            hd[prefix+"day"] = int(sp[prefix+"preday"]) if sp[prefix+"preday"]  \
+                        else int(sp[prefix+"postday"]) if sp[prefix+"postday"]  \
+                        else None
+            hd[prefix+"mon"] = getmonthnum(sp[prefix+"premon"]) if sp[prefix+"premon"]  \
+                        else int(sp[prefix+"postmon"]) if sp[prefix+"postmon"]  \
+                        else None
+            hd[prefix+"year"] = int(sp[prefix+"year"]) if sp[prefix+"year"] else None
+            ctemp = sp[prefix+"calendar"].lower() if sp[prefix+"calendar"] else None
+            hd[prefix+"calendar"] = {'bc':'bce','ad':'ce'}.get(ctemp, ctemp)
+
+        set_dmy("mid")
+        set_dmy("early")
+        set_dmy("late")
+
+        # resolve calendars
+        # (1) if main is missing, copy from late
+        # (2) if main is still missing, and early is ad/ce, copy from early (else error)
+        # (3) if early is missing, copy from main
+        if hd["midcalendar"] is None: hd["midcalendar"] = hd["latecalendar"]
+        if hd["midcalendar"] is None and hd["earlycalendar"] is not None:
+            hd["midcalendar"] = hd["earlycalendar"]    # not BC, see _re_parsed_error()
+        if hd["earlycalendar"] is None:
+            hd["earlycalendar"] = hd["midcalendar"]
+
+        return hd
+
+    def _re_parsed_error(self, re_parsed):
+        """
+        Return *(reason, prefix)* if *re_parsed* cannot be converted to d_parsed, or None. *reason* is 
+        *PREPOST_MONTH* or *BC_EARLY_WITHOUT_CALENDAR*, and *prefix* that of the date concerned
+        """
+        # -- preday and postday cannot both be set, ditto premon and postmon
+        for prefix in ("mid", "early", "late"):
+            if re_parsed[f"{prefix}premon"] is not None and re_parsed[f"{prefix}postmon"] is not None:
+                return PREPOST_MONTH, prefix
+            # Failing here should be impossible if test above is passed
+            assert re_parsed[f"{prefix}preday"] is None or re_parsed[f"{prefix}postday"] is None
+        # -- The main calendar is copied from the early one only if that is AD
+        if re_parsed["midcalendar"] is None and re_parsed["latecalendar"] is None and \
+                    re_parsed["earlycalendar"] is not None and re_parsed["earlycalendar"].lower() in {"bc", "bce"}:
+            return BC_EARLY_WITHOUT_CALENDAR, "early"
+        return None
+    # ------------------------------------------------------------------------------------------------------
+    def parse(self, hdstr, missingasongoing=False):
+        """
+        Parse *hdstr* (HDate format) and return the tuple *(re_parsed, d_parsed)*
+
+        A blank string returns *(None, None)*, or is parsed as 'ongoing' if *missingasongoing* is True.
+        Raises ValueError if *hdstr* is not in HDate format
+
+        Each call adds one to one of the *counters*: *'fastpath'* (see the HDateParser() constructor), 
+        *'grammar'* (matched by the full grammar), *'blank'* or *'nomatch'*
+
+        If statistics are being recorded (see *hdatestats*), the parse is timed and counted
+        """
+        if (stats := hdatestats.active_stats) is not None:
+            return self._parse_recorded(hdstr, missingasongoing, stats)
+        if s := (str(hdstr).strip() if (str(hdstr).strip() or not missingasongoing) else "ongoing"):
+            if self.fastpath and (fast := self._fastpath_re.fullmatch(s)):
+                self.counters["fastpath"] += 1
+                return self._parse_fast(fast)
+            re_parsed = self.match(s)
+            if re_parsed is None:
+                self.counters["nomatch"] += 1
+                raise ValueError(f"Illegal date format: {hdstr}")
+            self.counters["grammar"] += 1
+            return re_parsed, self.convert_re_parsed(re_parsed, hdstr)
+        else:
+            self.counters["blank"] += 1
+            return None, None
+
+    def _parse_recorded(self, hdstr, missingasongoing, stats):
+        "As *parse()*, adding the times of its phases, the shape of *hdstr* and any failure to *stats* (hdatestats.ParseStats)"
+        clock = time.perf_counter_ns
+        if not (s := (str(hdstr).strip() if (str(hdstr).strip() or not missingasongoing) else "ongoing")):
+            self.counters["blank"] += 1
+            stats.shapes["blank"] += 1
+            return None, None
+        start = clock()
+        if self.fastpath and (fast := self._fastpath_re.fullmatch(s)):
+            self.counters["fastpath"] += 1
+            re_parsed, d_parsed = self._parse_fast(fast)
+            stats.add_time("match", clock() - start)
+        else:
+            re_parsed = self.match(s)
+            matched = clock()
+            if re_parsed is None:
+                self.counters["nomatch"] += 1
+                stats.add_time("failed", matched - start)
+                stats.add_failure(NO_MATCH)
+                raise ValueError(f"Illegal date format: {hdstr}")
+            self.counters["grammar"] += 1
+            stats.add_time("match", matched - start)
+            try:
+                d_parsed = self.convert_re_parsed(re_parsed, hdstr)
+            except ValueError:
+                stats.add_time("failed", clock() - matched)
+                stats.add_failure(self._re_parsed_error(re_parsed)[0])
+                raise
+            stats.add_time("convert_re_parsed", clock() - matched)
+        stats.shapes[hdatestats.shape(d_parsed)] += 1
+        return re_parsed, d_parsed
+
+    def try_parse(self, hdstr, missingasongoing=False):
+        """
+        As *parse()*, but returning the tuple *(re_parsed, d_parsed, error)* rather than raising ValueError
+
+        *error* is None, or if *hdstr* is not in HDate format, *(reason, prefix)*: *reason* is *NO_MATCH*,
+        *PREPOST_MONTH* or *BC_EARLY_WITHOUT_CALENDAR*, and *prefix* that of the date concerned
+        (None for *NO_MATCH*). *re_parsed* and *d_parsed* are then None. 
+        Nothing is recorded by *hdatestats*
+        """
+        if not (s := (str(hdstr).strip() if (str(hdstr).strip() or not missingasongoing) else "ongoing")):
+            self.counters["blank"] += 1
+            return None, None, None
+        if self.fastpath and (fast := self._fastpath_re.fullmatch(s)):
+            self.counters["fastpath"] += 1
+            return self._parse_fast(fast) + (None,)
+        if (re_parsed := self.match(s)) is None:
+            self.counters["nomatch"] += 1
+            return None, None, (NO_MATCH, None)
+        self.counters["grammar"] += 1
+        if (error := self._re_parsed_error(re_parsed)) is not None:
+            return None, None, error
+        return re_parsed, self._convert_checked(re_parsed), None
+
+    def group_position(self, hdstr, groupname):
+        """
+        Index in *hdstr* of the start of the named group (e.g. *'lateday'*) when it is matched by the grammar,
+        or None if it is not matched, or the group is not set
+        """
+        s = str(hdstr)
+        if (srch := self.compiled_pattern.search(s.strip())) is None or srch.start(groupname) < 0:
+            return None
+        return len(s) - len(s.lstrip()) + srch.start(groupname)
+    # ------------------------------------------------------------------------------------------------------
+    def _parse_fast(self, fast):
+        "Build re_parsed and d_parsed directly from a match of the fast path pattern"
+        year, mon, day, calendar = fast.groups()
+        re_parsed = self._no_re_parsed.copy()
+        d_parsed = self._no_d_parsed.copy()
+        re_parsed["midyear"] = year
+        d_parsed["midyear"] = int(year)
+        if mon:
+            re_parsed["midpostmon"] = mon
+            d_parsed["midmon"] = int(mon)
+            if day:
+                re_parsed["midpostday"] = day
+                d_parsed["midday"] = int(day)
+        if calendar:
+            re_parsed["midcalendar"] = calendar
+            ctemp = calendar.lower()
+            d_parsed["midcalendar"] = d_parsed["earlycalendar"] = {'bc':'bce','ad':'ce'}.get(ctemp, ctemp)
+        return re_parsed, d_parsed
+
+# ------------------------------------------------------------------------------------------------------
+_parsers = {}
+_parsers_lock = threading.Lock()
+
+def get_parser(dateformat=None, engine="regex"):
+    """
+    Return the shared *HDateParser* for *dateformat* and *engine*, creating it on first use
+
+    *dateformat* is as in the HDate() constructor, *engine* as in the HDateParser() constructor
+    """
+    key = (dateformat, engine)
+    try:
+        return _parsers[key]
+    except KeyError:
+        pass
+    with _parsers_lock:
+        if key not in _parsers:
+            _parsers[key] = HDateParser(dateformat, engine=engine)
+        return _parsers[key]
@@ -0,0 +1,66 @@
+"""
+Sorted collection of HDate objects, with slicing by date
+"""
+import bisect
+
+from historicaldate import hdateutils
+
+# ------------------------------------------------------------------------------------------------------
+class SortedHDates():
+    """
+    HDate objects kept in order of *HDate.sort_key()*, i.e. by mid, early then late ordinals, then specification levels
+
+    HDates with no dates cannot be added. Adding and removing take O(n) time (but little of it),
+    looking up dates in a range O(log n)
+    """
+    def __init__(self, hdates=()):
+        "Sorted collection of the HDates in *hdates*"
+        self._hdates = sorted(hdates, key=lambda hd: hd.sort_key())
+        self._keys = [hd.sort_key() for hd in self._hdates]
+
+    def __len__(self):
+        return len(self._hdates)
+
+    def __iter__(self):
+        return iter(self._hdates)
+
+    def __getitem__(self, index):
+        "An HDate, or a list of HDates for a slice"
+        return self._hdates[index]
+
+    def __contains__(self, hd):
+        key = hd.sort_key()
+        i = bisect.bisect_left(self._keys, key)
+        return hd in self._hdates[i:bisect.bisect_right(self._keys, key, lo=i)]
+
+    def __repr__(self):
+        return f"SortedHDates({[hd.input for hd in self._hdates]!r})"
+    # ------------------------------------------------------------------------------------------------------
+    def add(self, hd):
+        "Add an HDate, after any with the same *sort_key()*"
+        key = hd.sort_key()
+        i = bisect.bisect_right(self._keys, key)
+        self._keys.insert(i, key)
+        self._hdates.insert(i, hd)
+
+    def remove(self, hd):
+        "Remove an HDate equal to *hd*, raising ValueError if there is none"
+        key = hd.sort_key()
+        i = bisect.bisect_left(self._keys, key)
+        for j in range(i, bisect.bisect_right(self._keys, key, lo=i)):
+            if self._hdates[j] == hd:
+                del self._keys[j], self._hdates[j]
+                return
+        raise ValueError(f"HDate not found: '{hd.input}'")
+    # ------------------------------------------------------------------------------------------------------
+    def between(self, start, end):
+        """
+        List of the HDates with mid dates from *start* to *end* (inclusive), in order
+
+        *start* and *end* are as accepted by *hdateutils.to_ordinal()*: ordinals, Python dates or
+        HDate format strings, for which the mid date is used. Either may be None, for no limit
+        """
+        lo = 0 if start is None else bisect.bisect_left(self._keys, (hdateutils.to_ordinal(start),))
+        hi = len(self._keys) if end is None else bisect.bisect_left(self._keys, (hdateutils.to_ordinal(end) + 1,))
+        return self._hdates[lo:hi]
+
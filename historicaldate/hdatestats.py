@@ -0,0 +1,142 @@
+"""
+Optional instrumentation of parsing, shared by all *HDate* objects and parsers
+
+Recording is off by default, when it costs one check of *active_stats* per parse. Once it is switched on,
+with *enable_stats()* or for the duration of a *with measure():* block, each string parsed adds to:
+
+* *times_ns* and *calls*: the cumulative time (nanoseconds) and number of calls of each phase in *PHASES*.
+  *'match'* is matching by the fast path or the grammar, *'convert_re_parsed'* making *d_parsed*,
+  *'convert_dates'* making the early, mid and late dates as given (or 'ongoing'), *'fill_in'* filling in
+  the missing dates from the circa interval and the other dates, and *'failed'* the time spent in
+  any of those steps which ended in an exception
+* *shapes*: the number of strings of each shape, see *SHAPES*
+* *speclevels*: for each of *'early'*, *'mid'* and *'late'*, the number of dates with each specification level
+* *failures*: the number of strings which failed, by reason, as in *hdateparser*: *'no_match'*
+  (not in HDate format), *'prepost_month'*, *'bc_early_without_calendar'*, or for dates that could not be
+  calculated, *'day_out_of_range'* (e.g. 31 Feb), *'month_out_of_range'* or *'year_out_of_range'*
+* *no_pdates*: the number of strings which parsed, but gave *pdates* None
+
+Strings found in the parse cache (see *hdatecache*) are not parsed, so are not counted.
+Counts are not locked, so may be slightly low if several threads parse at once
+"""
+import contextlib
+import copy
+
+# -- Phases, in the order in which they occur
+PHASES = ("match", "convert_re_parsed", "convert_dates", "fill_in", "failed")
+
+# -- Shapes of input string: blank, 'ongoing', 'circa ...', with an early and/or late date, BC, or any other date
+SHAPES = ("blank", "ongoing", "circa", "range", "bc", "plain")
+
+# ------------------------------------------------------------------------------------------------------
+class ParseStats():
+    "Timings and counts of parsing, see the module documentation"
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        "Set all times and counts to zero"
+        self.times_ns = dict.fromkeys(PHASES, 0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.shapes = dict.fromkeys(SHAPES, 0)
+        self.speclevels = {"early": {}, "mid": {}, "late": {}}
+        self.failures = {}
+        self.no_pdates = 0
+    # ------------------------------------------------------------------------------------------------------
+    def add_time(self, phase, ns):
+        "Add one call taking *ns* nanoseconds to *phase*"
+        self.times_ns[phase] += ns
+        self.calls[phase] += 1
+
+    def add_failure(self, reason):
+        self.failures[reason] = self.failures.get(reason, 0) + 1
+
+    def add_speclevels(self, dates):
+        "Count the specification levels of a *pdates* (or *HDate._calc_dates()*) dictionary"
+        for prefix, counts in self.speclevels.items():
+            sl = dates[f"sl{prefix}"]
+            counts[sl] = counts.get(sl, 0) + 1
+
+    def merge(self, other):
+        "Add the times and counts of another ParseStats to this one"
+        for phase in PHASES:
+            self.times_ns[phase] += other.times_ns[phase]
+            self.calls[phase] += other.calls[phase]
+        for shape in SHAPES:
+            self.shapes[shape] += other.shapes[shape]
+        for prefix, counts in other.speclevels.items():
+            for sl, n in counts.items():
+                self.speclevels[prefix][sl] = self.speclevels[prefix].get(sl, 0) + n
+        for reason, n in other.failures.items():
+            self.failures[reason] = self.failures.get(reason, 0) + n
+        self.no_pdates += other.no_pdates
+    # ------------------------------------------------------------------------------------------------------
+    def snapshot(self):
+        "Return a copy of the times and counts as a dictionary, with the keys listed in the module documentation"
+        return copy.deepcopy({"times_ns": self.times_ns, "calls": self.calls, "shapes": self.shapes,
+                              "speclevels": self.speclevels, "failures": self.failures,
+                              "no_pdates": self.no_pdates})
+
+def shape(d_parsed):
+    "The shape (see *SHAPES*) of a parsed string, given its *d_parsed* (None if it was blank)"
+    if d_parsed is None:
+        return "blank"
+    elif d_parsed["ongoing"]:
+        return "ongoing"
+    elif d_parsed["circa"]:
+        return "circa"
+    elif d_parsed["earlyyear"] is not None or d_parsed["lateyear"] is not None:
+        return "range"
+    elif d_parsed["midcalendar"] == "bce":
+        return "bc"
+    else:
+        return "plain"
+
+# ------------------------------------------------------------------------------------------------------
+active_stats = None    # The ParseStats being recorded to, or None if recording is switched off
+
+def enable_stats():
+    """
+    Switch on recording of parse statistics, returning the *ParseStats* recorded to
+
+    Any existing statistics are replaced
+    """
+    global active_stats
+    active_stats = ParseStats()
+    return active_stats
+
+def disable_stats():
+    "Switch off recording of parse statistics, discarding them"
+    global active_stats
+    active_stats = None
+
+def stats_snapshot():
+    "Return the statistics as a dictionary (see *ParseStats.snapshot()*), or None if recording is off"
+    return active_stats.snapshot() if active_stats is not None else None
+
+def reset_stats():
+    "Set all times and counts to zero"
+    if active_stats is not None:
+        active_stats.reset()
+
+@contextlib.contextmanager
+def measure():
+    """
+    Context manager which records parse statistics for the duration of a *with* block, yielding a new *ParseStats*
+
+    At the end of the block recording is restored to as it was, and if it was on,
+    the block's statistics are added to those being recorded outside it::
+
+        with hdatestats.measure() as stats:
+            dates = [HDate(s) for s in strings]
+        print(stats.snapshot())
+    """
+    global active_stats
+    previous = active_stats
+    active_stats = stats = ParseStats()
+    try:
+        yield stats
+    finally:
+        active_stats = previous
+        if previous is not None:
+            previous.merge(stats)
@@ -0,0 +1,168 @@
+"""
+Binary file of parsed dates, opened with *mmap* so that nothing is parsed or copied when it is loaded
+
+Requires numpy, which is otherwise not needed by this package::
+
+    pip install historicaldate[numpy]
+
+The file is a 64 byte header, then one fixed-width record (*RECORD_DTYPE*) for each date, then a heap of
+the input strings, UTF-8 encoded, which records point into. Repeated strings are stored once.
+The header holds *MAGIC*, the format version, the record size, the numbers of records and heap bytes,
+and a CRC-32 of the records and heap.
+
+'ongoing' dates are stored as they were calculated when the file was written, with the *ongoing* flag set.
+"""
+import mmap
+import struct
+import zlib
+
+import numpy as np
+
+from historicaldate import hdate
+from historicaldate import hdatearray
+from historicaldate import hdateparser
+from historicaldate import hdatestream
+
+MAGIC = b"HDATESTO"
+VERSION = 1
+
+# -- Little-endian, with the ordinals first so that they are 8-byte aligned
+RECORD_DTYPE = np.dtype([("ordinal_early", "<i8"), ("ordinal_mid", "<i8"), ("ordinal_late", "<i8"),
+                         ("heap_offset", "<u8"), ("heap_length", "<u4"),
+                         ("slearly", "u1"), ("slmid", "u1"), ("sllate", "u1"), ("flags", "u1")])
+
+# -- Bits of *flags*
+FLAG_VALID = 1
+FLAG_CIRCA = 2
+FLAG_ONGOING = 4
+
+_HEADER = struct.Struct("<8sIIQQI")    # magic, version, record size, records, heap bytes, crc32
+_HEADER_SIZE = 64
+
+# ------------------------------------------------------------------------------------------------------
+def write_store(path, strings, dateformat=None, missingasongoing=False, parser=None):
+    """
+    Parse an iterable of HDate format strings and write them to the file *path*, returning the number of records
+
+    Strings which do not give dates are stored with *FLAG_VALID* not set, and ordinals and levels of 0.
+    Other values are stored as strings, as cells are read by *hdatestream*: None as '', and others, e.g. 
+    a float NaN or an int, as *str(value)*. *dateformat*, *missingasongoing* and *parser* are as in *hdatearray.parse_many()*
+    """
+    if parser is None:
+        parser = hdateparser.get_parser(dateformat)
+    distinct = {}
+    inverse = np.fromiter((distinct.setdefault(hdatestream._cell_string(s), len(distinct)) for s in strings), dtype=np.int64)
+
+    fields = {name: np.zeros(len(distinct), dtype=RECORD_DTYPE[name]) for name in RECORD_DTYPE.names}
+    heap = bytearray()
+    for s, i in distinct.items():
+        encoded = s.encode("utf-8")
+        fields["heap_offset"][i], fields["heap_length"][i] = len(heap), len(encoded)
+        heap += encoded
+        try:
+            hd = hdate.HDate(s, missingasongoing=missingasongoing, parser=parser, keep_parsed=True)
+        except ValueError:
+            continue
+        pdates = hd.pdates
+        if pdates is None or None in (pdates["ordinal_early"], pdates["ordinal_mid"], pdates["ordinal_late"]):
+            continue
+        for which in ("early", "mid", "late"):
+            fields[f"ordinal_{which}"][i] = pdates[f"ordinal_{which}"]
+            fields[f"sl{which}"][i] = hdate.SPECLEVEL_CODES[pdates[f"sl{which}"]]
+        fields["flags"][i] = FLAG_VALID | (FLAG_CIRCA if hd.d_parsed["circa"] else 0) | \
+                             (FLAG_ONGOING if pdates["slmid"] == "o" else 0)
+
+    records = np.zeros(len(distinct), dtype=RECORD_DTYPE)
+    for name, values in fields.items():
+        records[name] = values
+    records = records[inverse]
+    crc = zlib.crc32(heap, zlib.crc32(records.tobytes()))
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize, len(records), len(heap), crc).ljust(_HEADER_SIZE, b"\0"))
+        f.write(records.tobytes())
+        f.write(heap)
+    return len(records)
+
+# ------------------------------------------------------------------------------------------------------
+class HDateStore():
+    """
+    A file written by *write_store()*, opened read-only with *mmap*
+
+    *records* is a structured array (*RECORD_DTYPE*) over the file, and *ordinal_early*,
+    *ordinal_mid*, *ordinal_late*, *slearly*, *slmid*, *sllate* and *flags* are views of its fields,
+    so no data is copied until it is used. *valid*, *circa* and *ongoing* are boolean arrays made from *flags*.
+
+    Can be used as a context manager, which closes the file at the end
+    """
+    def __init__(self, path, verify=True):
+        """
+        Open the file *path*. Raises ValueError if it is not in this format or version,
+        or, if *verify* is True, if the checksum does not match its contents
+        """
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open(verify)
+        except:
+            self._mmap.close()
+            raise
+
+    def _open(self, verify):
+        if len(self._mmap) < _HEADER_SIZE:
+            raise ValueError("File is too short to be an HDate store")
+        magic, version, record_size, count, heap_size, crc = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError("File is not an HDate store")
+        if version != VERSION or record_size != RECORD_DTYPE.itemsize:
+            raise ValueError(f"HDate store version {version} (record size {record_size}) is not supported")
+        heap_start = _HEADER_SIZE + count * record_size
+        if len(self._mmap) != heap_start + heap_size:
+            raise ValueError("HDate store is truncated or has extra data")
+        if verify and zlib.crc32(memoryview(self._mmap)[_HEADER_SIZE:]) != crc:
+            raise ValueError("HDate store checksum does not match")
+
+        self.records = np.frombuffer(self._mmap, dtype=RECORD_DTYPE, count=count, offset=_HEADER_SIZE)
+        self._heap = memoryview(self._mmap)[heap_start:]
+        for field in ("ordinal_early", "ordinal_mid", "ordinal_late", "slearly", "slmid", "sllate", "flags"):
+            setattr(self, field, self.records[field])
+
+    def __len__(self):
+        return len(self.records)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        "Close the file. If arrays taken from the store are still in use, it stays mapped until they are not"
+        self.records = self.ordinal_early = self.ordinal_mid = self.ordinal_late = None
+        self.slearly = self.slmid = self.sllate = self.flags = None
+        self._heap.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+    # ------------------------------------------------------------------------------------------------------
+    @property
+    def valid(self):
+        return (self.flags & FLAG_VALID).astype(bool)
+
+    @property
+    def circa(self):
+        return (self.flags & FLAG_CIRCA).astype(bool)
+
+    @property
+    def ongoing(self):
+        return (self.flags & FLAG_ONGOING).astype(bool)
+
+    def input(self, i):
+        "The input string of record *i*"
+        offset, length = int(self.records[i]["heap_offset"]), int(self.records[i]["heap_length"])
+        return str(self._heap[offset:offset + length], "utf-8")
+
+    def columns(self):
+        "The records as *hdatearray.HDateColumns* (of views, except for *valid*)"
+        return hdatearray.HDateColumns(self.ordinal_early, self.ordinal_mid, self.ordinal_late,
+                                       self.slearly, self.slmid, self.sllate, self.valid)
@@ -0,0 +1,131 @@
+"""
+Streaming conversion of date columns, for files too large to hold in memory
+
+Rows are read lazily (e.g. by *read_csv()*), and the named columns parsed a chunk of rows at a time
+with the shared parser, each distinct string in a chunk being parsed once.
+
+A row is bad if any of its named columns holds a string which is not blank but does not give dates.
+Bad rows are left out of the output, and instead *(row, column, message)* is appended to *errors*,
+if given, which may be a list or any object with an *append()* method.
+Rows are numbered from 0, not counting a header line.
+"""
+import copy
+import csv
+import itertools
+import os
+from collections import namedtuple
+
+from historicaldate import hdate
+from historicaldate import hdateparser
+
+ColumnChunk = namedtuple("ColumnChunk", "row_numbers rows columns")
+ColumnChunk.__doc__ = """
+A chunk of rows from *parse_stream_columns()*: *row_numbers* is an int64 array, *rows* the list of row
+dictionaries and *columns* a dictionary of *hdatearray.HDateColumns*, one for each named column
+"""
+
+# ------------------------------------------------------------------------------------------------------
+def read_csv(source, **kwargs):
+    """
+    Generator of rows (dictionaries) from a CSV file, read one at a time
+
+    *source* is a file name or an open file, *kwargs* are passed to *csv.DictReader()*
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, newline="", encoding=kwargs.pop("encoding", "utf-8")) as f:
+            yield from csv.DictReader(f, **kwargs)
+    else:
+        yield from csv.DictReader(source, **kwargs)
+
+def parse_stream(rows, columns, dateformat=None, missingasongoing=False, chunksize=10000, errors=None,
+                 suffix="_hdate"):
+    """
+    Generator of rows with an HDate added for each of the named *columns*, under the column name plus *suffix*
+
+    *rows* is an iterable of dictionaries, *columns* a column name or list of names.
+    *dateformat* and *missingasongoing* are as in the HDate() constructor
+    """
+    columns = [columns] if isinstance(columns, str) else list(columns)
+    parser = hdateparser.get_parser(dateformat)
+    for first, chunk in _chunks(rows, chunksize):
+        parsed = {column: _parse_chunk_column(chunk, column, parser, missingasongoing) for column in columns}
+        for i, row in enumerate(chunk):
+            bad = [(column, parsed[column][i]) for column in columns if isinstance(parsed[column][i], str)]
+            if bad:
+                if errors is not None:
+                    for column, message in bad:
+                        errors.append((first + i, column, message))
+                continue
+            for column in columns:
+                row[column + suffix] = parsed[column][i]
+            yield row
+
+def parse_stream_columns(rows, columns, dateformat=None, missingasongoing=False, chunksize=100000, errors=None):
+    """
+    Generator of *ColumnChunk*, each holding up to *chunksize* rows with the named *columns*
+    parsed into arrays by *hdatearray.parse_many()*. Requires numpy
+
+    Blank strings give rows with *valid* False, as in *parse_many()*
+    """
+    import numpy as np
+    from historicaldate import hdatearray
+
+    columns = [columns] if isinstance(columns, str) else list(columns)
+    parser = hdateparser.get_parser(dateformat)
+    for first, chunk in _chunks(rows, chunksize):
+        parsed = {}
+        good = np.ones(len(chunk), dtype=bool)
+        chunk_errors = []
+        for column in columns:
+            strings = [_cell_string(row.get(column)) for row in chunk]
+            column_errors = []
+            parsed[column] = hdatearray.parse_many(strings, missingasongoing=missingasongoing, parser=parser,
+                                                   errors=column_errors)
+            for i, message in column_errors:
+                if strings[i].strip():
+                    good[i] = False
+                    chunk_errors.append((first + i, column, message))
+        if errors is not None:
+            for error in sorted(chunk_errors, key=lambda error: error[0]):    # stable, so columns stay in order
+                errors.append(error)
+        keep = np.flatnonzero(good)
+        yield ColumnChunk(first + keep, [chunk[i] for i in keep],
+                          {column: hdatearray.HDateColumns(*(a[keep] for a in cols)) for column, cols in parsed.items()})
+
+# ------------------------------------------------------------------------------------------------------
+def _chunks(rows, chunksize):
+    "Generator of (first row number, list of rows)"
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be at least 1: not {chunksize}")
+    it = iter(rows)
+    first = 0
+    while chunk := list(itertools.islice(it, chunksize)):
+        yield first, chunk
+        first += len(chunk)
+
+def _cell_string(value):
+    "The string for a cell: '' if it is missing (None), or *value* as a string, e.g. 'nan' for a float NaN"
+    return "" if value is None else str(value)
+
+def _parse_chunk_column(chunk, column, parser, missingasongoing):
+    """
+    List of an HDate, or an error message, for the *column* of each row of *chunk*
+
+    Each distinct string is parsed once, and repeats are copies, which are made without parsing again
+    """
+    distinct = {}
+    result = []
+    for row in chunk:
+        s = _cell_string(row.get(column))
+        if (parsed := distinct.get(s)) is None:
+            try:
+                parsed = hdate.HDate(s, missingasongoing=missingasongoing, parser=parser)
+                if parsed.ordinals[1] is None and s.strip():
+                    parsed = f"No date could be calculated: {s}"
+            except ValueError as e:
+                parsed = str(e)
+            distinct[s] = parsed
+            result.append(parsed)
+        else:
+            result.append(parsed if isinstance(parsed, str) else copy.copy(parsed))
+    return result
@@ -0,0 +1,63 @@
+"""
+Lexical checks of HDate format strings, made without matching the grammar
+
+Every character of a string in HDate format is a letter, digit, whitespace or one of '/,-', and every
+run of letters is made up of the words of the grammar (month names, 'circa', 'bc', 'earliest'...).
+*rejects()* finds strings which break either rule, which it does much more quickly than the regular
+expression built by *HDateParser* fails to match them. It is used by *HDateParser* with engine 'tokenizer',
+in front of the regular expression. *first_unknown()* gives the position of the first such character or word.
+
+In 'c.' at the start of a string the '.' matches any character, so the first two characters, and the
+first word if it starts with 'c', are not checked.
+"""
+import re
+
+_MONTHS = ["january", "february","march","april","may","june",
+           "july","august","september","october","november","december"]
+_MONTH_NAMES = _MONTHS + [month[0:3] for month in _MONTHS]
+
+# -- Every run of letters in a valid string is made up of these words
+_VOCABULARY = set(_MONTH_NAMES + ["circa", "c", "about", "estimated", "ongoing", "y", "m", "d",
+                                  "st", "nd", "rd", "th", "ce", "ad", "bc", "bce",
+                                  "earliest", "after", "between", "latest", "before", "and"])
+_VOCABULARY_RE = re.compile("(?:" + "|".join(sorted(_VOCABULARY, key=len, reverse=True)) + ")+")
+_LETTERS_RE = re.compile("[a-z]+")
+_BAD_CHAR_RE = re.compile(r"[^a-z0-9/,\-\s]")
+
+# ------------------------------------------------------------------------------------------------------
+def rejects(s):
+    """
+    True if the (stripped, non-empty) string *s* contains a character or word which cannot occur
+    in an HDate format string, so that it cannot be matched by the grammar. False does not mean that
+    *s* is in HDate format. Strings with non-ASCII characters, which the regular expression
+    case-folds, are never rejected
+    """
+    if not s.isascii():
+        return False
+    sl = s.lower()
+    wildcard = len(sl) > 1 and sl[0] == "c" and sl[1] != "\n"
+    if _BAD_CHAR_RE.search(sl, 2 if wildcard else 0):
+        return True
+    if _VOCABULARY.issuperset(words := _LETTERS_RE.findall(sl)):
+        return False
+    for k, word in enumerate(words):
+        if not (word in _VOCABULARY or (wildcard and k == 0 and sl.startswith(word))
+                or _VOCABULARY_RE.fullmatch(word)):
+            return True
+    return False
+
+def first_unknown(s):
+    """
+    Index in the (stripped) string *s* of the first character or word which cannot occur in an HDate
+    format string, or None if there is none, and the parts are just in an order the grammar does not allow
+    """
+    sl = s.lower()
+    wildcard = len(sl) > 1 and sl[0] == "c" and sl[1] != "\n"
+    positions = []
+    if (bad := _BAD_CHAR_RE.search(sl, 2 if wildcard else 0)) is not None:
+        positions.append(bad.start())
+    for word in _LETTERS_RE.finditer(sl):
+        if not (_VOCABULARY_RE.fullmatch(word.group()) or (wildcard and word.start() == 0)):
+            positions.append(word.start())
+            break
+    return min(positions) if positions else None
@@ -1,19 +1,22 @@
-import sys
 import datetime
+import math
 from collections import namedtuple
 
-# -- Fix in case this is included as a submodule
-if "./historicaldate" not in sys.path:
-    sys.path.insert(0,"./historicaldate") # Put this first in list  
-
 from historicaldate import hdate
+from historicaldate import hdatecalendar
+
+# -- Public names, which the package also exports
+__all__ = ["YMD", "to_ordinal", "to_python_date", "to_years", "format_year", "years_to_ordinal", "to_ymd",
+           "calc_mid_ordinal"]
+
+YMD = namedtuple("YMD", "year month day")     # Returned by to_ymd()
 
-def to_ordinal(date_or_ordinal, delta=0, dateformat=None):
+def to_ordinal(date_or_ordinal, delta=0, dateformat=None, context=None):
     """
     Takes either a python date (datetime.date), an (int) ordinal or an HDate format string.
     Returns an ordinal. Optionally apply a delta (days)
 
-    *dateformat* is as in the HDate() constructor
+    *dateformat* and *context* are as in the HDate() constructor
     """
     if date_or_ordinal is None:
         return None
@@ -22,17 +25,17 @@ def to_ordinal(date_or_ordinal, delta=0, dateformat=None):
     elif type(date_or_ordinal) == int:
         return date_or_ordinal + delta
     elif type(date_or_ordinal) == str:
-        return hdate.HDate(date_or_ordinal, dateformat=dateformat).pdates["ordinal_mid"] + delta
+        return hdate.HDate(date_or_ordinal, dateformat=dateformat, context=context).pdates["ordinal_mid"] + delta
     else:
         raise TypeError(f"date_or_ordinal must be int or datetime.date or str, not {type(date_or_ordinal)}")
 # ----
-def to_python_date(date_or_ordinal, dateformat=None):
+def to_python_date(date_or_ordinal, dateformat=None, context=None):
     """
     Takes either a Python date (datetime.date), an (int) ordinal or an HDate format string.
     Returns a Python date if the ordinal is >= 1 or the string represents an AD date, None otherwise.
     If the string represents an uncertain date, the mid-point value is returned
 
-    *dateformat* is as in the HDate() constructor
+    *dateformat* and *context* are as in the HDate() constructor
     """
     if date_or_ordinal is None:
         return None
@@ -41,28 +44,27 @@ def to_python_date(date_or_ordinal, dateformat=None):
     elif type(date_or_ordinal) == int:
         return datetime.date.fromordinal(date_or_ordinal) if date_or_ordinal >= 1 else None
     elif type(date_or_ordinal) == str:
-        return hdate.HDate(date_or_ordinal, dateformat=dateformat).pdates["ordinal_mid"]
+        return hdate.HDate(date_or_ordinal, dateformat=dateformat, context=context).pdates["ordinal_mid"]
     else:
         raise TypeError(f"date_or_ordinal must be int or datetime.date or str, not {type(date_or_ordinal)}")
 # ----
-def to_years(date_or_ordinal, dateformat=None):
+def to_years(date_or_ordinal, dateformat=None, context=None):
     """
     Takes either a python date (datetime.date), an (int) ordinal or an HDate format string.
-    Returns an approximate year value as a float 
+    Returns a year value as a float 
     A returned value of 0.0 corresponding to ordinal day 0, i.e. 31st December 1BC
 
-    *dateformat* is as in the HDate() constructor
+    Each year, AD or BC, is divided into its own number of days (365 or 366), and the fractional part is
+    the end of the day within it, so 1.0 is the end of 31st December 1AD and -1.0 the end of 31st December 2BC.
+    *years_to_ordinal()* is the inverse of this
+
+    *dateformat* and *context* are as in the HDate() constructor
     """
-    if pdate := to_python_date(date_or_ordinal):
-        daynum = pdate.toordinal() - datetime.date(pdate.year,1,1).toordinal() + 1
-        daysinyear = datetime.date(pdate.year,12,31).toordinal() - datetime.date(pdate.year,1,1).toordinal() + 1
-        years = float(pdate.year) - 1 + daynum / daysinyear
-        return years
-    elif (odate := to_ordinal(date_or_ordinal, dateformat=dateformat)) is not None:   # BC
-        years = odate / 365.2425                    # Sloppy, but good enough for most applications
-    else:
-        years = None
-    return years
+    if (odate := to_ordinal(date_or_ordinal, dateformat=dateformat, context=context)) is None:
+        return None
+    year = hdatecalendar.ordinal_to_ymd(odate)[0]
+    start, daysinyear = _year_start_and_length(year)
+    return float(year - 1 if year > 0 else year) + (odate - start + 1) / daysinyear
 # ----
 def format_year(year, showzeroas1ad=True, adtext="AD", bctext="BC"):
     "Format the (int) year in a readable format, appending *BC* if needed"
@@ -78,43 +80,40 @@ def format_year(year, showzeroas1ad=True, adtext="AD", bctext="BC"):
 # ----
 def years_to_ordinal(years):
     """
-    (Approximately) convert a (float) year to an int ordinal. 
+    Convert a (float) year, as returned by *to_years()*, to an int ordinal, rounded to the nearest day. 
     Year 0.0 converts to ordinal 0, representing 31st December 1BC, in the usual way of things in this package
     """
-    return int(years * 365.2425)           # Just as sloppy, but good enough for its only application to date
+    yearindex = math.floor(years)
+    start, daysinyear = _year_start_and_length(yearindex + 1 if yearindex >= 0 else yearindex)
+    return start - 1 + round((years - yearindex) * daysinyear)
+
+def _year_start_and_length(year):
+    "Ordinal of 1st January and number of days in *year* (negative for BC, no year zero)"
+    start = hdatecalendar.first_ordinal_of_year(year)
+    return start, hdatecalendar.first_ordinal_of_year(year + 1 if year != -1 else 1) - start
 # ----
-def to_ymd(date_or_ordinal, dateformat=None):
+def to_ymd(date_or_ordinal, dateformat=None, context=None):
     """
     Takes either a python date (datetime.date), an (int) ordinal or an HDate format string.
     Returns year, month, day as a named tuple with items named 'year', 'month', 'day'
 
-    *dateformat* is as in the HDate() constructor
+    *dateformat* and *context* are as in the HDate() constructor
     """
 
-    YMD = namedtuple("YMD", "year month day")
-
-    if pdate := to_python_date(date_or_ordinal):
-        ymd = YMD(pdate.year, pdate.month, pdate.day)
-    elif (odate := to_ordinal(date_or_ordinal, dateformat=dateformat)) is not None:  
-        days_in_4years_julian = 3*365 + 366
-        cycles = (odate - 1) // days_in_4years_julian           # cycles < 0
-        ad_ordinal = odate - cycles * days_in_4years_julian # Shift it forward by a multiple of 4 years to positive number
-        assert ad_ordinal > 0
-
-        ad_date = datetime.date.fromordinal(ad_ordinal)
-        ymd = YMD(ad_date.year + 4*cycles - 1, ad_date.month, ad_date.day) # Adjust year, there is no year 0
+    if (odate := to_ordinal(date_or_ordinal, dateformat=dateformat, context=context)) is not None:
+        ymd = YMD(*hdatecalendar.ordinal_to_ymd(odate))
     else:
         ymd = None
     return ymd
 # ----
-def calc_mid_ordinal(hdstring, dateformat=None):
+def calc_mid_ordinal(hdstring, dateformat=None, context=None):
     """
     Return the mid date ordinal from an string in HDate format, or None
 
-    *dateformat* is as in the HDate() constructor
+    *dateformat* and *context* are as in the HDate() constructor
     """
     try:
-        hd = hdate.HDate(hdstring, dateformat=dateformat)
+        hd = hdate.HDate(hdstring, dateformat=dateformat, context=context)
         return hd.pdates['ordinal_mid']
     except:
         return None
@@ -0,0 +1,59 @@
+import datetime
+
+import sys
+sys.path.insert(0,"./historicaldate") # in case this is run when a submodule
+
+from historicaldate import hdate
+from historicaldate import hdatecache
+from historicaldate import hdatecontext
+from historicaldate import hdateutils
+from utils_for_tests import expect_valueerror
+
+def test_cache():
+    strings = ["circa 1200", "25 Dec 1066", "Between 500BC and 400BC", "", "circa 1200"]
+    expected = [hdate.HDate(s) for s in strings]
+    hdatecache.enable_cache(maxsize=100)
+    try:
+        for _ in range(3):
+            for s, hd0 in zip(strings, expected):
+                hd = hdate.HDate(s)
+                assert hd.pdates == hd0.pdates and hd.d_parsed == hd0.d_parsed
+        assert hdatecache.cache_info() == {"hits": 11, "misses": 4, "evictions": 0, "size": 4, "maxsize": 100}
+        assert hdateutils.to_ordinal("25 Dec 1066") == expected[1].pdates["ordinal_mid"]
+        assert hdatecache.cache_info()["hits"] == 12
+
+        # -- Objects do not share dictionaries
+        hd1 = hdate.HDate("25 Dec 1066")
+        hd1.pdates["ordinal_mid"] = 0
+        assert hdate.HDate("25 Dec 1066").pdates == expected[1].pdates
+
+        hdatecache.clear_cache()
+        assert hdatecache.cache_info()["size"] == 0 and hdatecache.cache_info()["hits"] == 0
+    finally:
+        hdatecache.disable_cache()
+    assert hdatecache.cache_info() is None
+
+def test_keys_and_eviction():
+    hdatecache.enable_cache(maxsize=2)
+    try:
+        hdate.HDate("1/2/1066", dateformat="dmy")
+        hdate.HDate("1/2/1066", dateformat="mdy")
+        assert hdate.HDate("1/2/1066", dateformat="dmy").pdates["mid"] == datetime.date(1066, 2, 1)
+        assert hdate.HDate("1/2/1066", dateformat="mdy").pdates["mid"] == datetime.date(1066, 1, 2)
+        assert hdate.HDate("", missingasongoing=True).pdates["slmid"] == "o"
+        assert hdate.HDate("").pdates is None
+        assert hdatecache.cache_info()["evictions"] == 2
+    finally:
+        hdatecache.disable_cache()
+
+def test_errors_and_ongoing():
+    hdatecache.enable_cache()
+    try:
+        for _ in range(2):
+            expect_valueerror("not a date")
+        hdate.HDate("ongoing")
+        entry = hdatecache.active_cache.get(("ongoing", None, False, hdatecontext.DEFAULT_CONTEXT))
+        assert entry.pdates is None     # recalculated each time
+        assert hdate.HDate("ongoing").pdates["mid"] == datetime.date.today()
+    finally:
+        hdatecache.disable_cache()
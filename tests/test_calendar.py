@@ -0,0 +1,64 @@
+import datetime
+import random
+
+import sys
+sys.path.insert(0,"./historicaldate") # in case this is run when a submodule
+
+from historicaldate import hdate
+from historicaldate import hdatecalendar
+from historicaldate import hdateutils
+
+def test_ad():
+    "Agrees with Python dates throughout their range"
+    ordinals = [1, 2, 365, 366, 59, 60, 61, hdatecalendar.MAX_PYTHON_ORDINAL] + \
+               [random.randint(1, hdatecalendar.MAX_PYTHON_ORDINAL) for _ in range(20000)]
+    for ordinal in ordinals:
+        pdate = datetime.date.fromordinal(ordinal)
+        assert hdatecalendar.ordinal_to_ymd(ordinal) == (pdate.year, pdate.month, pdate.day)
+        assert hdatecalendar.ymd_to_ordinal(pdate.year, pdate.month, pdate.day) == ordinal
+
+def test_bc():
+    assert hdatecalendar.ymd_to_ordinal(1, 12, 31, isbce=True) == 0
+    assert hdatecalendar.ymd_to_ordinal(100, 7, 12, isbce=True) == -36332
+    assert hdatecalendar.ymd_to_ordinal(5, 2, 29, isbce=True) == hdatecalendar.ymd_to_ordinal(5, 3, 1, isbce=True) - 1
+    assert hdatecalendar.ordinal_to_ymd(0) == (-1, 12, 31)
+    assert hdatecalendar.ordinal_to_ymd(-366) == (-2, 12, 31)
+    for _ in range(20000):
+        ordinal = random.randint(-365 * 100000, 0)
+        year, month, day = hdatecalendar.ordinal_to_ymd(ordinal)
+        assert year < 0 and hdatecalendar.ymd_to_ordinal(-year, month, day, isbce=True) == ordinal
+    for date_args in [(4, 2, 29), (1700, 2, 29), (0, 1, 1), (1066, 13, 1), (1066, 4, 31)]:
+        try:
+            hdatecalendar.ymd_to_ordinal(*date_args, isbce=date_args[0] == 4)
+            assert False, f"{date_args} has not raised a ValueError"
+        except ValueError:
+            pass
+
+def test_large_years():
+    for _ in range(10000):
+        ordinal = random.randint(1, 10**12)
+        assert hdatecalendar.ymd_to_ordinal(*hdatecalendar.ordinal_to_ymd(ordinal)) == ordinal
+    assert hdatecalendar.ordinal_to_ymd(hdatecalendar.MAX_PYTHON_ORDINAL + 1) == (10000, 1, 1)
+    assert hdateutils.to_ymd(hdatecalendar.MAX_PYTHON_ORDINAL + 1) == (10000, 1, 1)
+
+    hd = hdate.HDate("25 Dec 12000")
+    assert hd.pdates["mid"] is None and hd.pdates["slmid"] == "d"
+    assert hdatecalendar.ordinal_to_ymd(hd.pdates["ordinal_mid"]) == (12000, 12, 25)
+    hd = hdate.HDate("circa 9999")
+    assert hd.pdates["mid"] == datetime.date(9999, 6, 15) and hd.pdates["late"] is None
+    assert hdate.HDate("29 Feb 1700").pdates is None
+    assert hdate.HDate("0").pdates is None
+
+def test_days_in_month():
+    hd = hdate.HDate("1066")
+    assert hd.max_day_in_month(1700, 2) == 29 and hd.max_day_in_month(1700, 2, proleptic_gregorian=True) == 28
+    assert hdatecalendar.days_in_month(1800, 2) == 28 and hdatecalendar.days_in_month(5, 2, calendar="bc") == 29
+
+def test_years():
+    assert hdateutils.to_years(0) == 0.0 and hdateutils.to_years(-366) == -1.0
+    assert hdateutils.to_years("31 Dec 1066") == 1066.0 and hdateutils.to_years("1 Jan 1067") == 1066 + 1 / 365
+    assert hdateutils.to_years(-365) == -1 + 1 / 366       # 1st January 1BC, a leap year
+    for _ in range(20000):
+        ordinal = random.randint(-365 * 2500, 365 * 2500)
+        assert hdateutils.years_to_ordinal(hdateutils.to_years(ordinal)) == ordinal
+    assert hdateutils.years_to_ordinal(1066.25) == hdateutils.to_ordinal("1 Apr 1067")
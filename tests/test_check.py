@@ -0,0 +1,58 @@
+import datetime
+
+import sys
+sys.path.insert(0,"./historicaldate") # in case this is run when a submodule
+
+from historicaldate import hdate
+from historicaldate import hdatecheck
+from historicaldate import hdatecontext
+from historicaldate import hdateparser
+from utils_for_tests import random_strings
+
+def test_check_agrees_with_hdate():
+    ctx = hdatecontext.HDateContext(today=datetime.date(2000, 1, 1))
+    for dateformat in (None, "dmy", "mdy"):
+        for s in random_strings(2000):
+            result = hdatecheck.check(s, dateformat=dateformat, context=ctx)
+            try:
+                pdates = hdate.HDate(s, dateformat=dateformat, context=ctx).pdates
+            except ValueError:
+                assert result.error in {"no_match", "prepost_month", "bc_early_without_calendar"}, s
+                assert result.hdate is None
+                continue
+            if pdates is None and s.strip():
+                assert result.error in {"day_out_of_range", "year_out_of_range"}, s
+                assert result.hdate is None and result.position is not None
+            else:
+                assert result.error == "" and result.position is None, s
+                assert result.hdate.pdates == pdates and result.hdate.input == s
+
+def test_errors_and_positions():
+    cases = [("1066", "", None), ("  31 Feb 1066", "day_out_of_range", 2), ("sometime in 1066", "no_match", 0),
+             ("1066??", "no_match", 4), ("1066 and and 1070", "no_match", None),
+             ("Dec 1066-12", "prepost_month", 9), ("between 50 BC and 10", "bc_early_without_calendar", 11),
+             ("0", "year_out_of_range", 0), ("before Feb 1700", "day_out_of_range", 7),
+             ("between 1 Jan 1066 and 30 Feb 1067", "day_out_of_range", 23), ("", "", None)]
+    for s, error, position in cases:
+        result = hdatecheck.check(s)
+        assert (result.error, result.position) == (error, position), s
+        assert (result.hdate is None) == bool(error)
+    # -- The context can make a date valid
+    assert hdatecheck.check("before Feb 1700", context=hdatecontext.HDateContext(proleptic_gregorian=True)).error == ""
+    assert hdatecheck.check("", missingasongoing=True).hdate.pdates["slmid"] == "o"
+    assert hdatecheck.check("12/25/1066", dateformat="mdy").hdate.pdates["mid"] == datetime.date(1066, 12, 25)
+    assert hdatecheck.check("12/25/1066", dateformat="dmy").error == "no_match"
+    assert hdatecheck.ERRORS[hdatecheck.ERROR_CODES["year_out_of_range"]] == "year_out_of_range"
+
+def test_check_many():
+    parser = hdateparser.HDateParser()
+    strings = ["1066", "sometime", "1066", "31 Feb 1066", "", "sometime"]
+    results = hdatecheck.check_many(strings, parser=parser)
+    codes = hdatecheck.ERROR_CODES
+    assert results.codes == [0, codes["no_match"], 0, codes["day_out_of_range"], 0, codes["no_match"]]
+    assert results.positions == [None, 0, None, 0, None, 0]
+    assert [hd is None for hd in results.hdates] == [False, True, False, True, False, True]
+    assert results.hdates[0] is not results.hdates[2] and results.hdates[0].pdates == results.hdates[2].pdates
+    assert results.hdates[2].parser is parser    # copies keep the parser, and so its context
+    # -- Each distinct string is parsed once
+    assert sum(parser.counters.values()) == 4
@@ -0,0 +1,37 @@
+import datetime
+
+import sys
+sys.path.insert(0,"./historicaldate") # in case this is run when a submodule
+
+from historicaldate import hdate
+
+def test_slots():
+    hd = hdate.HDate("25 Dec 1066")
+    assert not hasattr(hd, "__dict__")
+    assert hd._pdates is None and hd._d_parsed is None and hd._re_parsed is None
+    assert hd.pdates["mid"] == datetime.date(1066, 12, 25)
+    assert hd.d_parsed["midyear"] == 1066 and hd.re_parsed["midpremon"] == "Dec"
+
+def test_lazy_pdates():
+    for s in ["circa 1200", "between 10BC and 100AD", "before 3 BC", "circa 2 BC", "Dec 1066", "circa"]:
+        hd = hdate.HDate(s)
+        expected = hdate.HDate(s).pdates
+        hd._d_parsed = hd.d_parsed
+        hd._convert_to_python_date_naive()
+        assert hd.pdates == expected
+    assert hdate.HDate("between 10BC and 100AD").pdates["mid"] is None
+    assert hdate.HDate("29 Feb 1700").pdates is None
+
+    # -- pdates, once built, is kept
+    hd = hdate.HDate("1066")
+    assert hd.ordinals == (388984, 389149, 389348) and hd._pdates is None   # not built by ordinals
+    hd.pdates["ordinal_mid"] = 0
+    assert hd.pdates["ordinal_mid"] == 0 and hd.ordinals == (388984, 0, 389348)
+    assert hdate.HDate("29 Feb 1700").ordinals == (None, None, None)
+
+def test_blank():
+    hd = hdate.HDate("")
+    assert hd.pdates is None and hd.d_parsed is None
+    assert not hasattr(hd, "re_parsed")
+    hd = hdate.HDate("", missingasongoing=True)
+    assert hd.pdates["slmid"] == "o" and hd.d_parsed["ongoing"] and hd.re_parsed["ongoing"] == "ongoing"
@@ -0,0 +1,83 @@
+import datetime
+import pickle
+
+import sys
+sys.path.insert(0,"./historicaldate") # in case this is run when a submodule
+
+from historicaldate import hdate
+from historicaldate import hdatecache
+from historicaldate import hdatecontext
+from historicaldate import hdateparser
+from historicaldate import hdateutils
+from utils_for_tests import expect_valueerror
+
+def test_context():
+    ctx = hdatecontext.HDateContext(today=datetime.date(2000, 1, 1), circa_days=100, proleptic_gregorian=True)
+    assert ctx.fixed and ctx.ordinal_today() == datetime.date(2000, 1, 1).toordinal()
+    assert not hdatecontext.DEFAULT_CONTEXT.fixed
+    assert hdatecontext.DEFAULT_CONTEXT.ordinal_today() == datetime.date.today().toordinal()
+    assert hdatecontext.context_for_today().today == datetime.date.today()
+
+    # -- Immutable and hashable
+    try:
+        ctx.circa_days = 5
+        assert False, "context was changed"
+    except AttributeError:
+        pass
+    assert ctx.replace(circa_days=100) == ctx and hash(ctx.replace(circa_days=100)) == hash(ctx)
+    assert ctx.replace(circa_days=50) != ctx and ctx.replace(circa_days=50).today == ctx.today
+    assert pickle.loads(pickle.dumps(ctx)) == ctx
+
+    try:
+        hdatecontext.HDateContext(today="2000-01-01")
+        assert False, "TypeError not raised"
+    except TypeError:
+        pass
+    try:
+        hdatecontext.HDateContext(circa_days=-1)
+        assert False, "ValueError not raised"
+    except ValueError:
+        pass
+
+def test_dates_with_context():
+    ctx = hdatecontext.HDateContext(today=datetime.date(2000, 1, 1), circa_days=100, proleptic_gregorian=True)
+    today = datetime.date(2000, 1, 1).toordinal()
+
+    pdates = hdate.HDate("ongoing", context=ctx).pdates
+    assert (pdates["ordinal_early"], pdates["ordinal_mid"], pdates["ordinal_late"]) == (today, today, today + 100)
+    assert hdate.HDate("", missingasongoing=True, context=ctx).pdates["ordinal_late"] == today + 100
+
+    # -- Circa width, unless a length is given
+    mid = hdateutils.to_ordinal("1066")
+    pdates = hdate.HDate("circa 1066", context=ctx).pdates
+    assert (pdates["ordinal_early"], pdates["ordinal_late"]) == (mid - 100, mid + 100)
+    assert hdate.HDate("circa10d 1066", context=ctx).pdates["ordinal_early"] == mid - 10
+    assert hdate.HDate("circa 1066").pdates["ordinal_early"] == mid - int(5 * 365.25)
+
+    # -- Calendar for the last day of February 1700
+    assert hdate.HDate("Feb 1700").pdates is None
+    assert hdate.HDate("Feb 1700", context=ctx).pdates["late"] == datetime.date(1700, 2, 28)
+
+    # -- hdateutils functions, and a parser's context
+    assert hdateutils.to_ordinal("ongoing", context=ctx) == today
+    assert hdateutils.calc_mid_ordinal("ongoing", context=ctx) == today
+    assert hdateutils.to_ymd("ongoing", context=ctx) == (2000, 1, 1)
+    assert hdateutils.to_years("ongoing", context=ctx) == 1999 + 1 / 366
+    parser = hdateparser.HDateParser(context=ctx)
+    assert hdate.HDate("ongoing", parser=parser).pdates["ordinal_mid"] == today
+    assert hdate.HDate("ongoing", parser=parser, context=hdatecontext.DEFAULT_CONTEXT).pdates["mid"] == datetime.date.today()
+    expect_valueerror("not a date")
+
+def test_cache_with_context():
+    ctx = hdatecontext.HDateContext(today=datetime.date(2000, 1, 1))
+    hdatecache.enable_cache(maxsize=100)
+    try:
+        # -- Each context has its own entries, and 'ongoing' is stored for a fixed today
+        assert hdate.HDate("circa 1066", context=ctx.replace(circa_days=10)).pdates["ordinal_late"] == \
+                    hdateutils.to_ordinal("1066") + 10
+        assert hdate.HDate("circa 1066").pdates["ordinal_late"] == hdateutils.to_ordinal("1066") + int(5 * 365.25)
+        hdate.HDate("ongoing", context=ctx)
+        assert hdatecache.active_cache.get(("ongoing", None, False, ctx)).pdates[1] == datetime.date(2000, 1, 1).toordinal()
+        assert hdate.HDate("ongoing", context=ctx).pdates["mid"] == datetime.date(2000, 1, 1)
+    finally:
+        hdatecache.disable_cache()
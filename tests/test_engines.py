@@ -0,0 +1,60 @@
+import random
+
+import sys
+sys.path.insert(0,"./historicaldate") # in case this is run when a submodule
+
+from historicaldate import hdate
+from historicaldate import hdateparser
+
+# -- Strings from the other tests, and some awkward ones
+corpus = ["25 Dec 1066", "25th Dec 1066", "166", "1066", "june 1066", "24 june 1066", "24 Jun 1066",
+          "circa 1066-6-24", "c. 1066-6-24", "1066 bce", "1483 earliest 1428 latest 1486 ce",
+          "1483 after 1428 before 1486", "after 1428 before 1486", "circa2y 25 Dec 1066", "ongoing",
+          "Between 1 and 100", "c. 1578", "487 bc", "12 July 100 BC", "12 July 100BCe", "c. 287BC",
+          "Between 500BC and 400BC", "Between 500 and 400BC", "Before 400BC", "Between 27BC and 14AD",
+          "25/12/1066", "12/25/1066", "1066-12-25", "25 Dec, 1066", "Dec 25, 1066", "circa2y 25/12/1066",
+          "circa2y 12/25/1066", "Dec 1066", "ca 1066", "c1066", "c 2y 1066", "c123456789", "1066bcand 1070",
+          "1066 bceearliest 1000", "circajan 1066", "Dec 12 bc", "1/2/1066", "12 1066", "5/1066", "c/1066",
+          "25 Dec 1066-12", "1066-13", "ONGOING", "Circa 1066", "about 1066", "estimated 1066",
+          "early 12th century", "unknown", "1066?", "n/a", "between 1066 and", "1066 or 1067", "1950s",
+          "c1066-1070", "25 déc 1066", "K"]
+
+def test_corpus():
+    for dateformat in (None, "dmy", "mdy"):
+        rx = hdateparser.HDateParser(dateformat)
+        tk = hdateparser.HDateParser(dateformat, engine="tokenizer")
+        for s in corpus:
+            assert rx.match(s) == tk.match(s), f"Engines differ on '{s}', dateformat={dateformat}"
+
+def test_random():
+    "Strings assembled at random from pieces of the grammar"
+    pieces = ["circa", "c", "c.", "about", "2y", "10d", "25", "1", "12", "06", "0", "13", "1066", "99999999",
+              "dec", "june", "jun", "sept", "bc", "bce", "ad", "ce", "earliest", "after", "between", "latest",
+              "before", "and", "st", "th", "/", "-", ",", ".", "?", " ", "x", "y", "d"]
+    rnd = random.Random(1066)
+    for dateformat in (None, "dmy", "mdy"):
+        rx = hdateparser.HDateParser(dateformat)
+        tk = hdateparser.HDateParser(dateformat, engine="tokenizer")
+        for _ in range(5000):
+            s = "".join(rnd.choice(pieces) + rnd.choice(["", " "]) for _ in range(rnd.randint(1, 6))).strip()
+            if s:
+                assert rx.match(s) == tk.match(s), f"Engines differ on '{s}', dateformat={dateformat}"
+
+def test_hdate():
+    parser = hdateparser.get_parser(engine="tokenizer")
+    for s in ["25 Dec 1066", "Between 27BC and 14AD", "circa2y 25 Dec 1066", "after 1428 before 1486"]:
+        assert hdate.HDate(s, parser=parser).pdates == hdate.HDate(s).pdates
+
+def test_bad_engine():
+    try:
+        hdateparser.HDateParser(engine="lalr")
+        assert False, "Unknown engine has not raised a ValueError"
+    except ValueError:
+        pass
+
+def test_rejects():
+    "Strings rejected before the regular expression is tried"
+    from historicaldate import hdatetokens
+    assert [s for s in corpus if hdatetokens.rejects(s)] == \
+        ["early 12th century", "unknown", "1066?", "n/a", "1066 or 1067", "1950s"]
+    assert not hdatetokens.rejects("c?1066") and not hdatetokens.rejects("25 déc 1066")
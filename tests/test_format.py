@@ -0,0 +1,79 @@
+import datetime
+import random
+
+import sys
+sys.path.insert(0,"./historicaldate") # in case this is run when a submodule
+
+import pytest
+
+from historicaldate import hdate
+from historicaldate import hdatecontext
+from historicaldate import hdateformat
+from historicaldate import hdateutils
+from utils_for_tests import random_strings
+
+KEYS = ("ordinal_early", "ordinal_mid", "ordinal_late", "slearly", "slmid", "sllate")
+PARSE_DATEFORMATS = {"dmy": (None, "dmy"), "mdy": ("mdy",), "iso": (None, "dmy", "mdy")}
+
+def dates(pdates):
+    return None if pdates is None else tuple(pdates[key] for key in KEYS)
+
+def test_round_trip():
+    ctx = hdatecontext.HDateContext(today=datetime.date(2000, 1, 1))
+    for s in random_strings(3000, seed=2) + ["ongoing", "between 50 BC and 10 AD", "44 BC earliest 50 BC"]:
+        try:
+            pdates = hdate.HDate(s, context=ctx).pdates
+        except ValueError:
+            continue
+        for style, dateformats in PARSE_DATEFORMATS.items():
+            formatted = hdateformat.format_pdates(pdates, style=style, context=ctx)
+            for dateformat in dateformats:
+                assert dates(hdate.HDate(formatted, dateformat=dateformat, context=ctx).pdates) == dates(pdates), \
+                    (s, formatted, dateformat)
+
+def test_format_pdates():
+    cases = [("25 Dec 1066", "25 Dec 1066", "Dec 25, 1066", "1066-12-25"),
+             ("Dec 1066", "Dec 1066", "1066-12", "1066-12"),
+             ("c.1066", "circa 1066", "circa 1066", "circa 1066"),
+             ("circa3m 25 dec 1066", "circa3m 25 Dec 1066", "circa3m Dec 25, 1066", "circa3m 1066-12-25"),
+             ("Between 500BC and 400BC", "between 500 BC and 400 BC", "between 500 BC and 400 BC", "between 500 BC and 400 BC"),
+             ("between 1 Jan 1066 and Dec 1066", "between 1 Jan 1066 and Dec 1066", "between Jan 1, 1066 and 1066-12",
+              "between 1066-01-01 and 1066-12"),
+             ("44 BC earliest 50BC latest 12 Mar 40 BC", "44 BC earliest 50 BC latest 12 Mar 40 BC",
+              "44 BC earliest 50 BC latest Mar 12, 40 BC", "44 BC earliest 50 BC latest 40-03-12 BC"),
+             ("after 1066", "after 1066", "after 1066", "after 1066"),
+             ("c10y before 1066", "circa10y before 1066", "circa10y before 1066", "circa10y before 1066"),
+             ("circa 1066 earliest 1060", "circa 1066 earliest 1060", "circa 1066 earliest 1060", "circa 1066 earliest 1060"),
+             ("ongoing", "ongoing", "ongoing", "ongoing"), ("circa", "circa", "circa", "circa"), ("", "", "", "")]
+    for s, *expected in cases:
+        pdates = hdate.HDate(s).pdates
+        assert [hdateformat.format_pdates(pdates, style) for style in hdateformat.STYLES] == expected, s
+        assert hdate.HDate(expected[0]) == hdate.HDate(s)
+    # -- A BC early date cannot be written with 'after', and 'circa' ranges are written to suit the context
+    assert hdateformat.format_pdates(hdate.HDate("circa 45 BC earliest 50 BC").pdates) == "circa 45 BC earliest 50 BC"
+    ctx = hdatecontext.HDateContext(circa_days=100)
+    assert hdateformat.format_pdates(hdate.HDate("circa 1066").pdates, context=ctx) == "circa5y 1066"
+    assert hdateformat.format_pdates(hdate.HDate("circa 1066", context=ctx).pdates, context=ctx) == "circa 1066"
+    assert hdateformat.format_pdates(hdate.HDate("circa 1066", context=ctx).pdates) == "circa100d 1066"
+
+def test_format_errors():
+    pdates = hdate.HDate("circa 1066").pdates
+    with pytest.raises(ValueError):
+        hdateformat.format_pdates(pdates, style="ymd")
+    with pytest.raises(ValueError):
+        hdateformat.format_pdates(dict(pdates, ordinal_late=pdates["ordinal_late"] + 1))
+    with pytest.raises(ValueError):
+        hdateformat.format_date(1, speclevel="c")
+    with pytest.raises(ValueError):
+        hdateformat.format_pdates(dict(pdates, ordinal_mid=None))
+
+def test_format_date():
+    assert hdateformat.format_date(389342) == "25 Dec 1066"
+    assert hdateformat.format_date(-15997, "y") == "44 BC"
+    assert hdateformat.format_date(389342, "m", style="mdy", show_ad=True) == "1066-12 AD"
+    rng = random.Random(1)
+    for _ in range(2000):
+        ordinal = rng.randint(-365 * 2500, 365 * 2500)
+        for style, dateformats in PARSE_DATEFORMATS.items():
+            s = hdateformat.format_date(ordinal, style=style)
+            assert all(hdateutils.calc_mid_ordinal(s, dateformat=dateformat) == ordinal for dateformat in dateformats), s
@@ -0,0 +1,91 @@
+import sys
+sys.path.insert(0,"./historicaldate") # in case this is run when a submodule
+
+import pytest
+np = pytest.importorskip("numpy")
+
+from historicaldate import hdate
+from historicaldate import hdatearray
+from historicaldate import hdateformat
+from historicaldate import hdateutils
+from utils_for_tests import random_strings
+
+def test_parse_many():
+    strings = ["25 Dec 1066", "circa 1200", "Between 500BC and 400BC", "", "circa 1200",
+               "31 Feb 1066", "not a date", "1066-12-25", "after 1500 before 1600", "25 Dec 1066"]
+    cols = hdatearray.parse_many(strings)
+    assert len(cols.valid) == len(strings)
+    assert cols.ordinal_mid.dtype == np.int64 and cols.slmid.dtype == np.uint8
+    assert list(cols.valid) == [True, True, True, False, True, False, False, True, True, True]
+    for i, s in enumerate(strings):
+        if cols.valid[i]:
+            pdates = hdate.HDate(s).pdates
+            for which in ("early", "mid", "late"):
+                assert getattr(cols, f"ordinal_{which}")[i] == pdates[f"ordinal_{which}"]
+                assert hdatearray.SPECLEVELS[getattr(cols, f"sl{which}")[i]] == pdates[f"sl{which}"]
+        else:
+            assert cols.ordinal_mid[i] == 0 and cols.slmid[i] == 0
+
+def test_parse_many_options():
+    cols = hdatearray.parse_many(iter(["Dec 25 1066", "12/25/1066"]), dateformat="mdy")
+    assert cols.valid.all() and cols.ordinal_mid[0] == cols.ordinal_mid[1] == hdate.HDate("1066-12-25").pdates["ordinal_mid"]
+    cols = hdatearray.parse_many(["", "1066"], missingasongoing=True)
+    assert cols.valid.all() and hdatearray.SPECLEVELS[cols.slmid[0]] == "o"
+    cols = hdatearray.parse_many([])
+    assert len(cols.valid) == 0 and cols.ordinal_early.dtype == np.int64
+
+def test_parse_many_errors():
+    errors = []
+    cols = hdatearray.parse_many(["1066", "not a date", "31 Feb 1066", "1066", "not a date"], errors=errors)
+    assert [row for row, _ in errors] == [1, 2, 4]
+    assert errors[0][1] == errors[2][1] == "Illegal date format: not a date"
+    assert list(cols.valid) == [True, False, False, True, False]
+
+def test_parse_many_parallel():
+    strings = [f"circa {1000 + i % 37}" for i in range(500)] + ["bad"] + [f"{1 + i % 28} Mar {i} BC" for i in range(1, 300)]
+    errors0 = []
+    cols0 = hdatearray.parse_many(strings, errors=errors0)
+    for workers, chunksize in ((1, 1000), (1, 7), (2, 64)):
+        errors = []
+        cols = hdatearray.parse_many_parallel(strings, errors=errors, workers=workers, chunksize=chunksize)
+        assert errors == errors0
+        for a, b in zip(cols, cols0):
+            assert a.dtype == b.dtype and np.array_equal(a, b)
+    cols = hdatearray.parse_many_parallel(iter([]), workers=2)
+    assert len(cols.valid) == 0
+    with pytest.raises(ValueError):
+        hdatearray.parse_many_parallel(strings, workers=0)
+
+def test_to_ymd():
+    ordinals = np.concatenate([np.random.randint(-365 * 2500, 365 * 2500, 20000), np.arange(-1500, 1500),
+                               [hdateutils.to_ordinal("29 Feb 5 BC"), 3652059]])
+    ymd = hdatearray.to_ymd(ordinals)
+    assert ymd.year.dtype == np.int64 and ymd.year.shape == ordinals.shape
+    for i, ordinal in enumerate(ordinals):
+        assert hdateutils.to_ymd(int(ordinal)) == (ymd.year[i], ymd.month[i], ymd.day[i])
+    assert isinstance(hdatearray.to_ymd([0, 1]), hdateutils.YMD)
+    assert [list(a) for a in hdatearray.to_ymd([0, 1])] == [[-1, 1], [12, 1], [31, 1]]
+
+def test_to_years():
+    ordinals = np.concatenate([np.random.randint(-365 * 2500, 365 * 2500, 20000), np.arange(-1500, 1500)])
+    years = hdatearray.to_years(ordinals)
+    assert years.dtype == np.float64
+    for i, ordinal in enumerate(ordinals[::10]):
+        assert hdateutils.to_years(int(ordinal)) == years[10 * i]
+    assert np.array_equal(hdatearray.years_to_ordinal(years), ordinals)
+    assert list(hdatearray.to_years([0, 1, 365, -365])) == [0.0, 1 / 365, 1.0, -1 + 1 / 366]
+    assert list(hdatearray.years_to_ordinal([0.0, -1.0, 1066.0])) == [0, -366, hdateutils.to_ordinal("31 Dec 1066")]
+
+def test_format_many():
+    strings = random_strings(3000, seed=3) + ["ongoing"]
+    cols = hdatearray.parse_many(strings)
+    for style in hdateformat.STYLES:
+        formatted = hdatearray.format_many(cols, style=style)
+        assert len(formatted) == len(strings)
+        for i, s in enumerate(strings):
+            expected = hdateformat.format_pdates(hdate.HDate(s).pdates, style=style) if cols.valid[i] else ""
+            assert formatted[i] == expected, s
+    back = hdatearray.parse_many(hdatearray.format_many(cols))
+    assert all(np.array_equal(a[cols.valid], b[cols.valid]) for a, b in zip(cols, back))
+    assert hdatearray.format_many(hdatearray.parse_many([])) == []
+    assert hdatearray.format_many(hdatearray.parse_many(["circa", "c.1066"])) == ["", "circa 1066"]
@@ -0,0 +1,73 @@
+import sys
+sys.path.insert(0,"./historicaldate") # in case this is run when a submodule
+
+import pytest
+np = pytest.importorskip("numpy")
+
+from historicaldate import hdatearray
+from historicaldate import hdatedensity
+from historicaldate import hdateutils
+
+def random_intervals(n, seed=1):
+    rng = np.random.default_rng(seed)
+    early = rng.integers(-3000, 3000, n)
+    late = early + rng.choice([0, 1, 5, 40, 400, 4000], n)
+    return early, late
+
+def test_year_edges():
+    edges = hdatedensity.year_edges(-20, 19, 10)
+    assert list(edges) == [hdateutils.to_ordinal(s) for s in ("1 Jan 20 BC", "1 Jan 10 BC", "1 Jan 1", "1 Jan 11", "1 Jan 21")]
+    assert list(hdatedensity.year_edges(1066, 1066)) == [hdateutils.to_ordinal("1 Jan 1066"), hdateutils.to_ordinal("1 Jan 1067")]
+    assert list(hdatedensity.year_edges(-1, 1)) == [-365, 1, 366]
+    assert len(hdatedensity.year_edges(1001, 2000, 100)) == 11 and len(hdatedensity.year_edges(1001, 2001, 100)) == 12
+    with pytest.raises(ValueError):
+        hdatedensity.year_edges(0, 10)
+
+def histogram_loop(early, late, edges, weights):
+    result = np.zeros(len(edges) - 1)
+    for e, l, w in zip(early, late, weights):
+        days = np.arange(e, l + 1)
+        bins = np.searchsorted(edges, days, side="right") - 1
+        inside = (bins >= 0) & (bins < len(result))
+        np.add.at(result, bins[inside], w / len(days))
+    return result
+
+def test_histogram():
+    early, late = random_intervals(3000)
+    weights = np.random.default_rng(2).random(len(early))
+    # -- Bins looked up in a table of days, and found by binary search where they cover many more days
+    for edges in (np.array([-2000, -1999, -1000, -365, 1, 2, 500, 2500]), np.array([-10 ** 8, -1000, 1, 3000, 10 ** 8])):
+        expected = histogram_loop(early, late, edges, weights)
+        assert np.allclose(hdatedensity.histogram(early, late, edges, weights=weights), expected)
+    edges = np.array([-2000, -1999, -1000, -365, 1, 2, 500, 2500])
+    # -- All of the weight is counted when the bins cover every day
+    assert np.isclose(hdatedensity.histogram(early, late, [-5000, 0, 10000]).sum(), len(early))
+
+    mid = (early + late) // 2
+    result = hdatedensity.histogram(early, late, edges, weighting="mid", mid=mid)
+    assert list(result) == [np.sum((mid >= edges[i]) & (mid < edges[i + 1])) for i in range(len(edges) - 1)]
+
+    with pytest.raises(ValueError):
+        hdatedensity.histogram(early, late, edges, weighting="mid")
+    with pytest.raises(ValueError):
+        hdatedensity.histogram(late, early, edges)
+    with pytest.raises(ValueError):
+        hdatedensity.histogram(early, late, [10, 5])
+
+def test_histogram_of_hdates():
+    cols = hdatearray.parse_many(["25 Dec 1066", "1066", "circa 1066", "between 44 BC and 10 AD"])
+    result = hdatedensity.histogram(cols.ordinal_early, cols.ordinal_late, hdatedensity.year_edges(-50, 1100, 50))
+    assert np.isclose(result.sum(), 4) and result[-1] == 3.0     # 1051-1100
+    assert np.isclose(result[0], 44 / 54, atol=1e-3)             # 50BC-1BC
+
+def test_active_counts():
+    early, late = random_intervals(2000)
+    step = hdatedensity.active_counts(early, late)
+    days = np.arange(-3100, 7200)
+    expected = np.array([np.sum((early <= day) & (late >= day)) for day in days])
+    assert np.array_equal(hdatedensity.count_active(early, late, days), expected)
+    positions = np.searchsorted(step.ordinals, days, side="right") - 1
+    assert np.array_equal(np.where(positions >= 0, step.counts[positions], 0), expected)
+    assert step.counts[-1] == 0 and np.all(np.diff(step.counts) != 0) and np.all(np.diff(step.ordinals) > 0)
+    assert [list(a) for a in hdatedensity.active_counts([1, 3], [2, 4])] == [[1, 5], [1, 0]]
+    assert [list(a) for a in hdatedensity.active_counts([], [])] == [[], []]
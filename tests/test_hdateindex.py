@@ -0,0 +1,76 @@
+import sys
+sys.path.insert(0,"./historicaldate") # in case this is run when a submodule
+
+import pytest
+np = pytest.importorskip("numpy")
+
+from historicaldate import hdate
+from historicaldate import hdateindex
+from historicaldate import hdateutils
+
+def test_queries():
+    "Against a linear scan, with intervals both bulk loaded and added one at a time"
+    rng = np.random.default_rng(1)
+    n = 5000
+    early = rng.integers(-365 * 2500, 365 * 2500, n)
+    late = early + rng.choice([0, 1, 30, 365, 3652, 36524], n)
+    index = hdateindex.HDateIndex.from_ordinals(early[:3000], late[:3000])
+    for e, l in zip(early[3000:], late[3000:]):
+        index.add_ordinals(e, l)
+    assert len(index) == n
+    for start in rng.integers(-365 * 2600, 365 * 2600, 300).tolist():
+        end = start + int(rng.integers(0, 365 * 50))
+        assert np.array_equal(index.overlapping(start, end), np.flatnonzero((early <= end) & (late >= start)))
+        assert np.array_equal(index.within(start, end), np.flatnonzero((early >= start) & (late <= end)))
+        assert np.array_equal(index.at(start), np.flatnonzero((early <= start) & (late >= start)))
+        assert index.count_overlapping(start, end) == ((early <= end) & (late >= start)).sum()
+        distance = np.maximum(np.maximum(early - start, start - late), 0)
+        assert distance[index.nearest(start)] == distance.min()
+
+def test_hdates():
+    hds = [hdate.HDate(s) for s in ["1066", "circa 1200", "29 Feb 1700", "Between 500BC and 400BC", "1215-06-15"]]
+    index = hdateindex.HDateIndex(hds)
+    assert len(index) == 4
+    assert list(index.at("1 Jul 1066")) == [0]
+    assert list(index.overlapping("1190", "1220")) == [1, 4]
+    assert list(index.within("1200", "1300")) == [4]
+    assert list(index.within(hdateutils.to_ordinal("600 BC"), 0)) == [3]
+    assert index.nearest("1500") == 4 and index.nearest(hdateutils.to_ordinal("450 BC")) == 3
+    assert index.add(hdate.HDate("4 Jul 1776")) == 5 and list(index.at("4 Jul 1776")) == [5]
+
+def test_empty():
+    index = hdateindex.HDateIndex()
+    assert len(index) == 0 and index.nearest(0) is None
+    assert len(index.overlapping(0, 1000)) == 0 and index.count_overlapping(0, 1000) == 0
+    with pytest.raises(ValueError):
+        index.add_ordinals([10, 20], [5, 30])
+
+def test_join():
+    "Against all pairs"
+    rng = np.random.default_rng(2)
+    def intervals(n):
+        early = rng.integers(0, 365 * 500, n)
+        return early, early + rng.choice([0, 3, 30, 365, 3652], n)
+    left, right = intervals(700), intervals(900)
+    le, re = left[0][:, np.newaxis], right[0][np.newaxis, :]
+    ll, rl = left[1][:, np.newaxis], right[1][np.newaxis, :]
+    for predicate, days, matrix in [
+            ("possibly_overlaps", 0, (le <= rl) & (re <= ll)),
+            ("definitely_overlaps", 0, ((re <= le) & (ll <= rl)) | ((le <= re) & (rl <= ll))),
+            ("definitely_before", 0, ll < re),
+            ("within_days", 100, (le <= rl + 100) & (re <= ll + 100))]:
+        left_ids, right_ids = hdateindex.join(left, right, predicate, days=days)
+        expected = np.nonzero(matrix)
+        assert np.array_equal(left_ids, expected[0]) and np.array_equal(right_ids, expected[1]), predicate
+        chunks = list(hdateindex.iter_join(left, right, predicate, days=days, chunksize=97))
+        assert sum(len(chunk[0]) for chunk in chunks) == len(expected[0])
+
+def test_join_hdates():
+    reigns = [hdate.HDate(s) for s in ["between 1066 and 1087", "between 1087 and 1100", "29 Feb 1700"]]
+    battles = [hdate.HDate(s) for s in ["14 Oct 1066", "circa 1090", "1346"]]
+    left_ids, right_ids = hdateindex.join(battles, reigns)
+    assert list(zip(left_ids, right_ids)) == [(0, 0), (1, 0), (1, 1)]
+    assert list(zip(*hdateindex.join(battles, reigns, "definitely_overlaps"))) == [(0, 0)]
+    assert list(zip(*hdateindex.join(reigns, battles, "definitely_before"))) == [(0, 2), (1, 2)]
+    with pytest.raises(ValueError):
+        hdateindex.join(battles, reigns, "sometime")
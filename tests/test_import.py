@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_python(*args):
+    "Run python in a new process, from a directory outside the package, returning (stdout, stderr)"
+    env = dict(os.environ, PYTHONPATH=PACKAGE_ROOT)
+    result = subprocess.run([sys.executable, *args], cwd=os.path.dirname(PACKAGE_ROOT), env=env,
+                            capture_output=True, text=True, check=True)
+    return result.stdout, result.stderr
+
+def test_import_side_effects():
+    "Importing the package does not change sys.path, compile regular expressions, or import numpy or optional modules"
+    stdout, _ = run_python("-c", "import sys; path = list(sys.path); before = set(sys.modules); import historicaldate; "
+                                 "print(sys.path == path); print(not historicaldate.hdateparser._parsers); "
+                                 "print(' '.join(sorted(set(sys.modules) - before)))")
+    unchanged, no_parsers, modules = stdout.splitlines()
+    assert unchanged == "True" and no_parsers == "True"
+    modules = set(modules.split())
+    assert not modules & {"numpy", "csv", "mmap", "historicaldate.hdatetokens", "historicaldate.hdatearray"}
+    assert not any(module.startswith("hdate") for module in modules)
+
+def test_import_time():
+    "Measured with -X importtime; a loose limit, to catch large regressions"
+    _, stderr = run_python("-X", "importtime", "-c", "import historicaldate")
+    line = [line for line in stderr.splitlines() if line.endswith("| historicaldate")][-1]
+    cumulative_us = int(line.split("|")[1])
+    assert cumulative_us < 200000, line
+
+def test_exports():
+    import historicaldate
+    assert historicaldate.to_ymd(1) == (1, 1, 1) and historicaldate.HDate("1066").pdates is not None
+    assert not hasattr(historicaldate, "sys") and not hasattr(historicaldate, "math")
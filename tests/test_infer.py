@@ -0,0 +1,55 @@
+import itertools
+import sys
+sys.path.insert(0,"./historicaldate") # in case this is run when a submodule
+
+from historicaldate import hdate
+from historicaldate import hdateinfer
+
+def test_infer_dateformat():
+    guess = hdateinfer.infer_dateformat(["25 Dec 1066", "1066-12-25", "circa 1200", "", "25 Dec 1066"])
+    assert (guess.dateformat, guess.confidence, guess.match_rate) == (None, 1.0, 1.0)
+    assert guess.counts == {None: 3, "dmy": 3, "mdy": 2}
+
+    guess = hdateinfer.infer_dateformat(["25/12/1066", "13/1/1500", "03/04/1900", "1066"])
+    assert (guess.dateformat, guess.confidence) == ("dmy", 2 / 3)
+    guess = hdateinfer.infer_dateformat(["12/25/1066", "Dec 25, 1066", "03/04/1900"])
+    assert (guess.dateformat, guess.confidence, guess.counts["mdy"]) == ("mdy", 2 / 3, 3)
+    assert guess.parser.dateformat == "mdy"
+
+    # -- All ambiguous, mixed, or nothing to go on
+    assert hdateinfer.infer_dateformat(["03/04/1900", "05/06/1901"])[:2] == ("dmy", 0.0)
+    assert hdateinfer.infer_dateformat(["25/12/1066", "12/25/1066"])[:3] == ("dmy", 0.5, 0.5)
+    assert hdateinfer.infer_dateformat(["", "sometime"])[:3] == (None, 0.0, 0.0)
+    assert hdateinfer.infer_dateformat([])[:3] == (None, 0.0, 0.0)
+
+def test_sample():
+    # -- Only the sample is read
+    strings = iter(["25/12/1066"] * 10 + ["12/25/1066", "", "1/1/1900"] + ["12/25/1066"] * 10)
+    guess = hdateinfer.infer_dateformat(strings, sample_size=2)
+    assert guess.dateformat == "dmy" and next(strings) == ""
+
+    strings = ["1066"] * 5 + ["12/25/1066", "12/24/1066"] * 3
+    guess, it = hdateinfer.infer_from_stream(iter(strings), sample_size=3)
+    assert guess.dateformat == "mdy" and guess.confidence == 1.0
+    assert list(it) == strings
+    parsed = [hdate.HDate(s, parser=guess.parser) for s in strings]
+    assert parsed[5].pdates["ordinal_mid"] == hdate.HDate("25 Dec 1066").pdates["ordinal_mid"]
+
+def test_max_rows():
+    "Few distinct strings: reading stops after max_rows, and only those rows are held"
+    def column():
+        yield "12/25/1066"
+        while True:
+            yield "1066"
+    guess, it = hdateinfer.infer_from_stream(column(), sample_size=10, max_rows=50)
+    assert guess.dateformat == "mdy" and guess.counts["mdy"] == 2
+    assert next(it) == "12/25/1066" and list(itertools.islice(it, 100)) == ["1066"] * 100
+
+    strings = iter(["1066"] * 10 + ["25/12/1066"])
+    assert hdateinfer.infer_dateformat(strings, max_rows=10).dateformat is None and next(strings) == "25/12/1066"
+    for sample_size, max_rows in ((0, 10), (10, 0)):
+        try:
+            hdateinfer.infer_dateformat(["1066"], sample_size=sample_size, max_rows=max_rows)
+            assert False, "sample_size or max_rows of 0 has not raised a ValueError"
+        except ValueError:
+            pass
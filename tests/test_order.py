@@ -0,0 +1,75 @@
+import random
+
+import sys
+sys.path.insert(0,"./historicaldate") # in case this is run when a submodule
+
+import pytest
+
+from historicaldate import hdate
+from historicaldate import hdatesorted
+from historicaldate import hdateutils
+
+def test_equality():
+    assert hdate.HDate("25 Dec 1066") == hdate.HDate("1066-12-25") == hdate.HDate("25 December 1066 AD")
+    assert len({hdate.HDate("25 Dec 1066"), hdate.HDate("1066-12-25"), hdate.HDate("circa 1066")}) == 2
+    assert hdate.HDate("44 BC") == hdate.HDate("44 BCE")
+    assert hdate.HDate("1066") != hdate.HDate("circa 1066")
+    assert hdate.HDate("") == hdate.HDate("") and hdate.HDate("1066") != "1066"
+    assert hdate.HDate("between 1060 and 1070") != hdate.HDate("circa 1065 earliest 1060 latest 1070")
+    assert hdate.HDate("ongoing") == hdate.HDate("", missingasongoing=True)
+    assert hdate.HDate("31 Feb 1066") == hdate.HDate(" 31 Feb 1066") != hdate.HDate("30 Feb 1066")
+    # -- Comparing does not parse the strings again
+    hds = [hdate.HDate("1066") for _ in range(100)]
+    assert len(set(hds)) == 1 and all(hd._d_parsed is None and hd._re_parsed is None for hd in hds)
+
+def test_ordering():
+    hds = [hdate.HDate(s) for s in ["1200", "circa 1066", "44 BC", "25 Dec 1066", "1066", "between 1000 and 1100"]]
+    assert [hd.input for hd in sorted(hds)] == \
+                ["44 BC", "between 1000 and 1100", "circa 1066", "1066", "25 Dec 1066", "1200"]
+    assert hdate.HDate("circa 1066") < hdate.HDate("1066") <= hdate.HDate("1066")
+    with pytest.raises(TypeError):
+        hdate.HDate("1066") < hdate.HDate("")
+
+    assert hdate.HDate("1066").definitely_before(hdate.HDate("1067"))
+    assert not hdate.HDate("circa 1066").definitely_before(hdate.HDate("1064"))
+    assert hdate.HDate("circa 1066").possibly_before(hdate.HDate("1064"))
+    assert not hdate.HDate("1067").possibly_before(hdate.HDate("1066"))
+
+def test_order_matches_equality():
+    "a <= b and a >= b only if a == b, for HDates with the same ordinals but different levels"
+    hds = [hdate.HDate(s) for s in ["between 1060 and 1070", "circa 1065 earliest 1060 latest 1070",
+                                     "circa5y 1065", "1065", "1 Jan 1066", "Jan 1066 earliest 1 Jan 1066 latest 1 Jan 1066"]]
+    for a in hds:
+        for b in hds:
+            assert (a <= b and a >= b) == (a == b) == (a.sort_key() == b.sort_key())
+    assert hdate.HDate("between 1060 and 1070") != hdate.HDate("circa 1065 earliest 1060 latest 1070")
+
+    # -- Changes to pdates are seen by comparisons, as by *ordinals*
+    a, b = hdate.HDate("1066"), hdate.HDate("1067")
+    b.pdates["ordinal_mid"] = b.pdates["ordinal_early"] = b.pdates["ordinal_late"] = a.pdates["ordinal_mid"]
+    b.pdates["slmid"] = b.pdates["slearly"] = b.pdates["sllate"] = "d"
+    assert a < b and b.definitely_before(hdate.HDate("1067")) and b == hdate.HDate("15 Jun 1066")
+
+def test_sorted_hdates():
+    rng = random.Random(1)
+    strings = [f"{rng.randint(1, 28)} Mar {rng.randint(1, 2000)}" for _ in range(500)] + \
+              [f"circa {rng.randint(1, 500)} BC" for _ in range(100)]
+    shd = hdatesorted.SortedHDates(hdate.HDate(s) for s in strings[:300])
+    for s in strings[300:]:
+        shd.add(hdate.HDate(s))
+    assert len(shd) == len(strings)
+    keys = [hd.sort_key() for hd in shd]
+    assert keys == sorted(keys)
+
+    found = shd.between("1200", "1 Jan 1300")
+    mids = sorted(hd.sort_key()[0] for hd in shd)
+    assert len(found) == len([m for m in mids if hdateutils.to_ordinal("1200") <= m <= hdateutils.to_ordinal("1 Jan 1300")])
+    assert all(hdateutils.to_ordinal("1200") <= hd.sort_key()[0] for hd in found)
+    assert shd.between(None, 0) == [hd for hd in shd if hd.sort_key()[0] <= 0]
+
+    hd = hdate.HDate(strings[0])
+    assert hd in shd
+    shd.remove(hd)
+    assert len(shd) == len(strings) - 1
+    with pytest.raises(ValueError):
+        shd.remove(hdate.HDate("1 Jan 9999"))
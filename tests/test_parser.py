@@ -0,0 +1,68 @@
+import threading
+
+import sys
+sys.path.insert(0,"./historicaldate") # in case this is run when a submodule
+
+from historicaldate import hdate
+from historicaldate import hdateparser
+
+def test_shared_parser():
+    assert hdateparser.get_parser() is hdateparser.get_parser(None)
+    assert hdateparser.get_parser("dmy") is not hdateparser.get_parser("mdy")
+    hd1 = hdate.HDate("25 Dec 1066")
+    hd2 = hdate.HDate("1066-12-25")
+    assert hd1.parser is hd2.parser
+    assert hd1.compiled_pattern is hd2.compiled_pattern
+
+def test_explicit_parser():
+    parser = hdateparser.HDateParser(dateformat="dmy")
+    hd = hdate.HDate("25/12/1066", parser=parser)
+    assert hd.parser is parser
+    assert hd.pdates == hdate.HDate("25/12/1066", dateformat="dmy").pdates
+
+def test_parse():
+    parser = hdateparser.get_parser()
+    re_parsed, d_parsed = parser.parse("circa2y 25 Dec 1066")
+    assert re_parsed["clen"] == "2" and re_parsed["midpremon"] == "Dec"
+    assert d_parsed["midmon"] == 12 and d_parsed["circa"]
+    assert parser.parse("  ") == (None, None)
+    assert parser.parse("", missingasongoing=True)[1]["ongoing"]
+    assert parser.match("not a date") is None
+
+def test_threads():
+    "One parser shared between threads gives the same results as serial use"
+    strings = ["25 Dec 1066", "circa 1200", "Between 500BC and 400BC", "ongoing", "1066-12-25"] * 50
+    expected = [hdate.HDate(s).pdates for s in strings]
+    results = [None] * len(strings)
+    def work(start):
+        for i in range(start, len(strings), 4):
+            results[i] = hdate.HDate(strings[i]).pdates
+    threads = [threading.Thread(target=work, args=(k,)) for k in range(4)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert results == expected
+
+def test_fastpath():
+    "Strings taking the fast path give the same results as the full grammar"
+    corpus = ["1066", "0", "7", "0044", "99999999", "1066-12-25", "1066-6-24", "1066-12", "1066-02-30", "1066-12-0",
+              "44 BC", "44BC", "44bce", "1066 AD", "1066ce", "1066-12-25 bc", "487 bc", "1066  BCE"]
+    for dateformat in (None, "dmy", "mdy"):
+        fast = hdateparser.HDateParser(dateformat)
+        full = hdateparser.HDateParser(dateformat, fastpath=False)
+        for s in corpus:
+            assert fast.parse(s) == full.parse(s), f"Fast path differs on '{s}', dateformat={dateformat}"
+            assert hdate.HDate(s, parser=fast).pdates == hdate.HDate(s, parser=full).pdates
+        assert fast.counters["fastpath"] == 2 * len(corpus) and fast.counters["grammar"] == 0
+        assert full.counters["fastpath"] == 0 and full.counters["grammar"] == 2 * len(corpus)
+
+def test_counters():
+    parser = hdateparser.HDateParser()
+    for s in ["1066", "25 Dec 1066", "", "circa 1066"]:
+        parser.parse(s)
+    try:
+        parser.parse("not a date")
+    except ValueError:
+        pass
+    assert parser.counters == {"fastpath": 1, "grammar": 2, "blank": 1, "nomatch": 1}
+    parser.reset_counters()
+    assert sum(parser.counters.values()) == 0
@@ -0,0 +1,44 @@
+import datetime
+import pickle
+
+import sys
+sys.path.insert(0,"./historicaldate") # in case this is run when a submodule
+
+from historicaldate import hdate
+from historicaldate import hdatecontext
+from historicaldate import hdateparser
+
+def test_pickle():
+    for s in ["25 Dec 1066", "circa 1200", "between 10BC and 100AD", "circa 2 BC", "44 BC", "circa", "29 Feb 1700", ""]:
+        hd = hdate.HDate(s)
+        hd2 = pickle.loads(pickle.dumps(hd))
+        assert hd2.input == s and hd2.pdates == hd.pdates and hd2.d_parsed == hd.d_parsed
+        assert hd2.parser is hdateparser.get_parser()
+    assert len(pickle.dumps(hdate.HDate("25 Dec 1066"))) < 200
+
+def test_pickle_options():
+    hd = hdate.HDate("12/25/1066", dateformat="mdy")
+    hd2 = pickle.loads(pickle.dumps(hd))
+    assert hd2.parser is hdateparser.get_parser("mdy") and hd2.pdates["mid"] == datetime.date(1066, 12, 25)
+
+    hd = hdate.HDate("", missingasongoing=True)
+    hd2 = pickle.loads(pickle.dumps(hd))
+    assert hd2.pdates == hd.pdates and hd2.d_parsed["ongoing"]
+
+    # -- A changed pdates is kept
+    hd = hdate.HDate("1066")
+    hd.pdates["slmid"] = "x"
+    assert pickle.loads(pickle.dumps(hd)).pdates["slmid"] == "x"
+
+def test_pickle_custom_parser():
+    "A parser of the caller's own, with its context, is kept, and pickled once for many HDates"
+    parser = hdateparser.HDateParser("dmy", context=hdatecontext.HDateContext(circa_days=100))
+    hds = [hdate.HDate(s, parser=parser) for s in ["circa 1066", "25/12/1066", "circa 1066"]]
+    hds[1].pdates["slmid"] = "x"
+    hds2 = pickle.loads(pickle.dumps(hds))
+    assert hds2[0].parser is hds2[1].parser is hds2[2].parser is not hdateparser.get_parser("dmy")
+    assert hds2[0].parser.context == parser.context and hds2[0].parser.dateformat == "dmy"
+    assert hds2[0] == hds[0] and hds2[1].pdates["slmid"] == "x"
+    hds2[0].resolve()
+    assert hds2[0] == hds[0] != hdate.HDate("circa 1066")
+    assert pickle.loads(pickle.dumps(hdateparser.get_parser("mdy"))) is hdateparser.get_parser("mdy")
@@ -0,0 +1,69 @@
+import datetime
+import pickle
+
+import sys
+sys.path.insert(0,"./historicaldate") # in case this is run when a submodule
+
+from historicaldate import hdate
+from historicaldate import hdatecontext
+from historicaldate import hdateparser
+
+STRINGS = ["circa 1200", "25 Dec 1066", "between 500BC and 400BC", "", "ongoing", "circa10y 44 BC",
+           "Feb 1700", "before 1700", "1066"]
+
+def test_resolve():
+    ctx = hdatecontext.HDateContext(today=datetime.date(2000, 1, 1), circa_days=10, proleptic_gregorian=True)
+    for s in STRINGS:
+        expected = hdate.HDate(s, context=ctx).pdates
+        for keep_parsed in (False, True):
+            hd = hdate.HDate(s, keep_parsed=keep_parsed)
+            assert (hd._d_parsed is not None) == (keep_parsed and s != "")
+            hd.pdates = {}
+            hd.resolve(ctx)
+            assert hd.pdates == expected
+            hd.resolve()
+            assert hd.pdates == hdate.HDate(s).pdates
+
+    # -- Strings are not parsed again, including blank ones, and HDates with the same string share their parse
+    parser = hdateparser.HDateParser()
+    hdates = [hdate.HDate(s, parser=parser, keep_parsed=keep_parsed) for s in ("circa 1200", "", " ")
+              for keep_parsed in (True, False, False)]
+    hdates.append(hdate.HDate("", parser=parser, missingasongoing=True))
+    parser.reset_counters()
+    for hd in hdates:
+        hd.resolve(ctx)
+    assert sum(parser.counters.values()) == 0 and hdates[1]._d_parsed is None
+    assert hdates[1]._parsed is hdates[2]._parsed and hdates[-1].pdates["slmid"] == "o"
+
+    # -- Unpickled HDates are parsed again once
+    hd = pickle.loads(pickle.dumps(hdate.HDate("circa 1200", parser=parser)))
+    hd.resolve(ctx)
+    hd.resolve(ctx)
+    assert sum(parser.counters.values()) == 1 and hd.pdates == hdate.HDate("circa 1200", context=ctx).pdates
+
+    # -- The parser's context is used by default
+    hd = hdate.HDate("ongoing", parser=hdateparser.HDateParser(context=ctx))
+    hd.resolve(hdatecontext.HDateContext(today=datetime.date(1990, 1, 1)))
+    assert hd.pdates["mid"] == datetime.date(1990, 1, 1)
+    hd.resolve()
+    assert hd.pdates["mid"] == datetime.date(2000, 1, 1)
+
+def test_resolve_all():
+    ctx = hdatecontext.HDateContext(today=datetime.date(2000, 1, 1), circa_days=10, proleptic_gregorian=True)
+    parser = hdateparser.HDateParser()
+    hdates = [hdate.HDate(s, parser=parser) for s in STRINGS * 3] + \
+             [hdate.HDate(s, parser=parser, keep_parsed=True) for s in STRINGS]
+    parser.reset_counters()
+    hdate.resolve_all(hdates, ctx)
+    assert [hd.pdates for hd in hdates] == [hdate.HDate(s, context=ctx).pdates for s in STRINGS * 4]
+    # -- No string is parsed again, and d_parsed is kept only where it was held
+    assert sum(parser.counters.values()) == 0
+    assert all(hd._d_parsed is None for hd in hdates[:3 * len(STRINGS)])
+    assert all(hd._d_parsed is not None for hd in hdates[3 * len(STRINGS):] if hd.input)
+
+    # -- Unpickled HDates: each distinct string is parsed once
+    hdates = pickle.loads(pickle.dumps(hdates))
+    hdates[0].parser.reset_counters()
+    hdate.resolve_all(hdates, ctx)
+    assert [hd.pdates for hd in hdates] == [hdate.HDate(s, context=ctx).pdates for s in STRINGS * 4]
+    assert sum(hdates[0].parser.counters.values()) == len(STRINGS)
@@ -0,0 +1,59 @@
+import sys
+sys.path.insert(0,"./historicaldate") # in case this is run when a submodule
+
+from historicaldate import hdate
+from historicaldate import hdatestats
+
+def parse_all(strings, missingasongoing=False):
+    hdates = []
+    for s in strings:
+        try:
+            hdates.append(hdate.HDate(s, missingasongoing=missingasongoing))
+        except ValueError:
+            hdates.append(None)
+    return hdates
+
+def test_stats():
+    strings = ["1066", "25 Dec 1066", "circa 1066", "between 1066 and 1070", "44 BC", "ongoing", "",
+               "31 Feb 1066", "sometime", "Dec 1066-12", "between 50 BC and 10"]
+    expected = [(hd.pdates if hd is not None else None) for hd in parse_all(strings)]
+
+    assert hdatestats.active_stats is None and hdatestats.stats_snapshot() is None
+    with hdatestats.measure() as stats:
+        assert hdatestats.active_stats is stats
+        hdates = parse_all(strings)
+    assert hdatestats.active_stats is None
+    # -- Recording does not change the results
+    assert [(hd.pdates if hd is not None else None) for hd in hdates] == expected
+
+    snapshot = stats.snapshot()
+    assert snapshot["shapes"] == {"blank": 1, "ongoing": 1, "circa": 1, "range": 1, "bc": 1, "plain": 3}
+    assert snapshot["failures"] == {"no_match": 1, "prepost_month": 1, "bc_early_without_calendar": 1,
+                                    "day_out_of_range": 1}
+    assert snapshot["no_pdates"] == 1
+    assert snapshot["calls"] == {"match": 9, "convert_re_parsed": 5, "convert_dates": 6, "fill_in": 6, "failed": 4}
+    assert all(ns >= 0 for ns in snapshot["times_ns"].values()) and snapshot["times_ns"]["match"] > 0
+    assert snapshot["speclevels"]["mid"] == {"y": 2, "d": 1, "c": 2, "o": 1}
+    assert snapshot["speclevels"]["early"] == {"y": 3, "d": 1, "c": 1, "o": 1}
+
+    # -- The snapshot is a copy
+    snapshot["shapes"]["blank"] = 100
+    assert stats.snapshot()["shapes"]["blank"] == 1
+
+def test_enable_and_nesting():
+    outer = hdatestats.enable_stats()
+    try:
+        parse_all(["1066", ""], missingasongoing=True)
+        with hdatestats.measure() as inner:
+            parse_all(["circa 1066", "nonsense"])
+        assert inner.snapshot()["shapes"]["circa"] == 1 and inner.snapshot()["shapes"]["ongoing"] == 0
+        # -- The inner block's counts are added to the outer ones
+        snapshot = hdatestats.stats_snapshot()
+        assert snapshot["shapes"]["plain"] == 1 and snapshot["shapes"]["ongoing"] == 1 and snapshot["shapes"]["circa"] == 1
+        assert snapshot["failures"] == {"no_match": 1}
+
+        hdatestats.reset_stats()
+        assert hdatestats.stats_snapshot()["calls"]["match"] == 0
+    finally:
+        hdatestats.disable_stats()
+    assert hdatestats.active_stats is None
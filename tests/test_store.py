@@ -0,0 +1,51 @@
+import sys
+sys.path.insert(0,"./historicaldate") # in case this is run when a submodule
+
+import pytest
+np = pytest.importorskip("numpy")
+
+from historicaldate import hdatearray
+from historicaldate import hdatestore
+
+STRINGS = ["25 Dec 1066", "circa 1200", "not a date", "", "circa 1200", "ongoing", "44 BC", "29 Feb 1700", "Øresund 1066", "circa"]
+
+def test_store(tmp_path):
+    path = tmp_path / "dates.hds"
+    assert hdatestore.write_store(path, STRINGS) == len(STRINGS)
+    with hdatestore.HDateStore(path) as store:
+        assert len(store) == len(STRINGS)
+        assert [store.input(i) for i in range(len(store))] == STRINGS
+        for a, b in zip(store.columns(), hdatearray.parse_many(STRINGS)):
+            assert a.dtype == b.dtype and np.array_equal(a, b)
+        assert not store.valid[-1]    # 'circa' with no date
+        assert list(np.flatnonzero(store.circa)) == [1, 4] and list(np.flatnonzero(store.ongoing)) == [5]
+        assert not store.ordinal_mid.flags.writeable
+        assert store.records["heap_offset"][1] == store.records["heap_offset"][4]   # stored once
+        mid = store.ordinal_mid
+    assert mid[0] == hdatearray.parse_many(["25 Dec 1066"]).ordinal_mid[0]     # still mapped while in use
+
+    hdatestore.write_store(path, [])
+    with hdatestore.HDateStore(path) as store:
+        assert len(store) == 0 and len(store.valid) == 0
+
+def test_store_mixed_types(tmp_path):
+    "Cells which are not strings, as from a CSV or pandas column"
+    path = tmp_path / "dates.hds"
+    values = ["25 Dec 1066", None, float("nan"), 1066, float("nan"), "1066"]
+    assert hdatestore.write_store(path, values) == len(values)
+    with hdatestore.HDateStore(path) as store:
+        assert [store.input(i) for i in range(len(store))] == ["25 Dec 1066", "", "nan", "1066", "nan", "1066"]
+        assert list(store.valid) == [True, False, False, True, False, True]
+        assert store.ordinal_mid[3] == store.ordinal_mid[5]
+        assert store.records["heap_offset"][2] == store.records["heap_offset"][4]   # NaNs stored once
+
+def test_store_errors(tmp_path):
+    path = tmp_path / "dates.hds"
+    hdatestore.write_store(path, STRINGS)
+    data = bytearray(path.read_bytes())
+    for changed, message in [(data[:-1], "truncated"), (data[:8] + b"\2" + data[9:], "version"),
+                             (b"X" + data[1:], "not an HDate store"), (data[:-1] + b"x", "checksum")]:
+        path.write_bytes(changed)
+        with pytest.raises(ValueError, match=message):
+            hdatestore.HDateStore(path)
+    hdatestore.HDateStore(path, verify=False).close()
@@ -0,0 +1,67 @@
+import io
+
+import sys
+sys.path.insert(0,"./historicaldate") # in case this is run when a submodule
+
+import pytest
+
+from historicaldate import hdate
+from historicaldate import hdatecontext
+from historicaldate import hdateparser
+from historicaldate import hdatestream
+
+CSV = """name,born,died
+William I,circa 1028,9 Sep 1087
+Harold II,circa 1022,14 Oct 1066
+Nobody,not a date,1066
+Edgar,circa 1051,
+Someone,1066,29 Feb 1700
+Harold II again,circa 1022,14 Oct 1066
+"""
+
+def test_parse_stream():
+    errors = []
+    rows = list(hdatestream.parse_stream(hdatestream.read_csv(io.StringIO(CSV)), ["born", "died"],
+                                         chunksize=4, errors=errors))
+    assert [row["name"] for row in rows] == ["William I", "Harold II", "Edgar", "Harold II again"]
+    assert rows[0]["died_hdate"] == hdate.HDate("1087-09-09")
+    assert rows[1]["born_hdate"] == rows[3]["born_hdate"] and rows[1]["born_hdate"] is not rows[3]["born_hdate"]
+    assert rows[2]["died_hdate"].pdates is None
+    assert errors == [(2, "born", "Illegal date format: not a date"), (4, "died", "No date could be calculated: 29 Feb 1700")]
+
+    rows = list(hdatestream.parse_stream(hdatestream.read_csv(io.StringIO(CSV)), "died", missingasongoing=True))
+    assert len(rows) == 5 and rows[3]["died_hdate"].pdates["slmid"] == "o"
+    with pytest.raises(ValueError):
+        next(hdatestream.parse_stream([], "died", chunksize=0))
+
+def test_parse_stream_columns():
+    np = pytest.importorskip("numpy")
+    errors = []
+    chunks = list(hdatestream.parse_stream_columns(hdatestream.read_csv(io.StringIO(CSV)), ["born", "died"],
+                                                   chunksize=4, errors=errors))
+    assert [list(chunk.row_numbers) for chunk in chunks] == [[0, 1, 3], [5]]
+    assert [row["name"] for row in chunks[0].rows] == ["William I", "Harold II", "Edgar"]
+    assert list(chunks[0].columns["died"].valid) == [True, True, False]
+    assert chunks[1].columns["born"].ordinal_mid[0] == hdate.HDate("circa 1022").pdates["ordinal_mid"]
+    assert [(row, column) for row, column, _ in errors] == [(2, "born"), (4, "died")]
+
+def test_repeats_keep_parser():
+    parser = hdateparser.HDateParser(context=hdatecontext.HDateContext(circa_days=100))
+    parsed = hdatestream._parse_chunk_column(list(hdatestream.read_csv(io.StringIO(CSV))), "born", parser, False)
+    assert parsed[1] is not parsed[5] and parsed[5].parser is parser
+    parsed[5].resolve()
+    assert parsed[5] == parsed[1] == hdate.HDate("circa 1022", parser=parser) != hdate.HDate("circa 1022")
+
+def test_non_string_cells():
+    # -- As from pandas or other sources: None is missing, other values are read as strings
+    rows = [{"died": None}, {"died": float("nan")}, {"died": 1066}, {"died": "1066"}]
+    errors = []
+    parsed = list(hdatestream.parse_stream([dict(row) for row in rows], "died", errors=errors))
+    assert [row["died_hdate"].ordinals for row in parsed] == [(None, None, None)] + [hdate.HDate("1066").ordinals] * 2
+    assert [(row, column) for row, column, _ in errors] == [(1, "died")]
+    np = pytest.importorskip("numpy")
+    errors = []
+    chunks = list(hdatestream.parse_stream_columns(rows, "died", errors=errors))
+    assert list(chunks[0].row_numbers) == [0, 2, 3] and list(chunks[0].columns["died"].valid) == [False, True, True]
+    assert [(row, column) for row, column, _ in errors] == [(1, "died")]
+
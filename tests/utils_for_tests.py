@@ -1,3 +1,4 @@
+import random
 import sys
 sys.path.insert(0,"./historicaldate") # in case this is run when a submodule
 
@@ -27,4 +28,18 @@ def expect_valueerror(s, dateformat=None):
         assert False, f"Illegal date '{s}' has not raised a ValueError"
     except ValueError:
         return True
-    
+
+def random_strings(n, seed=1):
+    "Random strings of all shapes, mostly in HDate format, including some which are not valid"
+    rng = random.Random(seed)
+    months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+    def date():
+        return rng.choice([f"{rng.randint(0, 31)} {rng.choice(months)} {rng.randint(0, 2020)}",
+                           f"{rng.choice(months)} {rng.randint(0, 2020)}", f"{rng.randint(0, 2020)}",
+                           f"{rng.randint(0, 2020)}-{rng.randint(1, 12):02}-{rng.randint(1, 31):02}",
+                           f"{rng.randint(0, 31)}/{rng.randint(1, 12)}/{rng.randint(0, 2020)}"]) + \
+               rng.choice(["", "", " BC", " AD"])
+    forms = [date, lambda: f"circa {date()}", lambda: f"between {date()} and {date()}",
+             lambda: f"before {date()}", lambda: f"after {date()}", lambda: f"{date()} earliest {date()}",
+             lambda: f"{rng.choice(months)} {date()}", lambda: rng.choice(["", "ongoing", "sometime", "1066??"])]
+    return [rng.choice(forms)() for _ in range(n)]